@@ -1,61 +1,191 @@
 from __future__ import annotations
 
-import json
 import logging
+from functools import partial
 from typing import TYPE_CHECKING
 
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
 if TYPE_CHECKING:
+    from typing import Any
+
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
-from mobilus_client.app import App as MobilusClientApp
-from mobilus_client.config import Config as MobilusClientConfig
-
-from .const import DOMAIN, PLATFORMS
+from .config_flow import MobilusConfigFlow
+from .const import CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL, DOMAIN, PLATFORM_DEVICES, SIGNAL_NEW_DEVICES
 from .coordinator import MobilusCoordinator
+from .gateway import MobilusCallKind, MobilusGateway, MobilusGatewayError
+from .options import MobilusOptions
+from .profiler import async_setup_services
+from .spans import correlate
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
-    client_config = MobilusClientConfig(
-        gateway_host=entry.data["host"],
-        user_login=entry.data["username"],
-        user_password=entry.data["password"],
+    options = MobilusOptions.from_entry(entry)
+    gateway = MobilusGateway(
+        hass,
+        host=entry.data["host"],
+        username=entry.data["username"],
+        password=entry.data["password"],
+        options=options,
     )
-    client = MobilusClientApp(client_config)
 
-    # Retrieve devices list
-    response = await hass.async_add_executor_job(
-        lambda: json.loads(client.call([("devices_list", {})])),
-    )
+    # Retrieve devices list and their current state in a single gateway session
+    try:
+        with correlate("setup"):
+            response = await gateway.async_call(
+                [("devices_list", {}), ("current_state", {})], MobilusCallKind.DEVICES_LIST,
+            )
+    except MobilusGatewayError as exception:
+        raise ConfigEntryNotReady(str(exception)) from exception
 
     if not response:
         _LOGGER.warning("No devices found in response.")
         return False
 
-    devices = response[0].get("devices", [])
+    # Responses come in the order they arrived, not in the order of the requests
+    devices: list[dict[str, Any]] = next((item["devices"] for item in response if "devices" in item), [])
+    events: list[dict[str, Any]] | None = next((item["events"] for item in response if "events" in item), None)
 
     if not devices:
         _LOGGER.warning("No devices found in the devices list.")
         return False
 
-    coordinator = MobilusCoordinator(hass, client, entry.data["refresh_interval"])
+    coordinator = MobilusCoordinator(hass, gateway, options, _device_types(devices))
+    platforms = _device_platforms(devices)
 
     hass.data[DOMAIN][entry.entry_id] = {
-        "client": client,
+        "gateway": gateway,
         "coordinator": coordinator,
         "devices": devices,
+        "platforms": platforms,
     }
 
-    await coordinator.async_config_entry_first_refresh()
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Last recovery step of the stale state watchdog
+    coordinator.watchdog.resync_devices = partial(async_refresh_devices, hass, entry)
+
+    gateway.async_start_keepalive()
+    # Also torn down when setup fails after this point, not only on unload
+    entry.async_on_unload(gateway.async_close)
+    entry.async_on_unload(coordinator.async_shutdown)
+
+    # Gateway that did not answer for the current state is polled once more as usual
+    if events is not None:
+        coordinator.async_seed(events)
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    # Poll phases of gateways are spread over the refresh interval
+    entry.async_on_unload(coordinator.supervisor.async_register(entry.entry_id, coordinator))
+
+    await hass.config_entries.async_forward_entry_setups(entry, sorted(platforms))
+
+    # Refresh devices list when the gateway reports state for a device that is not known yet
+    checked_device_ids: set[str] = set()
+
+    @callback
+    def async_check_devices() -> None:
+        known_device_ids = {device["id"] for device in hass.data[DOMAIN][entry.entry_id]["devices"]}
+        unknown_device_ids = coordinator.data.devices.keys() - known_device_ids - checked_device_ids
+
+        if unknown_device_ids:
+            checked_device_ids.update(unknown_device_ids)
+            entry.async_create_background_task(
+                hass,
+                async_refresh_devices(hass, entry),
+                f"{DOMAIN}_refresh_devices_{entry.entry_id}",
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(async_check_devices))
+    entry.async_on_unload(entry.add_update_listener(async_update_listener))
 
     return True
 
+async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    gateway = entry_data["gateway"]
+    coordinator = entry_data["coordinator"]
+    options = MobilusOptions.from_entry(entry)
+
+    gateway.apply_options(options)
+    coordinator.async_set_options(options)
+
+    if (gateway.host, gateway.username, gateway.password) == (
+        entry.data["host"], entry.data["username"], entry.data["password"],
+    ):
+        return
+
+    # Swap the client under existing coordinator and entities, reload only if the devices list changed
+    _LOGGER.info("Gateway connection settings changed")
+    gateway.set_credentials(entry.data["host"], entry.data["username"], entry.data["password"])
+
+    await async_refresh_devices(hass, entry)
+    await coordinator.async_request_refresh()
+
+async def async_refresh_devices(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    try:
+        with correlate("devices"):
+            response = await entry_data["gateway"].async_call([("devices_list", {})], MobilusCallKind.DEVICES_LIST)
+    except MobilusGatewayError as exception:
+        _LOGGER.warning("Failed to refresh devices list: %s", exception)
+        return
+
+    devices: list[dict[str, Any]] = next((item["devices"] for item in response if "devices" in item), [])
+    known_device_ids = {device["id"] for device in entry_data["devices"]}
+
+    if not devices:
+        return
+
+    # Removed devices need their entities torn down, which only a reload does
+    if known_device_ids - {device["id"] for device in devices}:
+        _LOGGER.info("Devices were removed from the gateway, reloading entry")
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    new_devices = [device for device in devices if device["id"] not in known_device_ids]
+
+    if not new_devices:
+        return
+
+    _LOGGER.info("Found %s new devices", len(new_devices))
+    entry_data["devices"] = devices
+    entry_data["coordinator"].device_types = _device_types(devices)
+
+    # Already loaded platforms add entities for the new devices, missing platforms are loaded
+    async_dispatcher_send(hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), new_devices)
+
+    new_platforms = _device_platforms(new_devices) - entry_data["platforms"]
+
+    if new_platforms:
+        entry_data["platforms"] |= new_platforms
+
+        async with entry.setup_lock:
+            await hass.config_entries.async_forward_entry_setups(entry, sorted(new_platforms))
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, sorted(hass.data[DOMAIN][entry.entry_id]["platforms"]),
+    )
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
@@ -63,12 +193,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
-    if config_entry.version == 1:
+    if config_entry.version < MobilusConfigFlow.VERSION:
         data = dict(config_entry.data)
 
-        if "refresh_interval" not in data:
-            data["refresh_interval"] = 600
+        # Refresh interval moved from entry data to options
+        options = {
+            CONF_REFRESH_INTERVAL: data.pop(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
+            **config_entry.options,
+        }
 
-    hass.config_entries.async_update_entry(config_entry, data=data)
+        hass.config_entries.async_update_entry(
+            config_entry, data=data, options=options, version=MobilusConfigFlow.VERSION,
+        )
 
     return True
+
+def _device_platforms(devices: list[dict[str, Any]]) -> set[Platform]:
+    return {
+        platform
+        for platform, device_types in PLATFORM_DEVICES.items()
+        for device in devices if device["type"] in device_types
+    }
+
+def _device_types(devices: list[dict[str, Any]]) -> dict[str, int]:
+    return {device["id"]: device["type"] for device in devices}
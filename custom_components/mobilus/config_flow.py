@@ -1,26 +1,84 @@
 from __future__ import annotations
 
+import logging
+import time
 from typing import Any
 
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState, ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.core import callback
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig, SelectSelectorMode
 
-from .const import DOMAIN
+from .const import (
+    CONF_ACTIVE_REFRESH_INTERVAL,
+    CONF_BATCH_WINDOW,
+    CONF_COMMAND_JOURNAL_TTL,
+    CONF_COMMAND_TIMEOUT,
+    CONF_DEVICES_LIST_TIMEOUT,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MOTION_WRITE_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_PRIORITY_DEVICE_TYPES,
+    CONF_REFRESH_INTERVAL,
+    CONF_SETTLE_DELAY,
+    DOMAIN,
+    VALIDATION_PROBE_TIMEOUT,
+)
+from .device import MobilusDevice
+from .discovery import MobilusDiscoveredGateway, async_discover_gateways, async_probe
+from .gateway import (
+    MobilusCallKind,
+    MobilusGateway,
+    MobilusGatewayConnectionError,
+    MobilusGatewayError,
+    MobilusGatewayNoResponseError,
+    MobilusGatewayTimeoutError,
+)
+from .options import MobilusOptions
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class MobilusConfigFlow(ConfigFlow, domain=DOMAIN):
-    VERSION = 2
+    VERSION = 3
+
+    def __init__(self) -> None:
+        self._discovered: list[MobilusDiscoveredGateway] | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(_config_entry: ConfigEntry) -> MobilusOptionsFlow:
+        return MobilusOptionsFlow()
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(
-                title=user_input["host"],
-                data=user_input,
-            )
+            errors, placeholders = await self._async_validate(user_input)
+
+            if not errors:
+                return self.async_create_entry(
+                    title=user_input["host"],
+                    data=user_input,
+                    description="connected",
+                    description_placeholders=placeholders,
+                )
+
+        # Gateways on the local subnet are offered in the host field, any other host can still be typed in
+        if self._discovered is None:
+            self._discovered = await async_discover_gateways(self.hass)
+
+        defaults = user_input or {}
+
+        if self._discovered and "host" not in defaults:
+            defaults = {"host": self._discovered[0].host}
 
         return self.async_show_form(
             step_id="user",
-            data_schema=self._data_schema(),
+            data_schema=self._data_schema(defaults, [gateway.host for gateway in self._discovered]),
+            errors=errors,
+            description_placeholders={"discovered": str(len(self._discovered))},
         )
 
     async def async_step_reconfigure(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
@@ -31,7 +89,20 @@ class MobilusConfigFlow(ConfigFlow, domain=DOMAIN):
          if reconfigure_entry is None:
             return self.async_abort(reason="entry_not_found")
 
+         errors: dict[str, str] = {}
+
          if user_input is not None:
+            errors, _placeholders = await self._async_validate(user_input)
+
+         if user_input is not None and not errors:
+            # Loaded entry applies new settings live through its update listener
+            if reconfigure_entry.state is ConfigEntryState.LOADED:
+                return self.async_update_and_abort(
+                    entry=reconfigure_entry,
+                    data=user_input,
+                    reason="reconfigure_successful",
+                )
+
             return self.async_update_reload_and_abort(
                 entry=reconfigure_entry,
                 data=user_input,
@@ -40,15 +111,116 @@ class MobilusConfigFlow(ConfigFlow, domain=DOMAIN):
 
          return self.async_show_form(
              step_id="reconfigure",
-             data_schema=self._data_schema(dict(reconfigure_entry.data)),
+             data_schema=self._data_schema(user_input or dict(reconfigure_entry.data)),
+             errors=errors,
          )
 
-    def _data_schema(self, defaults: dict[str, Any] | None = None) -> vol.Schema:
+    async def _async_validate(self, user_input: dict[str, Any]) -> tuple[dict[str, str], dict[str, str]]:
+        # Reachability is checked first, the client library reports unknown hosts and failed login the same way
+        probe = await async_probe(user_input["host"], probe_timeout=VALIDATION_PROBE_TIMEOUT)
+
+        if probe is None:
+            return {"base": "cannot_connect"}, {}
+
+        gateway = MobilusGateway(
+            self.hass,
+            host=user_input["host"],
+            username=user_input["username"],
+            password=user_input["password"],
+            options=MobilusOptions(),
+        )
+        start = time.monotonic()
+
+        try:
+            response = await gateway.async_call([("devices_list", {})], MobilusCallKind.DEVICES_LIST)
+        except MobilusGatewayNoResponseError:
+            # Gateway is reachable, so no response at all means the client library gave up waiting for login
+            response = []
+        except MobilusGatewayTimeoutError:
+            return {"base": "timeout"}, {}
+        except MobilusGatewayConnectionError:
+            return {"base": "cannot_connect"}, {}
+        except MobilusGatewayError:
+            _LOGGER.exception("Unexpected gateway error during validation")
+            return {"base": "unknown"}, {}
+
+        if not response:
+            return {"base": "invalid_auth"}, {}
+
+        round_trip = time.monotonic() - start
+        _LOGGER.info(
+            "Gateway %s validated, connection latency %.3fs, login and devices list %.3fs",
+            user_input["host"], probe.latency, round_trip,
+        )
+
+        return {}, {
+            "latency": str(round(probe.latency * 1000)),
+            "round_trip": str(round(round_trip * 1000)),
+            "devices": str(len(response[0].get("devices", []))),
+        }
+
+    def _data_schema(self, defaults: dict[str, Any] | None = None, hosts: list[str] | None = None) -> vol.Schema:
         defaults = defaults or {}
+        host_selector: Any = str
+
+        if hosts:
+            host_selector = SelectSelector(
+                SelectSelectorConfig(options=hosts, custom_value=True, mode=SelectSelectorMode.DROPDOWN),
+            )
 
         return vol.Schema({
-            vol.Required("host", default=defaults.get("host", None)): str,
+            vol.Required("host", default=defaults.get("host", None)): host_selector,
             vol.Required("username", default=defaults.get("username", None)): str,
             vol.Required("password", default=defaults.get("password", None)): str,
-            vol.Required("refresh_interval", default=defaults.get("refresh_interval", 600)): int,
         })
+
+class MobilusOptionsFlow(OptionsFlow):
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_ACTIVE_REFRESH_INTERVAL] > user_input[CONF_REFRESH_INTERVAL]:
+                errors[CONF_ACTIVE_REFRESH_INTERVAL] = "active_refresh_interval_too_long"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                self._options_schema(),
+                user_input or self._options_values(MobilusOptions.from_entry(self.config_entry)),
+            ),
+            errors=errors,
+        )
+
+    def _options_schema(self) -> vol.Schema:
+        return vol.Schema({
+            vol.Required(CONF_REFRESH_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+            vol.Required(CONF_ACTIVE_REFRESH_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=2, max=3600)),
+            vol.Required(CONF_SETTLE_DELAY): vol.All(vol.Coerce(float), vol.Range(min=0, max=120)),
+            vol.Required(CONF_BATCH_WINDOW): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Required(CONF_MAX_CONCURRENT_REQUESTS): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Required(CONF_COMMAND_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=2, max=300)),
+            vol.Required(CONF_POLL_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=2, max=300)),
+            vol.Required(CONF_DEVICES_LIST_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=2, max=300)),
+            vol.Required(CONF_PRIORITY_DEVICE_TYPES): cv.multi_select(
+                {device.name: device.name for device in MobilusDevice},
+            ),
+            vol.Required(CONF_COMMAND_JOURNAL_TTL): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
+            vol.Required(CONF_MOTION_WRITE_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        })
+
+    def _options_values(self, options: MobilusOptions) -> dict[str, Any]:
+        return {
+            CONF_REFRESH_INTERVAL: options.refresh_interval,
+            CONF_ACTIVE_REFRESH_INTERVAL: options.active_refresh_interval,
+            CONF_SETTLE_DELAY: options.settle_delay,
+            CONF_BATCH_WINDOW: options.batch_window,
+            CONF_MAX_CONCURRENT_REQUESTS: options.max_concurrent_requests,
+            CONF_COMMAND_TIMEOUT: options.command_timeout,
+            CONF_POLL_TIMEOUT: options.poll_timeout,
+            CONF_DEVICES_LIST_TIMEOUT: options.devices_list_timeout,
+            CONF_PRIORITY_DEVICE_TYPES: sorted(device.name for device in options.priority_device_types),
+            CONF_COMMAND_JOURNAL_TTL: options.command_journal_ttl,
+            CONF_MOTION_WRITE_INTERVAL: options.motion_write_interval,
+        }
@@ -4,7 +4,77 @@ from .device import MobilusDevice
 
 DOMAIN = "mobilus"
 
-PLATFORMS = [Platform.COVER, Platform.SWITCH]
+SIGNAL_NEW_DEVICES = "mobilus_new_devices_{}"
+
+# Shared by all config entries, kept apart from the per entry data
+DATA_POLL_SUPERVISOR = "mobilus_poll_supervisor"
+
+SERVICE_PROFILE = "profile"
+
+EVENT_COMMAND_FAILED = "mobilus_command_failed"
+
+CONF_ACTIVE_REFRESH_INTERVAL = "active_refresh_interval"
+CONF_BATCH_WINDOW = "batch_window"
+CONF_COMMAND_JOURNAL_TTL = "command_journal_ttl"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_DEVICES_LIST_TIMEOUT = "devices_list_timeout"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MOTION_WRITE_INTERVAL = "motion_write_interval"
+CONF_POLL_TIMEOUT = "poll_timeout"
+CONF_PRIORITY_DEVICE_TYPES = "priority_device_types"
+CONF_REFRESH_INTERVAL = "refresh_interval"
+CONF_SETTLE_DELAY = "settle_delay"
+
+DEFAULT_ACTIVE_REFRESH_INTERVAL = 10
+DEFAULT_BATCH_WINDOW = 0.1
+DEFAULT_COMMAND_JOURNAL_TTL = 0.0
+DEFAULT_COMMAND_TIMEOUT = 15
+DEFAULT_DEVICES_LIST_TIMEOUT = 30
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+DEFAULT_MOTION_WRITE_INTERVAL = 0.0
+DEFAULT_POLL_TIMEOUT = 30
+DEFAULT_REFRESH_INTERVAL = 600
+DEFAULT_SETTLE_DELAY = 15
+
+# Extra time given to the executor job after the client library deadline has passed
+TIMEOUT_GRACE_PERIOD = 5
+
+# Gateway MQTT over websockets port, probed by the subnet discovery
+GATEWAY_PORT = 8884
+
+# Subnet discovery probes many hosts at once, each with a short connection timeout
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_MIN_PREFIX = 24
+DISCOVERY_TIMEOUT = 0.5
+
+# Typed host is probed alone, a gateway behind a routed or slow link gets more time than during the scan
+VALIDATION_PROBE_TIMEOUT = 5.0
+
+# Polls of all gateways running at the same time, and random shift added to each gateway poll phase
+POLL_MAX_CONCURRENT = 2
+POLL_JITTER = 5.0
+
+# Check of the kept open gateway session, MQTT pings keep it alive in between
+KEEPALIVE_INTERVAL = 60
+
+# State changes kept per device, bounds history memory regardless of uptime
+HISTORY_SIZE = 64
+
+# Bulk commands are sent in bursts, adapted to how many commands the gateway radio link delivers
+PACING_ACK_DELAY = 1.0
+PACING_INITIAL_BURST = 4
+PACING_INITIAL_GAP = 0.5
+PACING_MAX_BURST = 16
+PACING_MAX_GAP = 5.0
+PACING_MAX_RETRIES = 2
+PACING_MIN_GAP = 0.1
+
+# Time for a device to start moving or reach the commanded state before the command is resent
+VERIFICATION_TIMEOUT = 20
+
+# Successful polls without any change of a commanded device before its state is considered stale,
+# and between the following recovery steps
+WATCHDOG_STALE_POLLS = 3
 
 COVER_DEVICES = (
     MobilusDevice.CMR,
@@ -32,3 +102,11 @@ SWITCH_DEVICES = (
     MobilusDevice.SWITCH,
     MobilusDevice.SWITCH_NP,
 )
+
+# Device types switching the coordinator to the active refresh interval while moving
+DEFAULT_PRIORITY_DEVICE_TYPES = COVER_DEVICES + GARAGE_DEVICES
+
+PLATFORM_DEVICES = {
+    Platform.COVER: COVER_DEVICES + GARAGE_DEVICES,
+    Platform.SWITCH: SWITCH_DEVICES,
+}
@@ -1,55 +1,272 @@
 from __future__ import annotations
 
-import json
 import logging
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
+    REQUEST_REFRESH_DEFAULT_COOLDOWN,
+    REQUEST_REFRESH_DEFAULT_IMMEDIATE,
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, HISTORY_SIZE
 from .device_state import MobilusDeviceState, MobilusDeviceStateList
+from .gateway import MobilusCallKind, MobilusGatewayError
+from .history import MobilusStateHistory
+from .poll_supervisor import async_get_poll_supervisor
+from .spans import correlate, span
+from .verification import MobilusCommandVerifier
+from .watchdog import MobilusStateWatchdog
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Collection
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
-    from mobilus_client.app import App as MobilusClientApp
+
+    from .gateway import MobilusGateway
+    from .options import MobilusOptions
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class MobilusCoordinator(DataUpdateCoordinator[MobilusDeviceStateList]):
-    def __init__(self, hass: HomeAssistant, client: MobilusClientApp, refresh_interval: int) -> None:
-        self.client = client
+    def __init__(
+            self, hass: HomeAssistant, gateway: MobilusGateway, options: MobilusOptions,
+            device_types: dict[str, int]) -> None:
+        self.gateway = gateway
+        self.options = options
+        self.device_types = device_types
+        self.history = MobilusStateHistory(HISTORY_SIZE)
+        self.verifier = MobilusCommandVerifier(hass, gateway, self)
+        self.watchdog = MobilusStateWatchdog(hass, gateway, self)
+        self.supervisor = async_get_poll_supervisor(hass)
+        self._unsub_delayed_refresh: Callable[[], None] | None = None
+        self._unsub_phase_refresh: Callable[[], None] | None = None
+        self._device_listeners: dict[str, list[Callable[[], None]]] = {}
+        self._pending_device_ids: set[str] = set()
+        self._debounced_device_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REQUEST_REFRESH_DEFAULT_COOLDOWN,
+            immediate=REQUEST_REFRESH_DEFAULT_IMMEDIATE,
+            function=self._async_refresh_devices,
+        )
 
-        _LOGGER.info("Coordinator initialized with refresh interval %s", refresh_interval)
+        _LOGGER.info("Coordinator initialized with refresh interval %s", options.refresh_interval)
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_coordinator",
-            update_interval=timedelta(seconds=refresh_interval),
+            update_interval=timedelta(seconds=options.refresh_interval),
         )
 
-    async def _async_update_data(self) -> MobilusDeviceStateList:
-        response = await self.hass.async_add_executor_job(
-            lambda: json.loads(self.client.call([("current_state", {})])),
+    @callback
+    def async_set_options(self, options: MobilusOptions) -> None:
+        self.options = options
+
+        if not self._update_refresh_interval(self.data):
+            return
+
+        # Reschedule pending refresh, otherwise the previous interval is used once more
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_schedule_phase_refresh(self, phase: float) -> None:
+        # One-off refresh after the poll phase, regular refreshes are scheduled from it at the usual interval
+        self._async_cancel_phase_refresh()
+        self._unsub_phase_refresh = async_call_later(
+            self.hass, phase, HassJob(self._async_phase_refresh, cancel_on_shutdown=True),
+        )
+
+    @callback
+    def async_schedule_refresh(self, delay: float) -> None:
+        # Later request replaces an earlier one, so stops in a row end with a single refresh
+        self._async_cancel_delayed_refresh()
+        self._unsub_delayed_refresh = async_call_later(
+            self.hass, delay, HassJob(self._async_delayed_refresh, cancel_on_shutdown=True),
+        )
+
+    @callback
+    def async_add_device_listener(
+            self, update_callback: Callable[[], None], device_ids: Collection[str]) -> Callable[[], None]:
+        # Notified on every snapshot, and on refreshes of the given devices only
+        remove_listener = self.async_add_listener(update_callback)
+
+        for device_id in device_ids:
+            self._device_listeners.setdefault(device_id, []).append(update_callback)
+
+        @callback
+        def remove_device_listener() -> None:
+            remove_listener()
+
+            for device_id in device_ids:
+                listeners = self._device_listeners.get(device_id, [])
+
+                if update_callback in listeners:
+                    listeners.remove(update_callback)
+
+                if not listeners:
+                    self._device_listeners.pop(device_id, None)
+
+        return remove_device_listener
+
+    async def async_request_device_refresh(self, device_ids: Collection[str]) -> None:
+        # Requests made during the cooldown are merged into one refresh of all requested devices
+        self._pending_device_ids.update(device_ids)
+        await self._debounced_device_refresh.async_call()
+
+    @callback
+    def async_seed(self, device_states: list[dict[str, Any]]) -> None:
+        # State fetched together with the devices list during setup replaces the first refresh
+        data = self._build_snapshot(device_states)
+        self._update_refresh_interval(data)
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # Called for every new snapshot, whether polled or set directly
+        if self.data is not None:
+            self.history.record(self.data, dt_util.utcnow().timestamp())
+            self.verifier.async_check(self.data)
+
+            # Failed refresh keeps the previous snapshot, which is not a sign of stale state
+            if self.last_update_success:
+                self.watchdog.async_check(self.data)
+
+        with span("listener_fan_out", listeners=len(self._listeners)):
+            super().async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        self._async_cancel_delayed_refresh()
+        self._async_cancel_phase_refresh()
+        self._debounced_device_refresh.async_shutdown()
+        self.verifier.async_cancel()
+        self.watchdog.async_cancel()
+        await super().async_shutdown()
+
+    @callback
+    def _async_cancel_delayed_refresh(self) -> None:
+        if self._unsub_delayed_refresh is not None:
+            self._unsub_delayed_refresh()
+            self._unsub_delayed_refresh = None
+
+    async def _async_delayed_refresh(self, _now: datetime) -> None:
+        self._unsub_delayed_refresh = None
+        await self.async_request_refresh()
+
+    @callback
+    def _async_cancel_phase_refresh(self) -> None:
+        if self._unsub_phase_refresh is not None:
+            self._unsub_phase_refresh()
+            self._unsub_phase_refresh = None
+
+    async def _async_phase_refresh(self, _now: datetime) -> None:
+        self._unsub_phase_refresh = None
+        await self.async_refresh()
+
+    async def _async_refresh_devices(self) -> None:
+        device_ids = self._pending_device_ids
+        self._pending_device_ids = set()
+
+        if not device_ids or self.data is None:
+            return
+
+        try:
+            # Gateway answers with the full state, so it counts against the same cap as regular polls
+            with correlate("device_refresh"):
+                async with self.supervisor.async_poll():
+                    response = await self.gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        except MobilusGatewayError as exception:
+            _LOGGER.info("Failed to refresh state of %s: %s", sorted(device_ids), exception)
+            return
+
+        if not response:
+            return
+
+        # Gateway reports all devices at once, only the requested ones are merged,
+        # the rest is left for the regular poll
+        updated = self._build_snapshot([
+            device_state for device_state in response[0].get("events", [])
+            if device_state["deviceId"] in device_ids
+        ])
+        self.data = MobilusDeviceStateList({**self.data.devices, **updated.devices})
+        self.history.record(updated, dt_util.utcnow().timestamp())
+        self.verifier.async_check(updated)
+
+        if self._update_refresh_interval(self.data) and self._listeners:
+            self._schedule_refresh()
+
+        # Listener of several devices is notified once
+        listeners = dict.fromkeys(
+            listener for device_id in updated.devices for listener in self._device_listeners.get(device_id, [])
+        )
+
+        with span("device_fan_out", devices=len(updated.devices), listeners=len(listeners)):
+            for listener in listeners:
+                listener()
+
+    def _is_active(self, data: MobilusDeviceStateList | None) -> bool:
+        if data is None:
+            return False
+
+        # Priority devices in motion are followed with the active refresh interval
+        return any(
+            device_state.is_moving
+            for device_id, device_state in data.devices.items()
+            if self.device_types.get(device_id) in self.options.priority_device_types
+        )
+
+    def _update_refresh_interval(self, data: MobilusDeviceStateList | None) -> bool:
+        refresh_interval = (
+            self.options.active_refresh_interval if self._is_active(data) else self.options.refresh_interval
         )
+        update_interval = timedelta(seconds=refresh_interval)
+
+        if update_interval == self.update_interval:
+            return False
+
+        _LOGGER.info("Coordinator refresh interval changed to %s", refresh_interval)
+        self.update_interval = update_interval
+
+        return True
+
+    async def _async_update_data(self) -> MobilusDeviceStateList:
+        try:
+            # Polls of all gateways are capped together, so entries set up at once do not poll at once
+            with correlate("poll"):
+                async with self.supervisor.async_poll():
+                    response = await self.gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        except MobilusGatewayError as exception:
+            raise UpdateFailed(str(exception)) from exception
 
         if not response:
             raise UpdateFailed
 
-        device_states = response[0].get("events", [])
-
-        return MobilusDeviceStateList(
-            {
-                device_state["deviceId"]: MobilusDeviceState(
-                    device_id=device_state["deviceId"],
-                    event_number=device_state["eventNumber"],
-                    value=device_state["value"],
-                )
-                for device_state in device_states
-            },
-        )
+        data = self._build_snapshot(response[0].get("events", []))
+
+        # Next refresh is scheduled after this one completes, using the interval set here
+        self._update_refresh_interval(data)
+
+        return data
+
+    def _build_snapshot(self, device_states: list[dict[str, Any]]) -> MobilusDeviceStateList:
+        with span("snapshot_build", devices=len(device_states)):
+            return MobilusDeviceStateList(
+                {
+                    device_state["deviceId"]: MobilusDeviceState(
+                        device_id=device_state["deviceId"],
+                        event_number=device_state["eventNumber"],
+                        value=device_state["value"],
+                    )
+                    for device_state in device_states
+                },
+            )
@@ -1,20 +1,37 @@
 from __future__ import annotations
 
-import asyncio
 import logging
+from functools import reduce
+from operator import and_
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.cover import CoverDeviceClass, CoverEntity, CoverEntityFeature
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import COVER_DEVICES, COVER_POSITION_DEVICES, COVER_TILT_DEVICES, DOMAIN, GARAGE_DEVICES
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COVER_DEVICES,
+    COVER_POSITION_DEVICES,
+    COVER_TILT_DEVICES,
+    DOMAIN,
+    GARAGE_DEVICES,
+    SIGNAL_NEW_DEVICES,
+)
 from .coordinator import MobilusCoordinator
+from .gateway import MobilusCallKind
+from .scheduler import MobilusCallPriority, command_priority
+from .spans import correlate, span
+from .throttle import MobilusWriteThrottle
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
-    from mobilus_client.app import App as MobilusClientApp
+
+    from .device_state import MobilusDeviceState
+    from .gateway import MobilusGateway
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,20 +40,38 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    gateway = hass.data[DOMAIN][entry.entry_id]["gateway"]
     devices = hass.data[DOMAIN][entry.entry_id]["devices"]
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    async_add_entities([
-        MobilusCover(device, client, coordinator)
-        for device in devices if device["type"] in (COVER_DEVICES + GARAGE_DEVICES)
-    ])
+    @callback
+    def async_add_devices(devices: list[dict[str, Any]]) -> None:
+        async_add_entities([
+            MobilusCover(device, gateway, coordinator)
+            for device in devices if device["type"] in (COVER_DEVICES + GARAGE_DEVICES)
+        ])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices),
+    )
+    async_add_devices(devices)
+
+    # Groups are created from the devices list at setup, membership changes are applied on reload
+    groups = _device_groups(devices)
+
+    if groups:
+        async_add_entities([
+            MobilusGroupCover(entry.entry_id, group_id, group_devices, gateway, coordinator)
+            for group_id, group_devices in groups.items()
+        ])
 
 class MobilusCover(CoordinatorEntity[MobilusCoordinator], CoverEntity):
-    def __init__(self, device: dict[str, Any], client: MobilusClientApp, coordinator: MobilusCoordinator) -> None:
-        self.client = client
+    def __init__(self, device: dict[str, Any], gateway: MobilusGateway, coordinator: MobilusCoordinator) -> None:
+        self.gateway = gateway
         self.coordinator = coordinator
         self.device = device
+        self._throttle = MobilusWriteThrottle(coordinator.hass)
+        self._resolve_state()
 
     @property
     def unique_id(self) -> str:
@@ -55,93 +90,55 @@ class MobilusCover(CoordinatorEntity[MobilusCoordinator], CoverEntity):
 
     @property
     def supported_features(self) -> CoverEntityFeature:
-        supported_features = (
-            CoverEntityFeature.OPEN
-            | CoverEntityFeature.CLOSE
-            | CoverEntityFeature.STOP
-        )
-
-        if self.device["type"] in COVER_POSITION_DEVICES:
-            supported_features |= CoverEntityFeature.SET_POSITION
-
-        if self.device["type"] in COVER_TILT_DEVICES:
-            supported_features |= (
-                CoverEntityFeature.OPEN_TILT
-                | CoverEntityFeature.CLOSE_TILT
-                | CoverEntityFeature.SET_TILT_POSITION
-            )
-
-        return supported_features
+        return _supported_features(self.device["type"])
 
     @property
-    def is_closed(self) -> bool | None:
-        device_status = self.coordinator.data.devices.get(self.device["id"])
-
-        if not device_status or not isinstance(device_status.cover_position, int):
-            return None
-
-        return device_status.cover_position == 0
+    def current_tilt_position(self) -> int | None:
+        return self._attr_current_cover_tilt_position
 
     @property
-    def current_cover_position(self) -> int | None:
-        device_status = self.coordinator.data.devices.get(self.device["id"])
+    def extra_state_attributes(self) -> dict[str, Any]:
+        history = self.coordinator.history.devices.get(self.device["id"])
 
-        if not device_status or not isinstance(device_status.cover_position, int):
-            return None
+        if history is None:
+            return {"last_travel_duration": None, "moves_today": 0, "stale": self._is_stale}
 
-        return device_status.cover_position
+        return {
+            "last_travel_duration": history.last_travel_duration(),
+            "moves_today": history.moves_since(dt_util.start_of_local_day().timestamp()),
+            "stale": self._is_stale,
+        }
 
     @property
-    def current_tilt_position(self) -> int | None:
-        device_status = self.coordinator.data.devices.get(self.device["id"])
-
-        if not device_status or not isinstance(device_status.tilt_position, int):
-            return None
-
-        return device_status.tilt_position
+    def _is_stale(self) -> bool:
+        return self.device["id"] in self.coordinator.watchdog.stale
 
     async def async_open_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Opening cover %s", self.device["name"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": "UP"})],
-        )
-        await self.coordinator.async_request_refresh()
+        await self._async_call_event("UP")
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
 
     async def async_close_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Closing cover %s", self.device["name"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": "DOWN"})],
-        )
-        await self.coordinator.async_request_refresh()
+        await self._async_call_event("DOWN")
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
 
     async def async_stop_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Stopping cover %s", self.device["name"])
 
-        # Use "UP" command for garage doors to stop them as they do not support "STOP"
-        command = "UP" if self.device["type"] in GARAGE_DEVICES else "STOP"
-
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": command})],
-        )
+        await self._async_call_event(_stop_value(self.device), MobilusCallPriority.STOP)
 
-        # Added arbitrary delay as proper state is returned after a while
-        await asyncio.sleep(15)
-        await self.coordinator.async_request_refresh()
+        # Proper state is returned by the gateway only after the device settles
+        self.coordinator.async_schedule_refresh(self.coordinator.options.settle_delay)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Setting cover %s position to %s", self.device["name"], kwargs["position"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": f"{kwargs['position']}%"})],
-        )
+        await self._async_call_event(f"{kwargs['position']}%")
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
 
     async def async_open_cover_tilt(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Opening tilt for cover %s", self.device["name"])
@@ -154,15 +151,244 @@ class MobilusCover(CoordinatorEntity[MobilusCoordinator], CoverEntity):
     async def async_set_cover_tilt_position(self, **kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Setting tilt position for cover %s to %s", self.device["name"], kwargs["tilt_position"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": f"{kwargs['tilt_position']}%"})],
+        await self._async_call_event(f"{kwargs['tilt_position']}%", tilt=True)
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
+
+    async def _async_call_event(
+            self, value: str, priority: MobilusCallPriority | None = None, *, tilt: bool = False) -> None:
+        if priority is None:
+            priority = command_priority(self._context)
+
+        with correlate("command"), span("command", device_id=self.device["id"], value=value):
+            await self.gateway.async_call(
+                [("call_events", {"device_id": self.device["id"], "value": value})],
+                MobilusCallKind.COMMAND,
+                priority,
+                tilt_devices=[self.device["id"]] if tilt else (),
+            )
+
+        self.coordinator.verifier.async_track(self.device, value, priority, tilt=tilt)
+        self.coordinator.watchdog.async_track(self.device["id"], value, tilt=tilt)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._resolve_state()
+        self._throttle.async_write(
+            self.async_write_ha_state, moving=self._moving, interval=self.coordinator.options.motion_write_interval,
         )
-        await self.coordinator.async_request_refresh()
+
+    def _resolve_state(self) -> None:
+        # State is resolved once per snapshot, instead of on every state property read
+        device_state = self.coordinator.data.devices.get(self.device["id"])
+        cover_position, tilt_position = _positions(device_state)
+
+        self._moving = _is_moving(device_state)
+        self._attr_current_cover_position = cover_position
+        self._attr_is_closed = cover_position == 0 if cover_position is not None else None
+        self._attr_current_cover_tilt_position = tilt_position
 
     async def async_added_to_hass(self) -> None:
         # Add a listener to the coordinator to update the entity's state on data changes
-        coordinator_listener = self.coordinator.async_add_listener(self.async_write_ha_state)
+        coordinator_listener = self.coordinator.async_add_device_listener(
+            self._handle_coordinator_update, [self.device["id"]],
+        )
 
         # Register the listener for cleanup when the entity is removed from Home Assistant
         self.async_on_remove(coordinator_listener)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._throttle.async_cancel()
+        await super().async_will_remove_from_hass()
+
+class MobilusGroupCover(CoordinatorEntity[MobilusCoordinator], CoverEntity):
+    def __init__(
+            self, entry_id: str, group_id: str, devices: list[dict[str, Any]], gateway: MobilusGateway,
+            coordinator: MobilusCoordinator) -> None:
+        self.gateway = gateway
+        self.coordinator = coordinator
+        self.entry_id = entry_id
+        self.group_id = group_id
+        self.devices = devices
+        self._throttle = MobilusWriteThrottle(coordinator.hass)
+        self._resolve_state()
+
+    @property
+    def unique_id(self) -> str:
+        # Group ids are only unique within a gateway
+        return f"{DOMAIN}_{self.entry_id}_group_{self.group_id}"
+
+    @property
+    def name(self) -> str:
+        return f"Group {self.group_id}"
+
+    @property
+    def device_class(self) -> CoverDeviceClass:
+        if all(device["type"] in GARAGE_DEVICES for device in self.devices):
+            return CoverDeviceClass.GARAGE
+
+        return CoverDeviceClass.SHUTTER
+
+    @property
+    def supported_features(self) -> CoverEntityFeature:
+        # Only features supported by every member are offered
+        return reduce(and_, (_supported_features(device["type"]) for device in self.devices))
+
+    @property
+    def current_tilt_position(self) -> int | None:
+        return self._attr_current_cover_tilt_position
+
+    @property
+    def _device_ids(self) -> list[str]:
+        return [device["id"] for device in self.devices]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "device_ids": self._device_ids,
+            "stale": any(device["id"] in self.coordinator.watchdog.stale for device in self.devices),
+        }
+
+    async def async_open_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
+        _LOGGER.info("Opening cover group %s", self.group_id)
+
+        await self._async_call_events([(device, "UP") for device in self.devices])
+        await self.coordinator.async_request_device_refresh(self._device_ids)
+
+    async def async_close_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
+        _LOGGER.info("Closing cover group %s", self.group_id)
+
+        await self._async_call_events([(device, "DOWN") for device in self.devices])
+        await self.coordinator.async_request_device_refresh(self._device_ids)
+
+    async def async_stop_cover(self, **_kwargs: Any) -> None: # noqa: ANN401
+        _LOGGER.info("Stopping cover group %s", self.group_id)
+
+        await self._async_call_events(
+            [(device, _stop_value(device)) for device in self.devices], MobilusCallPriority.STOP,
+        )
+
+        # Proper state is returned by the gateway only after the devices settle
+        self.coordinator.async_schedule_refresh(self.coordinator.options.settle_delay)
+
+    async def async_set_cover_position(self, **kwargs: Any) -> None: # noqa: ANN401
+        _LOGGER.info("Setting cover group %s position to %s", self.group_id, kwargs["position"])
+
+        await self._async_call_events([(device, f"{kwargs['position']}%") for device in self.devices])
+        await self.coordinator.async_request_device_refresh(self._device_ids)
+
+    async def async_open_cover_tilt(self, **_kwargs: Any) -> None: # noqa: ANN401
+        await self.async_set_cover_tilt_position(tilt_position=100)
+
+    async def async_close_cover_tilt(self, **_kwargs: Any) -> None: # noqa: ANN401
+        await self.async_set_cover_tilt_position(tilt_position=0)
+
+    async def async_set_cover_tilt_position(self, **kwargs: Any) -> None: # noqa: ANN401
+        _LOGGER.info("Setting tilt position for cover group %s to %s", self.group_id, kwargs["tilt_position"])
+
+        await self._async_call_events(
+            [(device, f"{kwargs['tilt_position']}%") for device in self.devices], tilt=True,
+        )
+        await self.coordinator.async_request_device_refresh(self._device_ids)
+
+    async def _async_call_events(
+            self, events: list[tuple[dict[str, Any], str]], priority: MobilusCallPriority | None = None, *,
+            tilt: bool = False) -> None:
+        if priority is None:
+            priority = command_priority(self._context)
+
+        # Commands for all members are sent together, paced and checked like any other commands sent at once
+        with correlate("command"), span("group_command", group_id=self.group_id, devices=len(events)):
+            await self.gateway.async_call(
+                [("call_events", {"device_id": device["id"], "value": value}) for device, value in events],
+                MobilusCallKind.COMMAND,
+                priority,
+                tilt_devices=self._device_ids if tilt else (),
+            )
+
+        for device, value in events:
+            self.coordinator.verifier.async_track(device, value, priority, tilt=tilt)
+            self.coordinator.watchdog.async_track(device["id"], value, tilt=tilt)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._resolve_state()
+        self._throttle.async_write(
+            self.async_write_ha_state, moving=self._moving, interval=self.coordinator.options.motion_write_interval,
+        )
+
+    def _resolve_state(self) -> None:
+        # Group reports the average of the members with a known position
+        device_states = [self.coordinator.data.devices.get(device["id"]) for device in self.devices]
+        positions = [_positions(device_state) for device_state in device_states]
+        cover_positions = [cover_position for cover_position, _tilt in positions if cover_position is not None]
+        tilt_positions = [tilt_position for _cover, tilt_position in positions if tilt_position is not None]
+
+        self._attr_current_cover_position = _average(cover_positions)
+        self._attr_is_closed = all(position == 0 for position in cover_positions) if cover_positions else None
+        self._attr_current_cover_tilt_position = _average(tilt_positions)
+        self._moving = any(_is_moving(device_state) for device_state in device_states)
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(self._handle_coordinator_update, self._device_ids),
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._throttle.async_cancel()
+        await super().async_will_remove_from_hass()
+
+def _device_groups(devices: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    groups: dict[str, list[dict[str, Any]]] = {}
+
+    for device in devices:
+        if device["type"] not in (COVER_DEVICES + GARAGE_DEVICES):
+            continue
+
+        for group_id in device.get("assignedGroupIds", []):
+            groups.setdefault(str(group_id), []).append(device)
+
+    return groups
+
+def _supported_features(device_type: int) -> CoverEntityFeature:
+    supported_features = (
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+    )
+
+    if device_type in COVER_POSITION_DEVICES:
+        supported_features |= CoverEntityFeature.SET_POSITION
+
+    if device_type in COVER_TILT_DEVICES:
+        supported_features |= (
+            CoverEntityFeature.OPEN_TILT
+            | CoverEntityFeature.CLOSE_TILT
+            | CoverEntityFeature.SET_TILT_POSITION
+        )
+
+    return supported_features
+
+def _stop_value(device: dict[str, Any]) -> str:
+    # Use "UP" command for garage doors to stop them as they do not support "STOP"
+    return "UP" if device["type"] in GARAGE_DEVICES else "STOP"
+
+def _positions(device_state: MobilusDeviceState | None) -> tuple[int | None, int | None]:
+    if device_state is None:
+        return None, None
+
+    cover_position = device_state.cover_position
+    tilt_position = device_state.tilt_position
+
+    return (
+        cover_position if isinstance(cover_position, int) else None,
+        tilt_position if isinstance(tilt_position, int) else None,
+    )
+
+def _is_moving(device_state: MobilusDeviceState | None) -> bool:
+    return device_state is not None and device_state.is_moving
+
+def _average(positions: list[int]) -> int | None:
+    if not positions:
+        return None
+
+    return round(sum(positions) / len(positions))
@@ -34,7 +34,7 @@ class MobilusDeviceState:
             return None
 
         # When tilt is moving cover position is additional position
-        if self._is_moving and self._additional_position is not None:
+        if self.is_moving and self._additional_position is not None:
             return self._additional_position
 
         return self._main_position
@@ -45,7 +45,7 @@ class MobilusDeviceState:
             return self._additional_position
 
         # When tilt is moving tilt position is main position
-        if self._is_moving:
+        if self.is_moving:
             return self._main_position
 
         return self._additional_position
@@ -55,7 +55,7 @@ class MobilusDeviceState:
         return self._main_position == self.STATE_ON
 
     @cached_property
-    def _is_moving(self) -> bool:
+    def is_moving(self) -> bool:
         return self.event_number == self.EVENT_NUMBER_MOVING
 
     @cached_property
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN
+from .poll_supervisor import async_get_poll_supervisor
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+TO_REDACT = {"password", "username"}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    gateway = hass.data[DOMAIN][entry.entry_id]["gateway"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "metrics": gateway.metrics.as_dict(),
+        "pacing": gateway.pacing.as_dict(),
+        "journal": gateway.journal.as_dict(),
+        "scheduler": {
+            "slots": gateway.scheduler.slots,
+            "active": gateway.scheduler.active,
+            "waiting": gateway.scheduler.waiting,
+        },
+        "history": coordinator.history.as_dict(),
+        "verification": coordinator.verifier.as_dict(),
+        "watchdog": coordinator.watchdog.as_dict(),
+        "poll_schedule": async_get_poll_supervisor(hass).as_dict(),
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components import network
+
+from .const import DISCOVERY_CONCURRENCY, DISCOVERY_MIN_PREFIX, DISCOVERY_TIMEOUT, GATEWAY_PORT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MobilusDiscoveredGateway:
+    host: str
+    latency: float
+
+async def async_discover_gateways(hass: HomeAssistant) -> list[MobilusDiscoveredGateway]:
+    hosts: set[str] = set()
+
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+
+        for ipv4 in adapter["ipv4"]:
+            # Larger networks are narrowed down to the neighbourhood of the local address
+            subnet = ipaddress.ip_network(
+                f"{ipv4['address']}/{max(ipv4['network_prefix'], DISCOVERY_MIN_PREFIX)}", strict=False,
+            )
+
+            if not subnet.is_loopback:
+                hosts.update(str(host) for host in subnet.hosts() if str(host) != ipv4["address"])
+
+    gateways = await async_scan(sorted(hosts, key=ipaddress.ip_address))
+    _LOGGER.info("Discovered %s gateways out of %s probed hosts", len(gateways), len(hosts))
+
+    return gateways
+
+async def async_scan(
+        hosts: Iterable[str], port: int = GATEWAY_PORT, probe_timeout: float = DISCOVERY_TIMEOUT,
+        concurrency: int = DISCOVERY_CONCURRENCY) -> list[MobilusDiscoveredGateway]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def async_probe_bounded(host: str) -> MobilusDiscoveredGateway | None:
+        async with semaphore:
+            return await async_probe(host, port, probe_timeout)
+
+    results = await asyncio.gather(*(async_probe_bounded(host) for host in hosts))
+
+    return [gateway for gateway in results if gateway is not None]
+
+async def async_probe(
+        host: str, port: int = GATEWAY_PORT,
+        probe_timeout: float = DISCOVERY_TIMEOUT) -> MobilusDiscoveredGateway | None:
+    start = time.monotonic()
+
+    try:
+        async with asyncio.timeout(probe_timeout):
+            _reader, writer = await asyncio.open_connection(host, port)
+    except (OSError, TimeoutError):
+        return None
+
+    latency = time.monotonic() - start
+    writer.close()
+
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+
+    return MobilusDiscoveredGateway(host, latency)
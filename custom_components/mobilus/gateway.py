@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import KEEPALIVE_INTERVAL, PACING_ACK_DELAY, PACING_MAX_RETRIES, TIMEOUT_GRACE_PERIOD
+from .device_state import MobilusDeviceState
+from .journal import MobilusCommandJournal
+from .metrics import MobilusGatewayMetrics
+from .multiplexer import MobilusGroupResponse, MobilusRequestGroup, route_responses, unique_commands
+from .pacing import MobilusPacing, is_acknowledged
+from .scheduler import MobilusCallPriority, MobilusScheduler
+from .session import MobilusSession
+from .spans import span
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+    from mobilus_client.app import App as MobilusClientApp
+    from mobilus_client.config import Config as MobilusClientConfig
+
+    from .options import MobilusOptions
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MobilusCallKind(StrEnum):
+    COMMAND = "command"
+    DEVICES_LIST = "devices_list"
+    POLL = "poll"
+
+class MobilusGatewayError(HomeAssistantError):
+    pass
+
+class MobilusGatewayConnectionError(MobilusGatewayError):
+    pass
+
+class MobilusGatewayTimeoutError(MobilusGatewayError):
+    pass
+
+class MobilusGatewayNoResponseError(MobilusGatewayTimeoutError):
+    pass
+
+@dataclass
+class MobilusCommandBatch:
+    commands: list[tuple[str, dict[str, str]]]
+    future: asyncio.Future[list[dict[str, Any]]]
+    priority: MobilusCallPriority
+    tilt_devices: set[str] = field(default_factory=set)
+
+DEFAULT_PRIORITIES = {
+    MobilusCallKind.COMMAND: MobilusCallPriority.INTERACTIVE,
+    MobilusCallKind.DEVICES_LIST: MobilusCallPriority.BULK,
+    MobilusCallKind.POLL: MobilusCallPriority.POLL,
+}
+
+class MobilusGateway:
+    def __init__(
+            self, hass: HomeAssistant, host: str, username: str, password: str, options: MobilusOptions) -> None:
+        self.hass = hass
+        self.host = host
+        self.username = username
+        self.password = password
+        self.metrics = MobilusGatewayMetrics()
+        self.pacing = MobilusPacing()
+        self.journal = MobilusCommandJournal()
+        self.scheduler = MobilusScheduler(options.max_concurrent_requests)
+        self.session = MobilusSession()
+        self._batch: MobilusCommandBatch | None = None
+        self._closed = False
+        self._groups: dict[tuple[MobilusCallKind, MobilusCallPriority], MobilusRequestGroup] = {}
+        self._keepalive: Callable[[], None] | None = None
+        self._replay_task: asyncio.Task[None] | None = None
+        self._warm_up_task: asyncio.Task[None] | None = None
+        self._clients: dict[MobilusCallKind, MobilusClientApp] = {}
+        self.timeouts: dict[MobilusCallKind, float] = {}
+        self.apply_options(options)
+
+    def apply_options(self, options: MobilusOptions) -> None:
+        timeouts_changed = self.timeouts != options.timeouts
+        self.timeouts = options.timeouts
+
+        if timeouts_changed:
+            # Client library deadlines are part of the client config
+            self._clients = {}
+            self._async_schedule_warm_up()
+
+        self.batch_window = options.batch_window
+        self.command_journal_ttl = options.command_journal_ttl
+        self.scheduler.set_slots(options.max_concurrent_requests)
+
+    def set_credentials(self, host: str, username: str, password: str) -> None:
+        self.host = host
+        self.username = username
+        self.password = password
+
+        # Calls already running keep the previous client, new ones build a client with new credentials
+        self._clients = {}
+        self._async_schedule_warm_up()
+
+    @callback
+    def async_start_keepalive(self) -> None:
+        # Authenticated session is kept open, so commands after a long idle period skip connection and login
+        self._keepalive = async_track_time_interval(
+            self.hass, self._async_keepalive, timedelta(seconds=KEEPALIVE_INTERVAL), cancel_on_shutdown=True,
+        )
+        self._async_schedule_warm_up()
+
+    async def async_stop_keepalive(self) -> None:
+        if self._keepalive is not None:
+            self._keepalive()
+            self._keepalive = None
+
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+
+        await self.hass.async_add_executor_job(self.session.close)
+
+    async def async_close(self) -> None:
+        # Calls still waiting for a slot fail instead of opening a session for an unloaded entry
+        self._closed = True
+
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+
+        self._clients = {}
+        await self.async_stop_keepalive()
+
+    async def async_reconnect(self) -> None:
+        # Session is opened again with a new client id and keys, and is ready once this returns
+        await self.hass.async_add_executor_job(self.session.close)
+        self._async_schedule_warm_up()
+
+        if self._warm_up_task is not None:
+            await self._warm_up_task
+
+    async def async_call(
+            self, commands: list[tuple[str, dict[str, str]]], kind: MobilusCallKind,
+            priority: MobilusCallPriority | None = None, *, tilt_devices: Collection[str] = ()) -> list[dict[str, Any]]:
+        if priority is None:
+            priority = DEFAULT_PRIORITIES[kind]
+
+        if kind is not MobilusCallKind.COMMAND:
+            return await self._async_execute(commands, kind, priority)
+
+        # Kept command is never replayed over a newer one, whether the newer one is delivered or not
+        self.journal.discard(commands)
+
+        try:
+            # Stop is sent right away instead of waiting for the batch window
+            if self.batch_window > 0 and priority is not MobilusCallPriority.STOP:
+                return await self._async_call_batched(commands, priority, tilt_devices)
+
+            return await self._async_call_commands(commands, priority, tilt_devices)
+        except (MobilusGatewayConnectionError, MobilusGatewayTimeoutError):
+            # Stop is only meaningful right away, it is never replayed later
+            if not self.command_journal_ttl or priority is MobilusCallPriority.STOP:
+                raise
+
+            _LOGGER.info("Gateway is unreachable, %s commands are kept for replay", len(commands))
+            self.journal.add(commands, self.command_journal_ttl, tilt_devices)
+
+            return []
+
+    async def _async_call_batched(
+            self, commands: list[tuple[str, dict[str, str]]], priority: MobilusCallPriority,
+            tilt_devices: Collection[str]) -> list[dict[str, Any]]:
+        # Commands issued within the batch window are sent together in a single gateway session
+        if self._batch is not None:
+            batch = self._batch
+            batch.commands.extend(commands)
+            batch.priority = min(batch.priority, priority)
+            batch.tilt_devices.update(tilt_devices)
+            return await asyncio.shield(batch.future)
+
+        batch = MobilusCommandBatch(list(commands), self.hass.loop.create_future(), priority, set(tilt_devices))
+        batch.future.add_done_callback(_consume_exception)
+        self._batch = batch
+
+        try:
+            await asyncio.sleep(self.batch_window)
+            self._batch = None
+            response = await self._async_call_commands(batch.commands, batch.priority, batch.tilt_devices)
+        except BaseException as exception:
+            self._batch = None
+
+            if isinstance(exception, Exception):
+                batch.future.set_exception(exception)
+            else:
+                batch.future.cancel()
+
+            raise
+
+        batch.future.set_result(response)
+
+        return response
+
+    async def _async_call_commands(
+            self, commands: list[tuple[str, dict[str, str]]], priority: MobilusCallPriority,
+            tilt_devices: Collection[str] = ()) -> list[dict[str, Any]]:
+        if len(commands) < 2: # noqa: PLR2004
+            return await self._async_execute(commands, MobilusCallKind.COMMAND, priority)
+
+        # Gateway radio link drops commands sent back to back, so bulk commands are paced
+        # and the ones not acknowledged by device state are sent again
+        response = []
+        pending = commands
+
+        for attempt in range(PACING_MAX_RETRIES + 1):
+            if attempt:
+                _LOGGER.info("Resending %s unacknowledged commands", len(pending))
+                self.pacing.retried += len(pending)
+
+            burst = self.pacing.burst
+
+            for index in range(0, len(pending), burst):
+                if index:
+                    await asyncio.sleep(self.pacing.gap)
+
+                response.extend(
+                    await self._async_execute(pending[index:index + burst], MobilusCallKind.COMMAND, priority),
+                )
+
+            await asyncio.sleep(PACING_ACK_DELAY)
+
+            # Delivery check is part of sending the commands, it is not held back by the poll cap of the coordinators
+            try:
+                state = await self._async_execute([("current_state", {})], MobilusCallKind.POLL, priority)
+            except MobilusGatewayError as exception:
+                _LOGGER.warning("Failed to verify commands delivery: %s", exception)
+                return response
+
+            device_states = {
+                event["deviceId"]: MobilusDeviceState(
+                    device_id=event["deviceId"], event_number=event["eventNumber"], value=event["value"],
+                )
+                for event in (state[0].get("events", []) if state else [])
+            }
+            unacknowledged = [
+                (command, params) for command, params in pending
+                if not is_acknowledged(
+                    params["value"], device_states.get(params["device_id"]), tilt=params["device_id"] in tilt_devices,
+                )
+            ]
+
+            self.pacing.adapt(len(pending), len(unacknowledged))
+            pending = unacknowledged
+
+            if not pending:
+                return response
+
+        _LOGGER.warning("%s commands were not acknowledged by devices", len(pending))
+        self.pacing.failed += len(pending)
+
+        return response
+
+    async def _async_execute(
+            self, commands: list[tuple[str, dict[str, str]]], kind: MobilusCallKind,
+            priority: MobilusCallPriority) -> list[dict[str, Any]]:
+        key = (kind, priority)
+
+        # Commands are never merged, the radio link drops commands sent back to back in one session,
+        # several commands are sent by the paced path instead
+        mergeable = kind is not MobilusCallKind.COMMAND
+        group = self._groups.get(key) if mergeable else None
+
+        # Requests arriving while another one waits for a slot join it and share its gateway session
+        if group is not None:
+            group.commands.extend(commands)
+            group.requests += 1
+            group_response = await asyncio.shield(group.future)
+
+            return group_response.for_commands(commands)
+
+        group = MobilusRequestGroup(list(commands), self.hass.loop.create_future())
+        group.future.add_done_callback(_consume_exception)
+
+        if mergeable:
+            self._groups[key] = group
+
+        try:
+            group_response = await self._async_execute_group(group, kind, priority)
+        except BaseException as exception:
+            if self._groups.get(key) is group:
+                del self._groups[key]
+
+            if isinstance(exception, Exception):
+                group.future.set_exception(exception)
+            else:
+                group.future.cancel()
+
+            raise
+
+        group.future.set_result(group_response)
+
+        if group.requests > 1:
+            return group_response.for_commands(commands)
+
+        return group_response.response
+
+    async def _async_execute_group(
+            self, group: MobilusRequestGroup, kind: MobilusCallKind,
+            priority: MobilusCallPriority) -> MobilusGroupResponse:
+        timeout = self.timeouts[kind]
+
+        # Waiting calls are started by priority, so stop and user commands do not queue behind polls
+        with span("queue_wait", kind=kind, priority=priority.name):
+            await self.scheduler.async_acquire(priority)
+
+        # Requests arriving from now on wait for the next session
+        if self._groups.get((kind, priority)) is group:
+            del self._groups[kind, priority]
+
+        if self._closed:
+            self.scheduler.release()
+            message = "Gateway connection is closed"
+            raise MobilusGatewayConnectionError(message)
+        commands = unique_commands(group.commands) if group.requests > 1 else group.commands
+
+        try:
+            start = time.monotonic()
+
+            # The client library enforces its own deadline and terminates the session,
+            # this one only guards the event loop if the executor job hangs anyway
+            with span("round_trip", kind=kind, commands=len(commands)):
+                async with asyncio.timeout(timeout + TIMEOUT_GRACE_PERIOD):
+                    # Executor job runs in a copy of the context, so its spans keep the correlation id
+                    response, warm = await self.hass.async_add_executor_job(
+                        contextvars.copy_context().run, self._call, commands, kind,
+                    )
+        except TimeoutError as exception:
+            raise self._timeout_error(kind, timeout) from exception
+        except OSError as exception:
+            _LOGGER.warning("Gateway %s call failed: %s", kind, exception)
+            self._async_schedule_warm_up()
+            raise MobilusGatewayConnectionError(str(exception)) from exception
+        finally:
+            self.scheduler.release()
+
+        duration = time.monotonic() - start
+
+        # Incomplete response returned after the library deadline passed, an empty one is also
+        # what the client library returns after a failed login
+        if len(response) < len(commands) and duration >= self._library_deadline(kind):
+            error = MobilusGatewayTimeoutError if response else MobilusGatewayNoResponseError
+            raise self._timeout_error(kind, timeout, error)
+
+        self.metrics.record_call(kind, duration)
+        self.metrics.record_session(kind, warm=warm, duration=duration)
+
+        # Gateway is reachable again, send commands kept while it was not
+        self._async_schedule_replay()
+
+        if group.requests == 1:
+            return MobilusGroupResponse(response)
+
+        with span("response_routing", requests=group.requests, commands=len(commands)):
+            return MobilusGroupResponse(response, route_responses(commands, response))
+
+    @callback
+    def _async_schedule_replay(self) -> None:
+        if not self.journal or self._replay_task is not None or self._closed:
+            return
+
+        self._replay_task = self.hass.async_create_background_task(
+            self._async_replay(), "mobilus_journal_replay",
+        )
+
+    async def _async_replay(self) -> None:
+        try:
+            entries = self.journal.pop()
+
+            if not entries:
+                return
+
+            _LOGGER.info("Replaying %s commands kept while gateway was unreachable", len(entries))
+
+            try:
+                await self._async_call_commands(
+                    [
+                        ("call_events", {"device_id": device_id, "value": entry.value})
+                        for device_id, entry in entries.items()
+                    ],
+                    MobilusCallPriority.BULK,
+                    {device_id for device_id, entry in entries.items() if entry.tilt},
+                )
+            except (MobilusGatewayConnectionError, MobilusGatewayTimeoutError):
+                # Commands that fail again with the gateway unreachable are put back into the journal
+                self.journal.restore(entries)
+                raise
+        except MobilusGatewayError as exception:
+            _LOGGER.warning("Failed to replay commands: %s", exception)
+        finally:
+            self._replay_task = None
+
+    async def _async_keepalive(self, _now: datetime) -> None:
+        # Connection itself is kept alive by MQTT pings, only a dropped session is opened again
+        if not self.session.is_ready:
+            self._async_schedule_warm_up()
+
+    @callback
+    def _async_schedule_warm_up(self) -> None:
+        if self._keepalive is None or self._warm_up_task is not None:
+            return
+
+        self._warm_up_task = self.hass.async_create_background_task(
+            self._async_warm_up(), "mobilus_session_warm_up",
+        )
+
+    async def _async_warm_up(self) -> None:
+        try:
+            with span("session_warm_up"):
+                ready = await self.hass.async_add_executor_job(self._connect_session)
+
+            if not ready:
+                _LOGGER.info("Failed to open gateway session, calls use a session of their own")
+                return
+
+            # Gateway is reachable again, commands kept while it was not are sent without waiting for a call
+            self._async_schedule_replay()
+        finally:
+            self._warm_up_task = None
+
+    def _connect_session(self) -> bool:
+        return self.session.connect(self._config(MobilusCallKind.COMMAND))
+
+    def _call(
+            self, commands: list[tuple[str, dict[str, str]]], kind: MobilusCallKind,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        raw_response = self.session.call(commands, self._library_deadline(kind)) if self._keepalive else None
+        warm = raw_response is not None
+
+        # Session is busy or not open, the call opens a session of its own
+        if raw_response is None:
+            raw_response = self._client(kind).call(commands)
+
+        with span("json_decode", kind=kind, size=len(raw_response)):
+            response: list[dict[str, Any]] = json.loads(raw_response)
+
+        return response, warm
+
+    def _client(self, kind: MobilusCallKind) -> MobilusClientApp:
+        if kind not in self._clients:
+            # Imported lazily, so the client crypto and protocol stack is loaded in the executor
+            # on first call instead of on the event loop while integrations are being loaded
+            from mobilus_client.app import App as MobilusClientApp  # noqa: PLC0415
+
+            self._clients[kind] = MobilusClientApp(self._config(kind))
+
+        return self._clients[kind]
+
+    def _config(self, kind: MobilusCallKind) -> MobilusClientConfig:
+        from mobilus_client.config import Config as MobilusClientConfig  # noqa: PLC0415
+
+        deadline = self._library_deadline(kind)
+
+        return MobilusClientConfig(
+            gateway_host=self.host,
+            user_login=self.username,
+            user_password=self.password,
+            auth_timeout_period=deadline,
+            timeout_period=deadline,
+        )
+
+    def _library_deadline(self, kind: MobilusCallKind) -> float:
+        # Split the deadline between authentication and waiting for responses
+        return self.timeouts[kind] / 2
+
+    def _timeout_error(
+            self, kind: MobilusCallKind, timeout: float,
+            error: type[MobilusGatewayTimeoutError] = MobilusGatewayTimeoutError) -> MobilusGatewayTimeoutError:
+        _LOGGER.warning("Gateway %s call timed out after %s seconds", kind, timeout)
+        self.metrics.record_timeout(kind)
+        self._async_schedule_warm_up()
+
+        return error(f"Gateway {kind} call timed out after {timeout} seconds")
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    # Batch leader re-raises the exception itself, so a batch without followers is not reported as unretrieved
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+from .device_state import MobilusDeviceState
+
+if TYPE_CHECKING:
+    from .device_state import MobilusDeviceStateList
+
+# Stored in place of a missing position, arrays cannot hold None
+NO_POSITION = -1
+
+
+class MobilusDeviceHistory:
+    __slots__ = ("_event_numbers", "_head", "_positions", "_size", "_tilts", "_timestamps", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+
+        # Preallocated columns, appending a sample only overwrites values in place
+        self._timestamps = array("d", [0.0]) * capacity
+        self._event_numbers = array("i", [0]) * capacity
+        self._positions = array("b", [NO_POSITION]) * capacity
+        self._tilts = array("b", [NO_POSITION]) * capacity
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, event_number: int, position: int | None, tilt: int | None) -> bool:
+        position = NO_POSITION if position is None else position
+        tilt = NO_POSITION if tilt is None else tilt
+
+        # Only state changes are kept, so repeated polls of an idle device do not evict older samples
+        if self._size:
+            last = self._index(self._size - 1)
+
+            if (
+                self._event_numbers[last] == event_number
+                and self._positions[last] == position
+                and self._tilts[last] == tilt
+            ):
+                return False
+
+        self._timestamps[self._head] = timestamp
+        self._event_numbers[self._head] = event_number
+        self._positions[self._head] = position
+        self._tilts[self._head] = tilt
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        return True
+
+    def samples(self) -> list[tuple[float, int, int | None, int | None]]:
+        return [
+            (
+                self._timestamps[index],
+                self._event_numbers[index],
+                self._value(self._positions[index]),
+                self._value(self._tilts[index]),
+            )
+            for index in map(self._index, range(self._size))
+        ]
+
+    def last_changed(self) -> float | None:
+        if not self._size:
+            return None
+
+        return self._timestamps[self._index(self._size - 1)]
+
+    def last_travel_duration(self) -> float | None:
+        # Find the newest sample ending a move, then the first sample of that move
+        end = None
+
+        for offset in range(self._size - 1, 0, -1):
+            if self._is_moving(offset - 1) and not self._is_moving(offset):
+                end = offset
+                break
+
+        if end is None:
+            return None
+
+        start = end - 1
+
+        while start > 0 and self._is_moving(start - 1):
+            start -= 1
+
+        return self._timestamps[self._index(end)] - self._timestamps[self._index(start)]
+
+    def moves_since(self, timestamp: float) -> int:
+        moves = 0
+
+        for offset in range(self._size):
+            index = self._index(offset)
+
+            if (
+                self._timestamps[index] >= timestamp
+                and self._is_moving(offset)
+                and (offset == 0 or not self._is_moving(offset - 1))
+            ):
+                moves += 1
+
+        return moves
+
+    def _index(self, offset: int) -> int:
+        # Offset 0 is the oldest sample kept in the buffer
+        return (self._head - self._size + offset) % self.capacity
+
+    def _is_moving(self, offset: int) -> bool:
+        return self._event_numbers[self._index(offset)] == MobilusDeviceState.EVENT_NUMBER_MOVING
+
+    def _value(self, value: int) -> int | None:
+        return None if value == NO_POSITION else value
+
+class MobilusStateHistory:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.devices: dict[str, MobilusDeviceHistory] = {}
+
+    def record(self, data: MobilusDeviceStateList, timestamp: float) -> None:
+        for device_id, device_state in data.devices.items():
+            history = self.devices.get(device_id)
+
+            if history is None:
+                history = self.devices[device_id] = MobilusDeviceHistory(self.capacity)
+
+            history.append(
+                timestamp,
+                device_state.event_number,
+                device_state.cover_position,
+                device_state.tilt_position,
+            )
+
+    def as_dict(self) -> dict[str, list[tuple[float, int, int | None, int | None]]]:
+        return {device_id: history.samples() for device_id, history in self.devices.items()}
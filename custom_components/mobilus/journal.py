@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+@dataclass
+class MobilusJournalEntry:
+    value: str
+    expires: float
+    tilt: bool = False
+
+class MobilusCommandJournal:
+    def __init__(self) -> None:
+        # Latest desired state per device, so the journal is bounded by the number of devices
+        self.entries: dict[str, MobilusJournalEntry] = {}
+        # Devices commanded since the last pop, their popped entries are not put back
+        self._superseded: set[str] = set()
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, commands: list[tuple[str, dict[str, str]]], ttl: float, tilt_devices: Collection[str] = ()) -> None:
+        expires = time.monotonic() + ttl
+
+        for command, params in commands:
+            if command == "call_events":
+                self.entries[params["device_id"]] = MobilusJournalEntry(
+                    params["value"], expires, params["device_id"] in tilt_devices,
+                )
+                self._superseded.add(params["device_id"])
+
+    def discard(self, commands: list[tuple[str, dict[str, str]]]) -> None:
+        # Newer command for a device supersedes the one kept for it
+        for command, params in commands:
+            if command == "call_events":
+                self.entries.pop(params["device_id"], None)
+                self._superseded.add(params["device_id"])
+
+    def pop(self) -> dict[str, MobilusJournalEntry]:
+        now = time.monotonic()
+        entries = {device_id: entry for device_id, entry in self.entries.items() if entry.expires > now}
+        self.entries = {}
+        self._superseded = set()
+
+        return entries
+
+    def restore(self, entries: dict[str, MobilusJournalEntry]) -> None:
+        # Entries are put back with their original expiry, so failed replays do not extend it
+        for device_id, entry in entries.items():
+            if device_id not in self._superseded:
+                self.entries[device_id] = entry
+
+    def as_dict(self) -> dict[str, Any]:
+        now = time.monotonic()
+
+        return {
+            device_id: {"value": entry.value, "expires_in": entry.expires - now}
+            for device_id, entry in self.entries.items()
+        }
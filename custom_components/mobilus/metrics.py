@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class MobilusCallStats:
+    calls: int = 0
+    timeouts: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+
+    def record(self, duration: float) -> None:
+        self.calls += 1
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+    @property
+    def average_duration(self) -> float | None:
+        if not self.calls:
+            return None
+
+        return self.total_duration / self.calls
+
+@dataclass
+class MobilusGatewayMetrics:
+    calls: dict[str, MobilusCallStats] = field(default_factory=dict)
+    sessions: dict[str, MobilusCallStats] = field(default_factory=dict)
+
+    def record_call(self, kind: str, duration: float) -> None:
+        self._stats(kind).record(duration)
+
+    def record_session(self, kind: str, *, warm: bool, duration: float) -> None:
+        # Calls served by the kept open session skip connection and login
+        self.sessions.setdefault(f"{kind}_{'warm' if warm else 'cold'}", MobilusCallStats()).record(duration)
+
+    def record_timeout(self, kind: str) -> None:
+        self._stats(kind).timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": _stats_as_dict(self.calls),
+            "sessions": _stats_as_dict(self.sessions),
+        }
+
+    def _stats(self, kind: str) -> MobilusCallStats:
+        return self.calls.setdefault(kind, MobilusCallStats())
+
+def _stats_as_dict(calls: dict[str, MobilusCallStats]) -> dict[str, Any]:
+    return {
+        kind: {**asdict(stats), "average_duration": stats.average_duration}
+        for kind, stats in calls.items()
+    }
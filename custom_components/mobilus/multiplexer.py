@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import asyncio
+
+MobilusCommandKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class MobilusRequestGroup:
+    commands: list[tuple[str, dict[str, str]]]
+    future: asyncio.Future[MobilusGroupResponse]
+    requests: int = 1
+
+@dataclass
+class MobilusGroupResponse:
+    response: list[dict[str, Any]]
+    routed: dict[MobilusCommandKey, list[dict[str, Any]]] = field(default_factory=dict)
+
+    def for_commands(self, commands: list[tuple[str, dict[str, str]]]) -> list[dict[str, Any]]:
+        return [
+            item
+            for key in dict.fromkeys(command_key(command, params) for command, params in commands)
+            for item in self.routed.get(key, [])
+        ]
+
+def command_key(command: str, params: dict[str, str]) -> MobilusCommandKey:
+    return command, tuple(sorted(params.items()))
+
+def unique_commands(commands: list[tuple[str, dict[str, str]]]) -> list[tuple[str, dict[str, str]]]:
+    # State queries are answered once for all requests, repeated commands are sent once
+    unique = {command_key(command, params): (command, params) for command, params in reversed(commands)}
+
+    return list(reversed(unique.values()))
+
+def route_responses(
+        commands: list[tuple[str, dict[str, str]]],
+        response: list[dict[str, Any]]) -> dict[MobilusCommandKey, list[dict[str, Any]]]:
+    # Gateway protocol has no request ids, responses are matched to requests by their content.
+    # Call events are echoed back one by one, state queries are answered once per session.
+    echoes: dict[tuple[str, str], list[int]] = {}
+
+    for index, item in enumerate(response):
+        events = item.get("events", [item])
+
+        if len(events) == 1 and "deviceId" in events[0]:
+            echoes.setdefault((str(events[0]["deviceId"]), str(events[0].get("value"))), []).append(index)
+
+    routed: dict[MobilusCommandKey, list[dict[str, Any]]] = {}
+    claimed: set[int] = set()
+
+    for command, params in commands:
+        if command != "call_events":
+            continue
+
+        indexes = echoes.get((params["device_id"], params["value"]))
+
+        if indexes:
+            index = indexes.pop(0)
+            claimed.add(index)
+            routed[command_key(command, params)] = [response[index]]
+
+    for index, item in enumerate(response):
+        if index in claimed:
+            continue
+
+        command = "devices_list" if "devices" in item else "current_state"
+        routed.setdefault((command, ()), []).append(item)
+
+    return routed
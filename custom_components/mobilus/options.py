@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .const import (
+    CONF_ACTIVE_REFRESH_INTERVAL,
+    CONF_BATCH_WINDOW,
+    CONF_COMMAND_JOURNAL_TTL,
+    CONF_COMMAND_TIMEOUT,
+    CONF_DEVICES_LIST_TIMEOUT,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MOTION_WRITE_INTERVAL,
+    CONF_POLL_TIMEOUT,
+    CONF_PRIORITY_DEVICE_TYPES,
+    CONF_REFRESH_INTERVAL,
+    CONF_SETTLE_DELAY,
+    DEFAULT_ACTIVE_REFRESH_INTERVAL,
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_COMMAND_JOURNAL_TTL,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_DEVICES_LIST_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MOTION_WRITE_INTERVAL,
+    DEFAULT_POLL_TIMEOUT,
+    DEFAULT_PRIORITY_DEVICE_TYPES,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_SETTLE_DELAY,
+)
+from .device import MobilusDevice
+from .gateway import MobilusCallKind
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+
+
+@dataclass(frozen=True)
+class MobilusOptions:
+    refresh_interval: int = DEFAULT_REFRESH_INTERVAL
+    active_refresh_interval: int = DEFAULT_ACTIVE_REFRESH_INTERVAL
+    settle_delay: float = DEFAULT_SETTLE_DELAY
+    batch_window: float = DEFAULT_BATCH_WINDOW
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    command_timeout: float = DEFAULT_COMMAND_TIMEOUT
+    devices_list_timeout: float = DEFAULT_DEVICES_LIST_TIMEOUT
+    poll_timeout: float = DEFAULT_POLL_TIMEOUT
+    priority_device_types: frozenset[MobilusDevice] = frozenset(DEFAULT_PRIORITY_DEVICE_TYPES)
+    command_journal_ttl: float = DEFAULT_COMMAND_JOURNAL_TTL
+    motion_write_interval: float = DEFAULT_MOTION_WRITE_INTERVAL
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> MobilusOptions:
+        options = entry.options
+
+        return cls(
+            refresh_interval=options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL),
+            active_refresh_interval=options.get(CONF_ACTIVE_REFRESH_INTERVAL, DEFAULT_ACTIVE_REFRESH_INTERVAL),
+            settle_delay=options.get(CONF_SETTLE_DELAY, DEFAULT_SETTLE_DELAY),
+            batch_window=options.get(CONF_BATCH_WINDOW, DEFAULT_BATCH_WINDOW),
+            max_concurrent_requests=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            command_timeout=options.get(CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT),
+            devices_list_timeout=options.get(CONF_DEVICES_LIST_TIMEOUT, DEFAULT_DEVICES_LIST_TIMEOUT),
+            poll_timeout=options.get(CONF_POLL_TIMEOUT, DEFAULT_POLL_TIMEOUT),
+            priority_device_types=frozenset(
+                MobilusDevice[name]
+                for name in options.get(
+                    CONF_PRIORITY_DEVICE_TYPES, [device.name for device in DEFAULT_PRIORITY_DEVICE_TYPES],
+                )
+            ),
+            command_journal_ttl=options.get(CONF_COMMAND_JOURNAL_TTL, DEFAULT_COMMAND_JOURNAL_TTL),
+            motion_write_interval=options.get(CONF_MOTION_WRITE_INTERVAL, DEFAULT_MOTION_WRITE_INTERVAL),
+        )
+
+    @property
+    def timeouts(self) -> dict[MobilusCallKind, float]:
+        return {
+            MobilusCallKind.COMMAND: self.command_timeout,
+            MobilusCallKind.DEVICES_LIST: self.devices_list_timeout,
+            MobilusCallKind.POLL: self.poll_timeout,
+        }
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    PACING_INITIAL_BURST,
+    PACING_INITIAL_GAP,
+    PACING_MAX_BURST,
+    PACING_MAX_GAP,
+    PACING_MIN_GAP,
+)
+
+if TYPE_CHECKING:
+    from .device_state import MobilusDeviceState
+
+# Values reported by the gateway once a device reached the commanded state
+TARGET_VALUES = {
+    "UP": ("UP", "100%"),
+    "DOWN": ("DOWN", "0%"),
+}
+
+
+@dataclass
+class MobilusPacing:
+    burst: int = PACING_INITIAL_BURST
+    gap: float = PACING_INITIAL_GAP
+    acknowledged: int = 0
+    lost: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    def adapt(self, sent: int, lost: int) -> None:
+        self.acknowledged += sent - lost
+        self.lost += lost
+
+        # Additive increase while the radio link keeps up, multiplicative decrease once commands are dropped
+        if lost:
+            self.burst = max(1, self.burst // 2)
+            self.gap = min(PACING_MAX_GAP, self.gap * 2)
+        else:
+            self.burst = min(PACING_MAX_BURST, self.burst + 1)
+            self.gap = max(PACING_MIN_GAP, self.gap / 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+def is_acknowledged(value: str, device_state: MobilusDeviceState | None, *, tilt: bool = False) -> bool:
+    if device_state is None:
+        return False
+
+    if value == "STOP":
+        return not device_state.is_moving
+
+    # Device started moving
+    if device_state.is_moving:
+        return True
+
+    # Tilt is reported in the additional position of the device state
+    if tilt:
+        return f"{device_state.tilt_position}%" == value
+
+    main, _separator, _additional = device_state.value.partition(":")
+
+    return main in TARGET_VALUES.get(value, (value,))
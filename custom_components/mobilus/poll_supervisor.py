@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DATA_POLL_SUPERVISOR, POLL_JITTER, POLL_MAX_CONCURRENT
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MobilusCoordinator
+
+# Fractional parts of multiples of the golden ratio spread any number of entries evenly,
+# so phases of already running entries do not have to change when another one is added
+GOLDEN_RATIO = 0.618033988749895
+
+
+@dataclass
+class MobilusPollSlot:
+    coordinator: MobilusCoordinator
+    index: int
+    phase: float
+
+class MobilusPollSupervisor:
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.running = 0
+        self.slots: dict[str, MobilusPollSlot] = {}
+
+    @callback
+    def async_register(self, entry_id: str, coordinator: MobilusCoordinator) -> Callable[[], None]:
+        used = {slot.index for slot in self.slots.values()}
+        index = next(index for index in range(len(used) + 1) if index not in used)
+
+        # Random shift keeps gateways apart even when their refresh intervals differ
+        interval = coordinator.update_interval.total_seconds() if coordinator.update_interval is not None else 0
+        phase = (index * GOLDEN_RATIO % 1) * interval + random.uniform(0, POLL_JITTER) # noqa: S311
+
+        self.slots[entry_id] = MobilusPollSlot(coordinator, index, phase)
+
+        # State fetched at setup already is the poll of a phase within the jitter, the regular schedule keeps it
+        if phase > POLL_JITTER:
+            coordinator.async_schedule_phase_refresh(phase)
+
+        @callback
+        def async_unregister() -> None:
+            self.slots.pop(entry_id, None)
+
+        return async_unregister
+
+    @asynccontextmanager
+    async def async_poll(self) -> AsyncIterator[None]:
+        async with self.semaphore:
+            self.running += 1
+
+            try:
+                yield
+            finally:
+                self.running -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "entries": {
+                entry_id: {
+                    "index": slot.index,
+                    "phase": slot.phase,
+                    "update_interval": slot.coordinator.update_interval.total_seconds()
+                    if slot.coordinator.update_interval is not None else None,
+                }
+                for entry_id, slot in self.slots.items()
+            },
+        }
+
+@callback
+@singleton(DATA_POLL_SUPERVISOR)
+def async_get_poll_supervisor(_hass: HomeAssistant) -> MobilusPollSupervisor:
+    return MobilusPollSupervisor(POLL_MAX_CONCURRENT)
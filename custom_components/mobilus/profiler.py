@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SERVICE_PROFILE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .coordinator import MobilusCoordinator
+    from .gateway import MobilusGateway
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_POLLS = "polls"
+ATTR_SECONDS = "seconds"
+
+# Hot spots listed in the summary
+SUMMARY_ENTRIES = 30
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=60): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+        vol.Optional(ATTR_POLLS): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    },
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(hass, call.data[ATTR_SECONDS], call.data.get(ATTR_POLLS))
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_PROFILE, async_handle_profile, PROFILE_SCHEMA, SupportsResponse.OPTIONAL,
+    )
+
+async def async_profile(hass: HomeAssistant, seconds: float, polls: int | None) -> dict[str, str]:
+    entries = list(hass.data.get(DOMAIN, {}).values())
+
+    if not entries:
+        raise HomeAssistantError(translation_domain=DOMAIN, translation_key="no_gateway_loaded")
+
+    gateways: list[MobilusGateway] = [entry_data["gateway"] for entry_data in entries]
+    coordinators: list[MobilusCoordinator] = [entry_data["coordinator"] for entry_data in entries]
+
+    polled = asyncio.Event()
+    poll_count = 0
+
+    @callback
+    def async_count_poll() -> None:
+        nonlocal poll_count
+        poll_count += 1
+
+        if polls is not None and poll_count >= polls:
+            polled.set()
+
+    unsubscribers: list[Callable[[], None]] = [
+        coordinator.async_add_listener(async_count_poll) for coordinator in coordinators
+    ]
+    wait_before = _gateway_wait(gateways)
+    profiler = cProfile.Profile()
+
+    try:
+        # Only the event loop thread is profiled, so coordinator updates, state parsing and entity state
+        # writes are covered while time spent inside the client library is taken from the gateway metrics
+        profiler.enable()
+    except ValueError as exception:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+        raise HomeAssistantError(translation_domain=DOMAIN, translation_key="profiler_running") from exception
+
+    start = time.monotonic()
+
+    try:
+        async with asyncio.timeout(seconds):
+            await polled.wait()
+    except TimeoutError:
+        pass
+    finally:
+        profiler.disable()
+
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    duration = time.monotonic() - start
+    wait_after = _gateway_wait(gateways)
+    calls, wait = wait_after[0] - wait_before[0], wait_after[1] - wait_before[1]
+
+    timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+    profile_path = hass.config.path(f"{DOMAIN}_profile_{timestamp}.prof")
+    summary_path = hass.config.path(f"{DOMAIN}_profile_{timestamp}.txt")
+    header = (
+        f"Profiled for {duration:.1f} seconds, {poll_count} coordinator updates\n"
+        f"Gateway calls: {calls}, time waiting on client call: {wait:.3f} seconds\n\n"
+    )
+
+    await hass.async_add_executor_job(_write_reports, profiler, header, profile_path, summary_path)
+
+    _LOGGER.info("Profile written to %s, summary written to %s", profile_path, summary_path)
+
+    return {"profile": profile_path, "summary": summary_path}
+
+def _gateway_wait(gateways: list[MobilusGateway]) -> tuple[int, float]:
+    call_stats = [stats for gateway in gateways for stats in gateway.metrics.calls.values()]
+
+    return sum(stats.calls for stats in call_stats), sum(stats.total_duration for stats in call_stats)
+
+def _write_reports(profiler: cProfile.Profile, header: str, profile_path: str, summary_path: str) -> None:
+    profiler.dump_stats(profile_path)
+
+    summary = io.StringIO()
+    summary.write(header)
+    pstats.Stats(profiler, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_ENTRIES)
+
+    Path(summary_path).write_text(summary.getvalue(), encoding="utf-8")
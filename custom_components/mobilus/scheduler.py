@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from homeassistant.core import Context
+
+
+class MobilusCallPriority(IntEnum):
+    STOP = 0
+    INTERACTIVE = 1
+    BULK = 2
+    POLL = 3
+
+class MobilusScheduler:
+    def __init__(self, slots: int) -> None:
+        self.slots = slots
+        self.active = 0
+        self._sequence = itertools.count()
+        self._waiters: list[tuple[MobilusCallPriority, int, asyncio.Future[None]]] = []
+
+    @property
+    def waiting(self) -> int:
+        return sum(not future.done() for _priority, _sequence, future in self._waiters)
+
+    def set_slots(self, slots: int) -> None:
+        self.slots = slots
+        self._wake()
+
+    async def async_acquire(self, priority: MobilusCallPriority) -> None:
+        if self.active < self.slots and not self._waiters:
+            self.active += 1
+            return
+
+        # Waiters are ordered by priority, then by arrival within the same priority
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._wake()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Slot was handed over just before cancellation, pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self.active < self.slots and self._waiters:
+            _priority, _sequence, future = heapq.heappop(self._waiters)
+
+            # Cancelled waiters are left in the heap and skipped here
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+def command_priority(context: Context | None) -> MobilusCallPriority:
+    # Commands issued by a user from the UI go ahead of automations and scripts
+    if context is not None and context.user_id is not None:
+        return MobilusCallPriority.INTERACTIVE
+
+    return MobilusCallPriority.BULK
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import secrets
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mobilus_client.client import Client as MobilusClient
+    from mobilus_client.config import Config as MobilusClientConfig
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MobilusSession:
+    def __init__(self) -> None:
+        self._client: MobilusClient | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        client = self._client
+
+        return (
+            client is not None
+            and client.authenticated_event.is_set()
+            and client.mqtt_client.is_connected()
+        )
+
+    def connect(self, config: MobilusClientConfig) -> bool:
+        # Imported lazily, the same as the client app
+        from mobilus_client.client import Client as MobilusClient  # noqa: PLC0415
+        from mobilus_client.registries.key import KeyRegistry  # noqa: PLC0415
+        from mobilus_client.registries.message import MessageRegistry  # noqa: PLC0415
+
+        with self._lock:
+            self._close()
+
+            client = MobilusClient(
+                client_id=secrets.token_hex(6).upper(),
+                config=config,
+                key_registry=KeyRegistry(config.user_key),
+                message_registry=MessageRegistry(),
+            )
+
+            try:
+                authenticated = client.connect_and_authenticate()
+            except OSError as exception:
+                _LOGGER.info("Failed to open gateway session: %s", exception)
+                authenticated = False
+
+            if not authenticated:
+                client.terminate()
+                return False
+
+            self._client = client
+
+        return True
+
+    def call(self, commands: list[tuple[str, dict[str, str]]], timeout: float) -> str | None:
+        # Session serves one call at a time, concurrent calls fall back to a session of their own
+        if not self._lock.acquire(blocking=False):
+            return None
+
+        try:
+            client = self._client
+
+            if client is None or not self.is_ready:
+                return None
+
+            from mobilus_client.messages.serializer import MessageSerializer  # noqa: PLC0415
+            from mobilus_client.registries.message import MessageRegistry  # noqa: PLC0415
+
+            client.message_registry = MessageRegistry()
+            client.completed_event.clear()
+
+            for command, params in commands:
+                client.send_request(command, **params)
+
+            client.completed_event.wait(timeout=timeout)
+            responses = client.message_registry.get_responses()
+
+            # Session that stopped responding is dropped and opened again by the keepalive
+            if not client.completed_event.is_set():
+                _LOGGER.info("Gateway session stopped responding, closing it")
+                self._close()
+
+            return MessageSerializer.serialize_list_to_json(responses)
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._client is not None:
+            self._client.terminate()
+            self._client = None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import secrets
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from contextlib import AbstractContextManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shared by all disabled spans, nullcontext can be entered any number of times
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+correlation_id: ContextVar[str | None] = ContextVar("mobilus_correlation_id", default=None)
+
+
+def correlate(prefix: str) -> AbstractContextManager[None]:
+    # Keep the correlation id of an outer operation, so a command and the refresh it triggers share one id
+    if correlation_id.get() is not None or not _LOGGER.isEnabledFor(logging.DEBUG):
+        return _NULL_SPAN
+
+    return _correlate(f"{prefix}-{secrets.token_hex(4)}")
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[None]: # noqa: ANN401
+    # Spans are only measured while debug logging is enabled for this module
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return _NULL_SPAN
+
+    return _span(name, attributes)
+
+@contextmanager
+def _correlate(value: str) -> Generator[None, None, None]:
+    token = correlation_id.set(value)
+
+    try:
+        yield
+    finally:
+        correlation_id.reset(token)
+
+@contextmanager
+def _span(name: str, attributes: dict[str, Any]) -> Generator[None, None, None]:
+    start = time.perf_counter()
+    error = None
+
+    try:
+        yield
+    except BaseException as exception:
+        error = type(exception).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+
+        _LOGGER.debug(
+            "Span %s took %.1f ms [%s] %s",
+            name,
+            duration * 1000,
+            correlation_id.get(),
+            {**attributes, "error": error} if error else attributes,
+            extra={
+                "mobilus_span": name,
+                "mobilus_duration": duration,
+                "mobilus_correlation_id": correlation_id.get(),
+                "mobilus_attributes": attributes,
+                "mobilus_error": error,
+            },
+        )
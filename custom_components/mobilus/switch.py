@@ -4,16 +4,22 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SWITCH_DEVICES
+from .const import DOMAIN, SIGNAL_NEW_DEVICES, SWITCH_DEVICES
 from .coordinator import MobilusCoordinator
+from .gateway import MobilusCallKind
+from .scheduler import command_priority
+from .spans import correlate, span
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
-    from mobilus_client.app import App as MobilusClientApp
+
+    from .gateway import MobilusGateway
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,20 +28,28 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    gateway = hass.data[DOMAIN][entry.entry_id]["gateway"]
     devices = hass.data[DOMAIN][entry.entry_id]["devices"]
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
 
-    async_add_entities([
-        MobilusSwitch(device, client, coordinator)
-        for device in devices if device["type"] in SWITCH_DEVICES
-    ])
+    @callback
+    def async_add_devices(devices: list[dict[str, Any]]) -> None:
+        async_add_entities([
+            MobilusSwitch(device, gateway, coordinator)
+            for device in devices if device["type"] in SWITCH_DEVICES
+        ])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_NEW_DEVICES.format(entry.entry_id), async_add_devices),
+    )
+    async_add_devices(devices)
 
 class MobilusSwitch(CoordinatorEntity[MobilusCoordinator], SwitchEntity):
-    def __init__(self, device: dict[str, Any], client: MobilusClientApp, coordinator: MobilusCoordinator) -> None:
-        self.client = client
+    def __init__(self, device: dict[str, Any], gateway: MobilusGateway, coordinator: MobilusCoordinator) -> None:
+        self.gateway = gateway
         self.coordinator = coordinator
         self.device = device
+        self._resolve_state()
 
     @property
     def unique_id(self) -> str:
@@ -46,37 +60,51 @@ class MobilusSwitch(CoordinatorEntity[MobilusCoordinator], SwitchEntity):
         return str(self.device["name"])
 
     @property
-    def is_on(self) -> bool:
-        device_status = self.coordinator.data.devices.get(self.device["id"])
-
-        if not device_status:
-            return False
-
-        return device_status.is_on
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"stale": self.device["id"] in self.coordinator.watchdog.stale}
 
     async def async_turn_on(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Turning ON switch %s", self.device["name"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": "ON"})],
-        )
+        await self._async_call_event("ON")
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
 
     async def async_turn_off(self, **_kwargs: Any) -> None: # noqa: ANN401
         _LOGGER.info("Turning OFF switch %s", self.device["name"])
 
-        await self.hass.async_add_executor_job(
-            self.client.call,
-            [("call_events", {"device_id": self.device["id"], "value": "OFF"})],
-        )
+        await self._async_call_event("OFF")
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_device_refresh([self.device["id"]])
+
+    async def _async_call_event(self, value: str) -> None:
+        priority = command_priority(self._context)
+
+        with correlate("command"), span("command", device_id=self.device["id"], value=value):
+            await self.gateway.async_call(
+                [("call_events", {"device_id": self.device["id"], "value": value})],
+                MobilusCallKind.COMMAND,
+                priority,
+            )
+
+        self.coordinator.verifier.async_track(self.device, value, priority)
+        self.coordinator.watchdog.async_track(self.device["id"], value)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._resolve_state()
+        self.async_write_ha_state()
+
+    def _resolve_state(self) -> None:
+        # State is resolved once per snapshot, instead of on every state property read
+        device_status = self.coordinator.data.devices.get(self.device["id"])
+        self._attr_is_on = bool(device_status and device_status.is_on)
 
     async def async_added_to_hass(self) -> None:
         # Add a listener to the coordinator to update the entity's state on data changes
-        coordinator_listener = self.coordinator.async_add_listener(self.async_write_ha_state)
+        coordinator_listener = self.coordinator.async_add_device_listener(
+            self._handle_coordinator_update, [self.device["id"]],
+        )
 
         # Register the listener for cleanup when the entity is removed from Home Assistant
         self.async_on_remove(coordinator_listener)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+
+class MobilusWriteThrottle:
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._last_write = -math.inf
+        self._pending_write: Callable[[], None] | None = None
+        self._unsub_write: Callable[[], None] | None = None
+
+    @callback
+    def async_write(self, write: Callable[[], None], *, moving: bool, interval: float) -> None:
+        now = time.monotonic()
+
+        # Settled state is written at once, positions reported during motion at most once per interval
+        if not moving or now - self._last_write >= interval:
+            self.async_cancel()
+            self._write(write, now)
+            return
+
+        # Latest position is written once the interval has passed, unless the device settles first
+        self._pending_write = write
+
+        if self._unsub_write is None:
+            self._unsub_write = async_call_later(
+                self.hass, self._last_write + interval - now, HassJob(self._async_write_later, cancel_on_shutdown=True),
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        self._pending_write = None
+
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
+
+    @callback
+    def _async_write_later(self, _now: datetime) -> None:
+        write = self._pending_write
+        self._unsub_write = None
+        self._pending_write = None
+
+        if write is not None:
+            self._write(write, time.monotonic())
+
+    def _write(self, write: Callable[[], None], now: float) -> None:
+        self._last_write = now
+        write()
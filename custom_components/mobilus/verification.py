@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, EVENT_COMMAND_FAILED, VERIFICATION_TIMEOUT
+from .gateway import MobilusCallKind, MobilusGatewayError
+from .pacing import is_acknowledged
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MobilusCoordinator
+    from .device_state import MobilusDeviceStateList
+    from .gateway import MobilusGateway
+    from .scheduler import MobilusCallPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class MobilusPendingCommand:
+    device: dict[str, Any]
+    value: str
+    priority: MobilusCallPriority
+    start: float
+    tilt: bool = False
+    resent: bool = False
+    cancel: Callable[[], None] | None = None
+
+@dataclass
+class MobilusVerificationStats:
+    sent: int = 0
+    confirmed: int = 0
+    resent: int = 0
+    failed: int = 0
+    total_confirm_time: float = 0.0
+
+    @property
+    def success_rate(self) -> float | None:
+        if not self.confirmed + self.failed:
+            return None
+
+        return self.confirmed / (self.confirmed + self.failed)
+
+    @property
+    def average_confirm_time(self) -> float | None:
+        if not self.confirmed:
+            return None
+
+        return self.total_confirm_time / self.confirmed
+
+class MobilusCommandVerifier:
+    def __init__(self, hass: HomeAssistant, gateway: MobilusGateway, coordinator: MobilusCoordinator) -> None:
+        self.hass = hass
+        self.gateway = gateway
+        self.coordinator = coordinator
+        self.pending: dict[str, MobilusPendingCommand] = {}
+        self.stats: dict[str, MobilusVerificationStats] = {}
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_track(
+            self, device: dict[str, Any], value: str, priority: MobilusCallPriority, *, tilt: bool = False) -> None:
+        # Only the latest command of a device is verified, it supersedes any earlier one
+        self._async_discard(device["id"])
+
+        # Command kept for replay is verified only once the gateway is reachable again
+        if device["id"] in self.gateway.journal:
+            return
+
+        command = MobilusPendingCommand(device, value, priority, time.monotonic(), tilt)
+        self.pending[device["id"]] = command
+        self._stats(device["id"]).sent += 1
+        self._async_schedule_timeout(command)
+
+    @callback
+    def async_check(self, data: MobilusDeviceStateList) -> None:
+        for device_id, command in list(self.pending.items()):
+            if is_acknowledged(command.value, data.devices.get(device_id), tilt=command.tilt):
+                self._async_confirm(command)
+
+    @callback
+    def async_cancel(self) -> None:
+        for device_id in list(self.pending):
+            self._async_discard(device_id)
+
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            device_id: {
+                **asdict(stats),
+                "success_rate": stats.success_rate,
+                "average_confirm_time": stats.average_confirm_time,
+            }
+            for device_id, stats in self.stats.items()
+        }
+
+    @callback
+    def _async_confirm(self, command: MobilusPendingCommand) -> None:
+        device_id = command.device["id"]
+        stats = self._stats(device_id)
+        stats.confirmed += 1
+        stats.total_confirm_time += time.monotonic() - command.start
+
+        self._async_discard(device_id)
+        ir.async_delete_issue(self.hass, DOMAIN, f"command_failed_{device_id}")
+
+    @callback
+    def _async_discard(self, device_id: str) -> None:
+        command = self.pending.pop(device_id, None)
+
+        if command is not None and command.cancel is not None:
+            command.cancel()
+
+    @callback
+    def _async_schedule_timeout(self, command: MobilusPendingCommand) -> None:
+        async def async_timeout(_now: datetime) -> None:
+            await self._async_timeout(command)
+
+        command.cancel = async_call_later(
+            self.hass, VERIFICATION_TIMEOUT, HassJob(async_timeout, cancel_on_shutdown=True),
+        )
+
+    async def _async_timeout(self, command: MobilusPendingCommand) -> None:
+        device_id = command.device["id"]
+        command.cancel = None
+
+        # Devices that did not start moving are not followed with the active refresh interval,
+        # so current state is fetched once more before the command is considered lost
+        await self._async_refresh()
+
+        if self.pending.get(device_id) is not command:
+            return
+
+        if not command.resent:
+            _LOGGER.info("Command %s for %s was not confirmed, resending", command.value, command.device["name"])
+            command.resent = True
+            self._stats(device_id).resent += 1
+            self._async_schedule_timeout(command)
+
+            try:
+                await self.gateway.async_call(
+                    [("call_events", {"device_id": device_id, "value": command.value})],
+                    MobilusCallKind.COMMAND,
+                    command.priority,
+                    tilt_devices=[device_id] if command.tilt else (),
+                )
+            except MobilusGatewayError as exception:
+                _LOGGER.warning("Failed to resend command to %s: %s", command.device["name"], exception)
+
+            if device_id in self.gateway.journal:
+                self._async_discard(device_id)
+
+            return
+
+        _LOGGER.warning("Command %s for %s was not confirmed", command.value, command.device["name"])
+        self._stats(device_id).failed += 1
+        self._async_discard(device_id)
+
+        self.hass.bus.async_fire(
+            EVENT_COMMAND_FAILED,
+            {"device_id": device_id, "name": command.device["name"], "value": command.value},
+        )
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            f"command_failed_{device_id}",
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="command_failed",
+            translation_placeholders={"name": command.device["name"], "value": command.value},
+        )
+
+    async def _async_refresh(self) -> None:
+        # Commands of a group or a scene time out together and share a single refresh
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_task(
+                self.coordinator.async_refresh(), "mobilus_verification_refresh",
+            )
+
+        await asyncio.shield(self._refresh_task)
+
+    def _stats(self, device_id: str) -> MobilusVerificationStats:
+        return self.stats.setdefault(device_id, MobilusVerificationStats())
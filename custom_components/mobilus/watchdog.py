@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import WATCHDOG_STALE_POLLS
+from .pacing import is_acknowledged
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable, Coroutine
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MobilusCoordinator
+    from .device_state import MobilusDeviceStateList
+    from .gateway import MobilusGateway
+
+_LOGGER = logging.getLogger(__name__)
+
+# Recovery steps, taken one by one for as long as commanded devices do not change
+RECOVERY_STEPS = ("reconnect", "resync")
+
+
+@dataclass
+class MobilusWatchedDevice:
+    event_number: int | None
+    value: str | None
+    polls: int = 0
+
+class MobilusStateWatchdog:
+    def __init__(self, hass: HomeAssistant, gateway: MobilusGateway, coordinator: MobilusCoordinator) -> None:
+        self.hass = hass
+        self.gateway = gateway
+        self.coordinator = coordinator
+        self.watched: dict[str, MobilusWatchedDevice] = {}
+        self.stale: dict[str, float] = {}
+        self.recovery_step = 0
+        self.resync_devices: Callable[[], Coroutine[Any, Any, None]] | None = None
+        self._polls_since_recovery = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_track(self, device_id: str, value: str, *, tilt: bool = False) -> None:
+        # Command kept for replay did not reach the gateway yet
+        if device_id in self.gateway.journal or device_id in self.watched:
+            return
+
+        data = self.coordinator.data
+        device_state = data.devices.get(device_id) if data is not None else None
+
+        # Command for the state the device is already in is not expected to change anything
+        if is_acknowledged(value, device_state, tilt=tilt):
+            return
+
+        self.watched[device_id] = MobilusWatchedDevice(
+            device_state.event_number if device_state is not None else None,
+            device_state.value if device_state is not None else None,
+        )
+
+    @callback
+    def async_check(self, data: MobilusDeviceStateList) -> None:
+        for device_id, watched in list(self.watched.items()):
+            device_state = data.devices.get(device_id)
+
+            # Any reported change shows the gateway still follows the device
+            if device_state is not None and (device_state.event_number, device_state.value) != (
+                watched.event_number, watched.value,
+            ):
+                del self.watched[device_id]
+                self.stale.pop(device_id, None)
+                continue
+
+            watched.polls += 1
+
+            if watched.polls >= WATCHDOG_STALE_POLLS and device_id not in self.stale:
+                _LOGGER.warning("State of %s did not change after a command, marking it stale", device_id)
+                self.stale[device_id] = dt_util.utcnow().timestamp()
+
+        if not self.stale:
+            self.recovery_step = 0
+            self._polls_since_recovery = 0
+            return
+
+        self._polls_since_recovery += 1
+
+        if self._polls_since_recovery >= WATCHDOG_STALE_POLLS or not self.recovery_step:
+            self._async_recover()
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stale": self.stale,
+            "watched": {device_id: watched.polls for device_id, watched in self.watched.items()},
+            "recovery_step": self.recovery_step,
+        }
+
+    @callback
+    def _async_recover(self) -> None:
+        if self._task is not None:
+            return
+
+        if self.recovery_step >= len(RECOVERY_STEPS):
+            if self._polls_since_recovery == WATCHDOG_STALE_POLLS:
+                _LOGGER.warning("Gateway state is still stale after recovery, the gateway may need a restart")
+
+            return
+
+        step = RECOVERY_STEPS[self.recovery_step]
+        self.recovery_step += 1
+        self._polls_since_recovery = 0
+
+        self._task = self.hass.async_create_background_task(self._async_run(step), "mobilus_watchdog_recovery")
+
+    async def _async_run(self, step: str) -> None:
+        _LOGGER.info("Recovering stale gateway state with %s", step)
+
+        try:
+            if step == "resync":
+                if self.resync_devices is not None:
+                    await self.resync_devices()
+            else:
+                await self.gateway.async_reconnect()
+
+            # Recovered state is fetched right away instead of waiting for the next poll
+            await self.coordinator.async_request_refresh()
+        finally:
+            self._task = None
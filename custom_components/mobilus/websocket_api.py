@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MobilusCoordinator
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_snapshot)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "mobilus/snapshot",
+    vol.Required("entry_id"): str,
+})
+@callback
+def websocket_snapshot(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    coordinator = _async_get_coordinator(hass, connection, msg)
+
+    if coordinator is None:
+        return
+
+    connection.send_result(msg["id"], {"devices": list(async_snapshot(coordinator).values())})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "mobilus/subscribe",
+    vol.Required("entry_id"): str,
+})
+@callback
+def websocket_subscribe(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    coordinator = _async_get_coordinator(hass, connection, msg)
+
+    if coordinator is None:
+        return
+
+    sent = async_snapshot(coordinator)
+
+    @callback
+    def async_send_changes() -> None:
+        # Only devices whose state changed since the previous message are sent
+        changes = [
+            device for device_id, device in async_snapshot(coordinator).items()
+            if sent.get(device_id) != device
+        ]
+
+        if not changes:
+            return
+
+        for device in changes:
+            sent[device["id"]] = device
+
+        connection.send_message(websocket_api.event_message(msg["id"], {"devices": changes}))
+
+    # Also notified when only some devices are refreshed after a command
+    connection.subscriptions[msg["id"]] = coordinator.async_add_device_listener(async_send_changes, list(sent))
+    connection.send_result(msg["id"])
+
+    # Full state first, so the subscriber does not need a separate snapshot call
+    connection.send_message(websocket_api.event_message(msg["id"], {"devices": list(sent.values())}))
+
+@callback
+def async_snapshot(coordinator: MobilusCoordinator) -> dict[str, dict[str, Any]]:
+    if coordinator.data is None:
+        return {}
+
+    snapshot = {}
+
+    for device_id, device_state in coordinator.data.devices.items():
+        history = coordinator.history.devices.get(device_id)
+
+        snapshot[device_id] = {
+            "id": device_id,
+            "type": coordinator.device_types.get(device_id),
+            "position": device_state.cover_position,
+            "tilt": device_state.tilt_position,
+            "moving": device_state.is_moving,
+            "last_changed": history.last_changed() if history is not None else None,
+        }
+
+    return snapshot
+
+@callback
+def _async_get_coordinator(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any]) -> MobilusCoordinator | None:
+    entry_data = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+
+    if entry_data is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded")
+        return None
+
+    return entry_data["coordinator"]
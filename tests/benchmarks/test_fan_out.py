@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from tests.fake_gateway import FakeGateway, make_devices
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+pytestmark = pytest.mark.benchmark
+
+ENTITIES = 1000
+ROUNDS = 10
+
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_coordinator_fan_out_time(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    fake_gateway = FakeGateway(make_devices(ENTITIES))
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+    durations = []
+
+    for index in range(ROUNDS):
+        # Every round changes the state of every device, so each entity writes a new state
+        value = "DOWN" if index % 2 else "UP"
+        data = MobilusDeviceStateList({
+            device["id"]: MobilusDeviceState(device_id=device["id"], event_number=8, value=value)
+            for device in fake_gateway.devices
+        })
+
+        start = time.perf_counter()
+        coordinator.async_set_updated_data(data)
+        durations.append(time.perf_counter() - start)
+
+    per_thousand = min(durations) * 1000 / ENTITIES * 1000
+    sys.stdout.write(f"\nCoordinator fan-out: {per_thousand:.1f} ms per 1000 entities\n")
+
+    assert hass.states.get("cover.device_0").state == "closed"
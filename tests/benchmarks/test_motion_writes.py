@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.device import MobilusDevice
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from tests.fake_gateway import FakeGateway
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+pytestmark = pytest.mark.benchmark
+
+COVERS = 40
+UPDATES = 50
+
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_motion_state_writes(hass: HomeAssistant, enable_custom_integrations: None) -> None: # noqa: ARG001
+    fake_gateway = FakeGateway([
+        {"id": str(index), "name": f"Device {index}", "type": int(MobilusDevice.SENSO)}
+        for index in range(COVERS)
+    ])
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        data={"host": "test_host", "username": "test_user", "password": "test_pass"},
+        options={"motion_write_interval": 5.0},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    # Scene moving all covers, every update reports a new intermediate position
+    for index in range(UPDATES):
+        coordinator.async_set_updated_data(MobilusDeviceStateList({
+            device["id"]: MobilusDeviceState(device_id=device["id"], event_number=7, value=f"{index + 1}%")
+            for device in fake_gateway.devices
+        }))
+
+    moving_writes = len(state_changes)
+
+    coordinator.async_set_updated_data(MobilusDeviceStateList({
+        device["id"]: MobilusDeviceState(device_id=device["id"], event_number=8, value="DOWN")
+        for device in fake_gateway.devices
+    }))
+
+    sys.stdout.write(f"\nState writes while {COVERS} covers move: {moving_writes} for {UPDATES} updates\n")
+
+    # One write per cover until the interval passes, and the settled state of each cover right after
+    assert moving_writes <= COVERS
+    assert len(state_changes) == moving_writes + COVERS
+    assert hass.states.get("cover.device_0").state == "closed"
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mobilus.gateway import MobilusCallKind, MobilusGateway
+from custom_components.mobilus.options import MobilusOptions
+from tests.fake_gateway import FakeGateway, make_devices
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+pytestmark = pytest.mark.benchmark
+
+COMMANDS = 300
+COMMAND_LATENCY = 0.01
+POLLS = 300
+LATENCY = 0.2
+
+
+def _gateway(hass: HomeAssistant) -> MobilusGateway:
+    return MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        # Batch window is disabled, so concurrent commands are not collected before reaching the gateway
+        options=MobilusOptions(batch_window=0),
+    )
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_concurrent_polls(hass: HomeAssistant) -> None:
+    fake_gateway = FakeGateway(make_devices(10), latency=LATENCY)
+    gateway = _gateway(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            gateway.async_call([("current_state", {})], MobilusCallKind.POLL) for _poll in range(POLLS)
+        ))
+        duration = time.perf_counter() - start
+
+    sys.stdout.write(
+        f"\n{POLLS} concurrent state queries: {duration * 1000:.1f} ms in {fake_gateway.sessions} gateway sessions\n",
+    )
+
+    # State queries waiting for a slot are answered by a single shared query
+    assert all(len(response[0]["events"]) == 10 for response in responses)
+    assert fake_gateway.sessions < 5
+    assert duration < POLLS * LATENCY / 10
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_concurrent_commands(hass: HomeAssistant) -> None:
+    fake_gateway = FakeGateway(make_devices(COMMANDS), latency=COMMAND_LATENCY)
+    gateway = _gateway(hass)
+    slots = MobilusOptions().max_concurrent_requests
+
+    async def command(device_id: str) -> tuple[list[dict[str, Any]], float]:
+        response = await gateway.async_call(
+            [("call_events", {"device_id": device_id, "value": "DOWN"})], MobilusCallKind.COMMAND,
+        )
+
+        return response, time.perf_counter() - start
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(command(device["id"]) for device in fake_gateway.devices))
+
+    durations = [duration for _response, duration in results]
+    sys.stdout.write(
+        f"\n{COMMANDS} concurrent commands: {max(durations) * 1000:.1f} ms in {fake_gateway.sessions} "
+        f"gateway sessions, at most {fake_gateway.max_running} at once\n",
+    )
+
+    # Commands are not merged, every caller gets the echo of its own command in a session of its own
+    assert [response[0]["events"][0]["deviceId"] for response, _duration in results] == [
+        device["id"] for device in fake_gateway.devices
+    ]
+    assert fake_gateway.sessions == COMMANDS
+    assert fake_gateway.max_running <= slots
+
+    # Slots are kept busy, so the last caller waits about as long as the sessions take one after another
+    assert max(durations) < 2 * COMMANDS * COMMAND_LATENCY / slots
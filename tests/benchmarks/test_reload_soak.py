@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+
+from tests.fake_gateway import FakeGateway, make_devices
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+pytestmark = pytest.mark.benchmark
+
+WARM_UP_RELOADS = 20
+RELOADS = 200
+
+# Allowed growth over all reloads, far below what a single leaked entry per reload would add
+MEMORY_GROWTH_LIMIT = 2 * 1024 * 1024
+
+
+def _open_sockets() -> int:
+    fd_path = Path(f"/proc/{os.getpid()}/fd")
+
+    if not fd_path.exists():
+        return 0
+
+    sockets = 0
+
+    for fd in fd_path.iterdir():
+        try:
+            sockets += fd.readlink().name.startswith("socket:")
+        except OSError:
+            continue
+
+    return sockets
+
+async def _reload(hass: HomeAssistant, entry: MockConfigEntry, count: int) -> None:
+    for _reload_index in range(count):
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+def _resources() -> tuple[int, int, int, int]:
+    gc.collect()
+
+    return (
+        _open_sockets(),
+        threading.active_count(),
+        len(asyncio.all_tasks()),
+        tracemalloc.get_traced_memory()[0],
+    )
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_reload_soak(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    fake_gateway = FakeGateway(make_devices(20), latency=0.001)
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        # Executor threads, caches and registries settle during the first reloads
+        await _reload(hass, mock_config_entry, WARM_UP_RELOADS)
+
+        tracemalloc.start()
+
+        try:
+            sockets, threads, tasks, memory = _resources()
+            await _reload(hass, mock_config_entry, RELOADS)
+            sockets_after, threads_after, tasks_after, memory_after = _resources()
+        finally:
+            tracemalloc.stop()
+
+    sys.stdout.write(
+        f"\n{RELOADS} reloads: sockets {sockets} -> {sockets_after}, threads {threads} -> {threads_after}, "
+        f"tasks {tasks} -> {tasks_after}, memory growth {(memory_after - memory) / 1024:.1f} KiB\n",
+    )
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert sockets_after <= sockets
+    assert threads_after <= threads
+    assert tasks_after <= tasks
+    assert memory_after - memory < MEMORY_GROWTH_LIMIT
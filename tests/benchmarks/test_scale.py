@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_capture_events
+
+from custom_components.mobilus.const import DOMAIN
+from tests.fake_gateway import FakeGateway, make_devices
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from concurrent.futures import ThreadPoolExecutor
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mobilus.coordinator import MobilusCoordinator
+
+pytestmark = pytest.mark.benchmark
+
+LATENCY = 0.05
+POLL_ROUNDS = 5
+COMMANDS_PER_GATEWAY = 50
+
+# Event loop is sampled this often, any extra delay of the sampling sleep is loop lag
+LAG_SAMPLE_INTERVAL = 0.01
+
+
+@dataclass
+class LoopMonitor:
+    lags: list[float] = field(default_factory=list)
+    queue_depths: list[int] = field(default_factory=list)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            self.lags.append(loop.time() - start - LAG_SAMPLE_INTERVAL)
+
+            # Jobs waiting for a free executor thread, gateway calls block a thread for the whole session
+            executor: ThreadPoolExecutor | None = loop._default_executor # type: ignore[attr-defined] # noqa: SLF001
+            self.queue_depths.append(executor._work_queue.qsize() if executor is not None else 0) # noqa: SLF001
+
+    def summary(self) -> str:
+        if len(self.lags) < 2:
+            return "loop lag n/a"
+
+        p99 = statistics.quantiles(self.lags, n=100)[98]
+
+        return (
+            f"loop lag p99 {p99 * 1000:.1f} ms, max {max(self.lags) * 1000:.1f} ms, "
+            f"executor queue max {max(self.queue_depths)}"
+        )
+
+@contextlib.asynccontextmanager
+async def _monitor() -> AsyncGenerator[LoopMonitor, None]:
+    monitor = LoopMonitor()
+    task = asyncio.create_task(monitor.run())
+
+    try:
+        yield monitor
+    finally:
+        task.cancel()
+
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+async def _timed_refresh(coordinator: MobilusCoordinator) -> float:
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+
+    return time.perf_counter() - start
+
+@pytest.mark.parametrize(
+    ("gateways", "devices"),
+    [(1, 1000), (4, 1000), (8, 1000)],
+    ids=["1x1000", "4x1000", "8x1000"],
+)
+@pytest.mark.usefixtures("mock_session_client")
+async def test_scale(
+        hass: HomeAssistant, gateways: int, devices: int, enable_custom_integrations: None) -> None: # noqa: ARG001
+    # Device ids are unique across gateways, so entities of all entries can coexist
+    fake_gateways = {
+        f"gateway_{index}": FakeGateway(make_devices(devices, offset=index * devices), latency=LATENCY)
+        for index in range(gateways)
+    }
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            data={"host": host, "username": "test_user", "password": "test_pass"},
+        )
+        for host in fake_gateways
+    ]
+    report = [f"\nScale {gateways} gateways x {devices} devices ({gateways * devices} devices, latency {LATENCY}s)"]
+
+    with patch(
+        "mobilus_client.app.App", side_effect=lambda config: fake_gateways[config.gateway_host].app(config),
+    ):
+        tracemalloc.start()
+
+        try:
+            start = time.perf_counter()
+
+            for entry in entries:
+                entry.add_to_hass(hass)
+                assert await hass.config_entries.async_setup(entry.entry_id)
+
+            await hass.async_block_till_done()
+            setup_duration = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        report.append(
+            f"  setup {setup_duration:.2f} s (traced), memory {memory / 1024 / 1024:.1f} MiB, "
+            f"{memory / (gateways * devices) / 1024:.1f} KiB per device",
+        )
+
+        coordinators = [hass.data[DOMAIN][entry.entry_id]["coordinator"] for entry in entries]
+        state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+        # Poll workload, every round changes the state of every device, so each entity writes a new state
+        async with _monitor() as monitor:
+            poll_durations = []
+            start = time.perf_counter()
+
+            for index in range(POLL_ROUNDS):
+                for fake_gateway in fake_gateways.values():
+                    for state in fake_gateway.states.values():
+                        state.update(eventNumber=8, value="DOWN" if index % 2 else "UP")
+
+                poll_durations += await asyncio.gather(*map(_timed_refresh, coordinators))
+
+            duration = time.perf_counter() - start
+
+        report.append(
+            f"  polls: wall time mean {statistics.mean(poll_durations) * 1000:.0f} ms, "
+            f"max {max(poll_durations) * 1000:.0f} ms, {len(state_changes) / duration:.0f} state writes/s, "
+            f"{monitor.summary()}",
+        )
+
+        # Command workload, covers spread over all gateways are commanded at once
+        all_cover_ids = sorted(hass.states.async_entity_ids("cover"))
+        cover_ids = all_cover_ids[::len(all_cover_ids) // (COMMANDS_PER_GATEWAY * gateways)]
+        state_changes.clear()
+        sessions = sum(fake_gateway.sessions for fake_gateway in fake_gateways.values())
+
+        async with _monitor() as monitor:
+            start = time.perf_counter()
+            await hass.services.async_call("cover", "close_cover", {"entity_id": cover_ids}, blocking=True)
+            await hass.async_block_till_done()
+            duration = time.perf_counter() - start
+
+        sessions = sum(fake_gateway.sessions for fake_gateway in fake_gateways.values()) - sessions
+        report.append(
+            f"  {len(cover_ids)} commands: {duration * 1000:.0f} ms in {sessions} gateway sessions, "
+            f"{len(state_changes) / duration:.0f} state writes/s, {monitor.summary()}",
+        )
+
+        for entry in entries:
+            assert entry.state is ConfigEntryState.LOADED
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+        await hass.async_block_till_done()
+
+    sys.stdout.write("\n".join(report) + "\n")
+
+    assert len(poll_durations) == POLL_ROUNDS * gateways
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+
+from tests.fake_gateway import FakeGateway, make_devices
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+pytestmark = pytest.mark.benchmark
+
+def test_integration_import_time() -> None:
+    script = (
+        "import sys, time;"
+        "start = time.perf_counter();"
+        "import custom_components.mobilus;"
+        "print(time.perf_counter() - start, 'mobilus_client' in sys.modules)"
+    )
+
+    result = subprocess.run( # noqa: S603
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parents[2],
+        text=True,
+    )
+    duration, client_imported = result.stdout.split()
+
+    sys.stdout.write(f"\nIntegration import time: {float(duration) * 1000:.1f} ms\n")
+    assert client_imported == "False"
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_async_setup_entry_time(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    fake_gateway = FakeGateway(make_devices(100))
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        duration = time.perf_counter() - start
+
+    sys.stdout.write(f"\nSetup time for 100 devices: {duration * 1000:.1f} ms\n")
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+
+@pytest.mark.usefixtures("mock_session_client")
+async def test_async_setup_entry_time_slow_gateway(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    # Each gateway session costs a connection and login, setup opens a single one
+    fake_gateway = FakeGateway(make_devices(100), latency=0.5)
+    mock_config_entry.add_to_hass(hass)
+
+    with patch("mobilus_client.app.App", side_effect=fake_gateway.app):
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        duration = time.perf_counter() - start
+
+    sys.stdout.write(f"\nSetup time for 100 devices with 500 ms gateway sessions: {duration * 1000:.1f} ms\n")
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert fake_gateway.sessions == 1
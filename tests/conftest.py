@@ -2,17 +2,44 @@ from collections.abc import Generator
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.gateway import MobilusGateway
+from custom_components.mobilus.options import MobilusOptions
 
 
 @pytest.fixture
-def mock_client() -> Generator[Mock, None, None]:
-    with patch("custom_components.mobilus.MobilusClientApp", autospec=True) as mock_client_class:
+def mock_client(mock_session_client: Mock) -> Generator[Mock, None, None]: # noqa: ARG001
+    with patch("mobilus_client.app.App", autospec=True) as mock_client_class:
         mock_instance = mock_client_class.return_value
         yield mock_instance
 
+@pytest.fixture
+def mock_session_client() -> Generator[Mock, None, None]:
+    # Kept open session never authenticates, so calls go through the client app
+    with patch("mobilus_client.client.Client", autospec=True) as mock_session_client_class:
+        mock_instance = mock_session_client_class.return_value
+        mock_instance.connect_and_authenticate.return_value = False
+        yield mock_instance
+
+@pytest.fixture
+def gateway(hass: HomeAssistant, mock_client: Mock) -> MobilusGateway: # noqa: ARG001
+    return MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(),
+    )
+
+@pytest.fixture
+def mock_gateway() -> Mock:
+    mock_instance = Mock(spec=MobilusGateway)
+    mock_instance.async_call = AsyncMock(return_value=[])
+    return mock_instance
+
 @pytest.fixture
 def mock_coordinator() -> Generator[Mock, None, None]:
     with patch("custom_components.mobilus.MobilusCoordinator") as mock_coordinator_class:
@@ -20,16 +47,18 @@ def mock_coordinator() -> Generator[Mock, None, None]:
         mock_instance.async_config_entry_first_refresh = AsyncMock()
         mock_instance.async_request_refresh = AsyncMock()
         mock_instance.async_add_listener = Mock()
+        mock_instance.async_request_device_refresh = AsyncMock()
+        mock_instance.async_add_device_listener = Mock()
         yield mock_instance
 
 @pytest.fixture
 def mock_config_entry() -> MockConfigEntry:
     return MockConfigEntry(
         domain=DOMAIN,
+        version=3,
         data = {
             "host": "test_host",
             "username": "test_user",
             "password": "test_pass",
-            "refresh_interval": 600,
         },
     )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any
+
+from custom_components.mobilus.device import MobilusDevice
+
+
+def make_devices(count: int, offset: int = 0) -> list[dict[str, Any]]:
+    device_types = list(MobilusDevice)
+
+    return [
+        {
+            "id": str(offset + index),
+            "name": f"Device {offset + index}",
+            "type": int(device_types[index % len(device_types)]),
+        }
+        for index in range(count)
+    ]
+
+class FakeGateway:
+    def __init__(self, devices: list[dict[str, Any]], latency: float = 0.0) -> None:
+        self.devices = devices
+        self.latency = latency
+        self.sessions = 0
+        self.running = 0
+        self.max_running = 0
+        self.states = {
+            device["id"]: {"deviceId": device["id"], "eventNumber": 8, "value": "UP"}
+            for device in devices
+        }
+        self._lock = threading.Lock()
+
+    def app(self, _config: object) -> FakeGateway:
+        # Used as a drop-in replacement for the mobilus_client App class
+        return self
+
+    def call(self, commands: list[tuple[str, dict[str, str]]]) -> str:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        time.sleep(self.latency)
+
+        with self._lock:
+            self.running -= 1
+            self.sessions += 1
+
+            return json.dumps([self._respond(command, params) for command, params in commands])
+
+    def _respond(self, command: str, params: dict[str, str]) -> dict[str, Any]:
+        if command == "devices_list":
+            return {"devices": self.devices}
+
+        if command == "current_state":
+            return {"events": list(self.states.values())}
+
+        event = {"deviceId": params["device_id"], "eventNumber": 6, "value": params["value"]}
+        self.states[params["device_id"]] = {**event, "eventNumber": 7}
+
+        return {"events": [event]}
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.mobilus.const import DOMAIN, VALIDATION_PROBE_TIMEOUT
+from custom_components.mobilus.discovery import MobilusDiscoveredGateway
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+USER_INPUT = {
+    "host": "new_host",
+    "username": "new_user",
+    "password": "new_pass",
+}
+
+OPTIONS_INPUT = {
+    "refresh_interval": 60,
+    "active_refresh_interval": 5,
+    "settle_delay": 10.0,
+    "batch_window": 0.5,
+    "max_concurrent_requests": 3,
+    "command_timeout": 10.0,
+    "poll_timeout": 20.0,
+    "devices_list_timeout": 30.0,
+    "priority_device_types": ["CGR", "SENSO"],
+    "command_journal_ttl": 300.0,
+    "motion_write_interval": 2.0,
+}
+
+@pytest.fixture(autouse=True)
+def mock_discovery() -> Generator[AsyncMock, None, None]:
+    with patch(
+        "custom_components.mobilus.config_flow.async_discover_gateways",
+        return_value=[MobilusDiscoveredGateway("192.168.1.10", 0.002)],
+    ) as mock_discover:
+        yield mock_discover
+
+@pytest.fixture(autouse=True)
+def mock_probe() -> Generator[AsyncMock, None, None]:
+    with patch(
+        "custom_components.mobilus.config_flow.async_probe",
+        return_value=MobilusDiscoveredGateway("new_host", 0.002),
+    ) as mock_probe:
+        yield mock_probe
+
+@pytest.fixture(autouse=True)
+def mock_devices_list(mock_client: Mock) -> Mock:
+    mock_client.call.return_value = json.dumps([{"devices": [{"id": "0", "name": "Device", "type": 1}]}])
+    return mock_client
+
+async def test_user_step(
+        hass: HomeAssistant, mock_discovery: AsyncMock, mock_probe: AsyncMock,
+        enable_custom_integrations: None) -> None: # noqa: ARG001
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["description_placeholders"] == {"discovered": "1"}
+    assert result["data_schema"]({"username": "user", "password": "pass"})["host"] == "192.168.1.10"
+
+    with patch("custom_components.mobilus.async_setup_entry", new=AsyncMock(return_value=True)):
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "new_host"
+    assert result["data"] == USER_INPUT
+    assert result["description_placeholders"]["latency"] == "2"
+    assert result["description_placeholders"]["devices"] == "1"
+    mock_discovery.assert_called_once()
+    mock_probe.assert_called_once_with("new_host", probe_timeout=VALIDATION_PROBE_TIMEOUT)
+
+@pytest.mark.parametrize(
+    ("probe", "side_effect", "response", "error"),
+    [
+        (None, None, "[]", "cannot_connect"),
+        (MobilusDiscoveredGateway("new_host", 0.002), ConnectionRefusedError("refused"), "[]", "cannot_connect"),
+        (MobilusDiscoveredGateway("new_host", 0.002), None, "[]", "invalid_auth"),
+    ],
+)
+async def test_user_step_invalid(
+        hass: HomeAssistant, mock_probe: AsyncMock, mock_devices_list: Mock,
+        probe: MobilusDiscoveredGateway | None, side_effect: Exception | None, response: str, error: str,
+        enable_custom_integrations: None) -> None: # noqa: ARG001
+    mock_probe.return_value = probe
+    mock_devices_list.call.side_effect = side_effect
+    mock_devices_list.call.return_value = response
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": error}
+
+async def test_user_step_login_failed(
+        hass: HomeAssistant, mock_devices_list: Mock, enable_custom_integrations: None) -> None: # noqa: ARG001
+    # Client library returns an empty response once the login deadline has passed
+    mock_devices_list.call.return_value = "[]"
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER})
+
+    with patch("custom_components.mobilus.gateway.time", new=Mock(**{"monotonic.side_effect": [0, 60]})):
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+async def test_reconfigure_step_loaded_entry(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    mock_config_entry.add_to_hass(hass)
+    mock_config_entry.mock_state(hass, ConfigEntryState.LOADED)
+
+    result = await mock_config_entry.start_reconfigure_flow(hass)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "reconfigure"
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_schedule_reload:
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reconfigure_successful"
+    assert mock_config_entry.data == USER_INPUT
+    assert mock_schedule_reload.call_count == 0
+
+async def test_reconfigure_step_not_loaded_entry(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    mock_config_entry.add_to_hass(hass)
+
+    result = await mock_config_entry.start_reconfigure_flow(hass)
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_schedule_reload:
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reconfigure_successful"
+    assert mock_config_entry.data == USER_INPUT
+    mock_schedule_reload.assert_called_once_with(mock_config_entry.entry_id)
+
+async def test_options_flow(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(result["flow_id"], OPTIONS_INPUT)
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == OPTIONS_INPUT
+
+async def test_options_flow_invalid_active_refresh_interval(
+        hass: HomeAssistant, mock_config_entry: MockConfigEntry, enable_custom_integrations: None) -> None: # noqa: ARG001
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**OPTIONS_INPUT, "active_refresh_interval": 120},
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"active_refresh_interval": "active_refresh_interval_too_long"}
+    assert mock_config_entry.options == {}
@@ -1,45 +1,235 @@
 import datetime
 import json
-from collections.abc import Generator
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.mobilus.coordinator import MobilusCoordinator
-from custom_components.mobilus.device_state import MobilusDeviceStateList
+from custom_components.mobilus.device import MobilusDevice
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.gateway import MobilusGateway, MobilusGatewayTimeoutError
+from custom_components.mobilus.options import MobilusOptions
 
 
 @pytest.fixture
-def mock_client() -> Generator[Mock, None, None]:
-    with patch("mobilus_client.app.App", autospec=True) as mock_client_class:
-        mock_instance = mock_client_class.return_value
-        yield mock_instance
+def mock_options() -> MobilusOptions:
+    return MobilusOptions(refresh_interval=600, active_refresh_interval=5)
 
 @pytest.fixture
-def mock_refresh_interval() -> int:
-    return 600
+def mock_device_types() -> dict[str, int]:
+    return {
+        "device00": MobilusDevice.SENSO,
+        "device01": MobilusDevice.SWITCH,
+    }
 
-def test_coordinator_init(hass: HomeAssistant, mock_client: Mock, mock_refresh_interval: int) -> None:
-    coordinator = MobilusCoordinator(hass, mock_client, mock_refresh_interval)
+def test_coordinator_init(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
 
-    assert coordinator.client == mock_client
+    assert coordinator.gateway == gateway
+    assert coordinator.options == mock_options
+    assert coordinator.device_types == mock_device_types
     assert coordinator.name == "mobilus_coordinator"
-    assert coordinator.update_interval == datetime.timedelta(seconds=mock_refresh_interval)
+    assert coordinator.update_interval == datetime.timedelta(seconds=600)
+
+def test_coordinator_async_set_options(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+    unsub = coordinator.async_add_listener(Mock())
+
+    with patch.object(coordinator, "_schedule_refresh") as mock_schedule_refresh:
+        coordinator.async_set_options(MobilusOptions(refresh_interval=600, settle_delay=1))
+
+        assert mock_schedule_refresh.call_count == 0
+
+        coordinator.async_set_options(MobilusOptions(refresh_interval=60))
+
+        mock_schedule_refresh.assert_called_once()
+
+    assert coordinator.options == MobilusOptions(refresh_interval=60)
+    assert coordinator.update_interval == datetime.timedelta(seconds=60)
+    unsub()
+
+def test_coordinator_async_set_options_without_listeners(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    with patch.object(coordinator, "_schedule_refresh") as mock_schedule_refresh:
+        coordinator.async_set_options(MobilusOptions(refresh_interval=60))
+
+    assert mock_schedule_refresh.call_count == 0
+    assert coordinator.update_interval == datetime.timedelta(seconds=60)
+
+async def test_coordinator_async_schedule_phase_refresh(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    with patch.object(coordinator, "async_refresh") as mock_refresh:
+        coordinator.async_schedule_phase_refresh(30)
+
+        # Options applied before the phase refresh do not move it
+        coordinator.async_set_options(MobilusOptions(refresh_interval=300))
+
+        async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=31))
+        await hass.async_block_till_done()
+
+        mock_refresh.assert_called_once()
+
+    assert coordinator.update_interval == datetime.timedelta(seconds=300)
+
+async def test_coordinator_async_schedule_refresh(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    with patch.object(coordinator, "async_request_refresh") as mock_request_refresh:
+        coordinator.async_schedule_refresh(10)
+        coordinator.async_schedule_refresh(10)
+
+        async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=11))
+        await hass.async_block_till_done()
+
+        mock_request_refresh.assert_called_once()
+
+        # Refresh still pending on shutdown is cancelled
+        coordinator.async_schedule_refresh(10)
+        await coordinator.async_shutdown()
+
+        async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=22))
+        await hass.async_block_till_done()
+
+        mock_request_refresh.assert_called_once()
+
+async def test_coordinator_async_request_device_refresh(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_client: Mock, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    mock_client.call.return_value = json.dumps([{"events": [
+        {"deviceId": "device00", "value": "DOWN", "eventNumber": 8},
+        {"deviceId": "device01", "value": "OFF", "eventNumber": 8},
+    ]}])
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+    coordinator.async_seed([
+        {"deviceId": "device00", "value": "UP", "eventNumber": 8},
+        {"deviceId": "device01", "value": "ON", "eventNumber": 8},
+    ])
+    device_listener = Mock()
+    other_listener = Mock()
+    unsub_device = coordinator.async_add_device_listener(device_listener, ["device00"])
+    unsub_other = coordinator.async_add_device_listener(other_listener, ["device01"])
+
+    with patch.object(coordinator.supervisor, "async_poll", wraps=coordinator.supervisor.async_poll) as mock_poll:
+        await coordinator.async_request_device_refresh(["device00"])
+
+    # Full state query counts against the poll cap of all gateways
+    mock_poll.assert_called_once()
+
+    # Only the requested device is merged and its listeners notified
+    assert coordinator.data.devices["device00"].value == "DOWN"
+    assert coordinator.data.devices["device01"].value == "ON"
+    device_listener.assert_called_once()
+    other_listener.assert_not_called()
+
+    unsub_device()
+    unsub_other()
+    await coordinator.async_shutdown()
+
+    assert not coordinator._device_listeners # noqa: SLF001
+
+def test_coordinator_async_add_device_listener(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+    listener = Mock()
+    unsub = coordinator.async_add_device_listener(listener, ["device00", "device01"])
+
+    # Full snapshot notifies the listener once
+    coordinator.async_set_updated_data(MobilusDeviceStateList({}))
+
+    listener.assert_called_once()
+
+    unsub()
+
+    assert not coordinator._listeners # noqa: SLF001
+    assert not coordinator._device_listeners # noqa: SLF001
+
+def test_coordinator_async_seed(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    coordinator.async_seed([{"deviceId": "device00", "value": "50%", "eventNumber": 7}])
+
+    assert coordinator.last_update_success
+    assert coordinator.data == MobilusDeviceStateList(
+        {"device00": MobilusDeviceState(device_id="device00", event_number=7, value="50%")},
+    )
+    assert coordinator.update_interval == datetime.timedelta(seconds=5)
+
+def test_coordinator_async_update_listeners_records_history(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    for value in ("UP", "UP", "DOWN"):
+        coordinator.async_set_updated_data(
+            MobilusDeviceStateList({"device00": MobilusDeviceState(device_id="device00", event_number=8, value=value)}),
+        )
+
+    assert [sample[2] for sample in coordinator.history.as_dict()["device00"]] == [100, 0]
+
+@pytest.mark.parametrize(
+    ("events", "update_interval"),
+    [
+        ([{"deviceId": "device00", "value": "UP", "eventNumber": 7}], 5),
+        ([{"deviceId": "device00", "value": "UP", "eventNumber": 8}], 600),
+        ([{"deviceId": "device01", "value": "ON", "eventNumber": 7}], 600),
+        ([{"deviceId": "device02", "value": "UP", "eventNumber": 7}], 600),
+    ],
+)
+async def test_coordinator_async_update_data_refresh_interval(
+        hass: HomeAssistant, mock_client: Mock, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int], events: list[dict[str, Any]], update_interval: int) -> None:
+    mock_client.call.return_value = json.dumps([{"events": events}])
+
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+    await coordinator._async_update_data() # noqa: SLF001
+
+    assert coordinator.update_interval == datetime.timedelta(seconds=update_interval)
 
 async def test_coordinator_async_update_data_no_devices(
-        hass: HomeAssistant, mock_client: Mock, mock_refresh_interval: int) -> None:
+        hass: HomeAssistant, mock_client: Mock, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
     mock_client.call.return_value = json.dumps([])
 
-    coordinator = MobilusCoordinator(hass, mock_client, mock_refresh_interval)
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
 
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data() # noqa: SLF001
 
+async def test_coordinator_async_update_data_timeout(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
+
+    with (
+        patch.object(gateway, "async_call", side_effect=MobilusGatewayTimeoutError("timed out")),
+        pytest.raises(UpdateFailed, match="timed out"),
+    ):
+        await coordinator._async_update_data() # noqa: SLF001
+
 
 async def test_coordinator_async_update_data_success(
-        hass: HomeAssistant, mock_client: Mock, mock_refresh_interval: int) -> None:
+        hass: HomeAssistant, mock_client: Mock, gateway: MobilusGateway, mock_options: MobilusOptions,
+        mock_device_types: dict[str, int]) -> None:
     mock_client.call.return_value = json.dumps(
         [
             {
@@ -61,7 +251,7 @@ async def test_coordinator_async_update_data_success(
         ],
     )
 
-    coordinator = MobilusCoordinator(hass, mock_client, mock_refresh_interval)
+    coordinator = MobilusCoordinator(hass, gateway, mock_options, mock_device_types)
     data = await coordinator._async_update_data() # noqa: SLF001
 
     assert isinstance(data, MobilusDeviceStateList)
@@ -5,13 +5,16 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from homeassistant.components.cover import CoverDeviceClass, CoverEntityFeature
+from homeassistant.core import Context
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from custom_components.mobilus.const import DOMAIN
-from custom_components.mobilus.cover import MobilusCover, async_setup_entry
+from custom_components.mobilus.const import DOMAIN, SIGNAL_NEW_DEVICES
+from custom_components.mobilus.cover import MobilusCover, MobilusGroupCover, async_setup_entry
+from custom_components.mobilus.gateway import MobilusCallKind
+from custom_components.mobilus.history import MobilusDeviceHistory
+from custom_components.mobilus.scheduler import MobilusCallPriority
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
-
     from homeassistant.core import HomeAssistant
     from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -19,13 +22,8 @@ if TYPE_CHECKING:
 def mock_async_add_entities() -> Mock:
     return Mock()
 
-@pytest.fixture
-def mock_asyncio_sleep() -> Generator[Mock, None, None]:
-    with patch("asyncio.sleep", return_value=None) as mock_sleep:
-        yield mock_sleep
-
 async def test_async_setup_entry(
-        hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock,
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
         mock_config_entry: MockConfigEntry, mock_async_add_entities: Mock) -> None:
 
     device_cosmo = {
@@ -51,7 +49,7 @@ async def test_async_setup_entry(
 
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN][mock_config_entry.entry_id] = {
-        "client": mock_client,
+        "gateway": mock_gateway,
         "coordinator": mock_coordinator,
         "devices": [
             device_cosmo,
@@ -65,72 +63,96 @@ async def test_async_setup_entry(
 
     assert mock_async_add_entities.call_with(
       [
-          MobilusCover(device_senso, mock_client, mock_coordinator),
-          MobilusCover(device_cosmo, mock_client, mock_coordinator),
-          MobilusCover(device_cgr, mock_client, mock_coordinator),
+          MobilusCover(device_senso, mock_gateway, mock_coordinator),
+          MobilusCover(device_cosmo, mock_gateway, mock_coordinator),
+          MobilusCover(device_cgr, mock_gateway, mock_coordinator),
       ],
     )
 
-def test_cover_init(mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_async_setup_entry_new_devices(
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry, mock_async_add_entities: Mock) -> None:
+    hass.data[DOMAIN] = {}
+    hass.data[DOMAIN][mock_config_entry.entry_id] = {
+        "gateway": mock_gateway,
+        "coordinator": mock_coordinator,
+        "devices": [],
+    }
+
+    await async_setup_entry(hass, mock_config_entry, mock_async_add_entities)
+
+    async_dispatcher_send(
+        hass,
+        SIGNAL_NEW_DEVICES.format(mock_config_entry.entry_id),
+        [{"id": "5", "name": "Device SENSO_Z", "type": 9}, {"id": "6", "name": "Device UNKNOWN", "type": 11}],
+    )
+
+    assert mock_async_add_entities.call_count == 2
+    entities = mock_async_add_entities.call_args[0][0]
+    assert len(entities) == 1
+    assert isinstance(entities[0], MobilusCover)
+    assert entities[0].device["id"] == "5"
+
+def test_cover_init(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "0",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.coordinator == mock_coordinator
     assert cover.device == device
-    assert cover.client == mock_client
+    assert cover.gateway == mock_gateway
 
-def test_cover_unique_id(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_unique_id(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.unique_id == "mobilus_3"
 
-def test_cover_name(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_name(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.name == "Device SENSO"
 
-def test_cover_device_class(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_device_class(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.device_class == CoverDeviceClass.SHUTTER
 
-def test_cover_garage_device_class(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_garage_device_class(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device CGR",
         "type": 4,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.device_class == CoverDeviceClass.GARAGE
 
 
-def test_cover_supported_features(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_supported_features(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device CMR",
         "type": 3,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.supported_features == (
         CoverEntityFeature.OPEN
@@ -138,13 +160,13 @@ def test_cover_supported_features(mock_client: Mock, mock_coordinator: Mock) ->
         | CoverEntityFeature.STOP
     )
 
-def test_cover_supported_features_senso(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_supported_features_senso(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.supported_features == (
         CoverEntityFeature.OPEN
@@ -153,13 +175,13 @@ def test_cover_supported_features_senso(mock_client: Mock, mock_coordinator: Moc
         | CoverEntityFeature.SET_POSITION
     )
 
-def test_cover_supported_features_senso_z(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_supported_features_senso_z(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO_Z",
         "type": 9,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.supported_features == (
         CoverEntityFeature.OPEN
@@ -168,13 +190,13 @@ def test_cover_supported_features_senso_z(mock_client: Mock, mock_coordinator: M
         | CoverEntityFeature.SET_POSITION
     )
 
-def test_cover_supported_features_cosmo_czr(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_supported_features_cosmo_czr(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.supported_features == (
         CoverEntityFeature.OPEN
@@ -185,7 +207,7 @@ def test_cover_supported_features_cosmo_czr(mock_client: Mock, mock_coordinator:
         | CoverEntityFeature.SET_TILT_POSITION
     )
 
-def test_cover_is_closed_true(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_is_closed_true(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.cover_position = 0
 
@@ -197,11 +219,11 @@ def test_cover_is_closed_true(mock_client: Mock, mock_coordinator: Mock) -> None
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.is_closed
 
-def test_cover_is_closed_false(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_is_closed_false(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.cover_position = 100
 
@@ -213,11 +235,11 @@ def test_cover_is_closed_false(mock_client: Mock, mock_coordinator: Mock) -> Non
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert not cover.is_closed
 
-def test_cover_is_closed_no_device_status(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_is_closed_no_device_status(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = None
 
     mock_coordinator.data.devices = {
@@ -228,11 +250,11 @@ def test_cover_is_closed_no_device_status(mock_client: Mock, mock_coordinator: M
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert not cover.is_closed
 
-def test_cover_is_closed_no_position(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_is_closed_no_position(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.cover_position = None
 
@@ -244,11 +266,11 @@ def test_cover_is_closed_no_position(mock_client: Mock, mock_coordinator: Mock)
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert not cover.is_closed
 
-def test_cover_current_cover_position(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_cover_position(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.cover_position = 50
 
@@ -260,11 +282,11 @@ def test_cover_current_cover_position(mock_client: Mock, mock_coordinator: Mock)
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_cover_position == 50
 
-def test_cover_current_cover_position_no_device_status(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_cover_position_no_device_status(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = None
 
     mock_coordinator.data.devices = {
@@ -275,11 +297,11 @@ def test_cover_current_cover_position_no_device_status(mock_client: Mock, mock_c
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_cover_position is None
 
-def test_cover_current_cover_position_no_position(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_cover_position_no_position(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.cover_position = None
 
@@ -291,11 +313,11 @@ def test_cover_current_cover_position_no_position(mock_client: Mock, mock_coordi
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_cover_position is None
 
-def test_cover_current_tilt_position(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_tilt_position(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.tilt_position = 50
 
@@ -307,11 +329,11 @@ def test_cover_current_tilt_position(mock_client: Mock, mock_coordinator: Mock)
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_tilt_position == 50
 
-def test_cover_current_tilt_position_no_device_status(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_tilt_position_no_device_status(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = None
 
     mock_coordinator.data.devices = {
@@ -322,11 +344,11 @@ def test_cover_current_tilt_position_no_device_status(mock_client: Mock, mock_co
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_tilt_position is None
 
-def test_cover_current_tilt_position_no_tilt_position(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_current_tilt_position_no_tilt_position(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.tilt_position = None
 
@@ -338,100 +360,167 @@ def test_cover_current_tilt_position_no_tilt_position(mock_client: Mock, mock_co
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
 
     assert cover.current_tilt_position is None
 
-async def test_cover_async_open_cover(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_cover_extra_state_attributes(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    history = MobilusDeviceHistory(4)
+    history.append(0.0, 7, 20, None)
+    history.append(25.0, 8, 100, None)
+
+    mock_coordinator.history.devices = {
+        "3": history,
+    }
+    mock_coordinator.watchdog.stale = {"3": 0.0}
+    device = {
+        "id": "3",
+        "name": "Device COSMO_CZR",
+        "type": 7,
+    }
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
+
+    with patch("homeassistant.util.dt.start_of_local_day", return_value=Mock(**{"timestamp.return_value": 0.0})):
+        assert cover.extra_state_attributes == {"last_travel_duration": 25.0, "moves_today": 1, "stale": True}
+
+def test_cover_extra_state_attributes_no_history(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.history.devices = {}
+    mock_coordinator.watchdog.stale = {}
+    device = {
+        "id": "3",
+        "name": "Device COSMO_CZR",
+        "type": 7,
+    }
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
+
+    assert cover.extra_state_attributes == {"last_travel_duration": None, "moves_today": 0, "stale": False}
+
+async def test_cover_async_open_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    device = {
+        "id": "3",
+        "name": "Device SENSO",
+        "type": 1,
+    }
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
+    cover.hass = hass
+
+    await cover.async_open_cover()
+
+    mock_gateway.async_call.assert_called_once_with(
+        [("call_events", {"device_id": "3", "value": "UP"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=(),
+    )
+    mock_coordinator.verifier.async_track.assert_called_once_with(device, "UP", MobilusCallPriority.BULK, tilt=False)
+    mock_coordinator.watchdog.async_track.assert_called_once_with("3", "UP", tilt=False)
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
+
+async def test_cover_async_open_cover_user_context(
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
+    cover.async_set_context(Context(user_id="user"))
 
     await cover.async_open_cover()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "UP"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.INTERACTIVE,
+        tilt_devices=(),
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
 
-async def test_cover_async_close_cover(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_close_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     await cover.async_close_cover()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "DOWN"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=(),
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
 
-@pytest.mark.usefixtures("mock_asyncio_sleep")
-async def test_cover_async_stop_cover(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_stop_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     await cover.async_stop_cover()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "STOP"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.STOP,
+        tilt_devices=(),
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.async_schedule_refresh.assert_called_once_with(mock_coordinator.options.settle_delay)
+    assert mock_coordinator.async_request_device_refresh.call_count == 0
 
-@pytest.mark.usefixtures("mock_asyncio_sleep")
-async def test_cover_garage_async_stop_cover(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_garage_async_stop_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device CGR",
         "type": 4,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     await cover.async_stop_cover()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "UP"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.STOP,
+        tilt_devices=(),
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.async_schedule_refresh.assert_called_once_with(mock_coordinator.options.settle_delay)
 
 
-async def test_cover_async_set_cover_position(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_set_cover_position(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     await cover.async_set_cover_position(position=50)
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "50%"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=(),
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
 
-async def test_cover_async_open_cover_tilt(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_open_cover_tilt(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     with patch.object(cover, "async_set_cover_tilt_position", new=AsyncMock()) as mock_async_set_cover_tilt_position:
@@ -439,13 +528,13 @@ async def test_cover_async_open_cover_tilt(hass: HomeAssistant, mock_client: Moc
 
         mock_async_set_cover_tilt_position.assert_called_once_with(tilt_position=100)
 
-async def test_cover_async_close_cover_tilt(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_close_cover_tilt(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     with patch.object(cover, "async_set_cover_tilt_position", new=AsyncMock()) as mock_async_set_cover_tilt_position:
@@ -454,33 +543,251 @@ async def test_cover_async_close_cover_tilt(hass: HomeAssistant, mock_client: Mo
         mock_async_set_cover_tilt_position.assert_called_once_with(tilt_position=0)
 
 async def test_cover_async_set_cover_tilt_position(
-        hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device COSMO_CZR",
         "type": 7,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     await cover.async_set_cover_tilt_position(tilt_position=50)
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "50%"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=["3"],
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.verifier.async_track.assert_called_once_with(device, "50%", MobilusCallPriority.BULK, tilt=True)
+    mock_coordinator.watchdog.async_track.assert_called_once_with("3", "50%", tilt=True)
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
 
-async def test_cover_async_added_to_hass(hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_cover_async_added_to_hass(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Device SENSO",
         "type": 1,
     }
-    cover = MobilusCover(device, mock_client, mock_coordinator)
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
     cover.hass = hass
 
     with patch.object(cover, "async_on_remove", new=Mock()) as mock_async_on_remove:
         await cover.async_added_to_hass()
 
-        mock_coordinator.async_add_listener.assert_called_once_with(cover.async_write_ha_state)
-        mock_async_on_remove.assert_called_once_with(mock_coordinator.async_add_listener.return_value)
+        mock_coordinator.async_add_device_listener.assert_called_once_with(
+            cover._handle_coordinator_update, ["3"], # noqa: SLF001
+        )
+        mock_async_on_remove.assert_called_once_with(mock_coordinator.async_add_device_listener.return_value)
+
+def test_cover_handle_coordinator_update(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.data.devices = {}
+    device = {
+        "id": "3",
+        "name": "Device COSMO_CZR",
+        "type": 7,
+    }
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
+
+    assert cover.current_cover_position is None
+
+    device_status = Mock()
+    device_status.cover_position = 0
+    device_status.tilt_position = 30
+    device_status.is_moving = False
+    mock_coordinator.data.devices = {
+        "3": device_status,
+    }
+
+    with patch.object(cover, "async_write_ha_state") as mock_async_write_ha_state:
+        cover._handle_coordinator_update() # noqa: SLF001
+
+    mock_async_write_ha_state.assert_called_once()
+    assert cover.is_closed
+    assert cover.current_cover_position == 0
+    assert cover.current_cover_tilt_position == 30
+
+async def test_async_setup_entry_groups(
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry, mock_async_add_entities: Mock) -> None:
+    hass.data[DOMAIN] = {}
+    hass.data[DOMAIN][mock_config_entry.entry_id] = {
+        "gateway": mock_gateway,
+        "coordinator": mock_coordinator,
+        "devices": [
+            {"id": "0", "name": "Device SENSO", "type": 1, "assignedGroupIds": ["10", "11"]},
+            {"id": "1", "name": "Device COSMO", "type": 2, "assignedGroupIds": ["10"]},
+            {"id": "2", "name": "Device SWITCH", "type": 5, "assignedGroupIds": ["10"]},
+        ],
+    }
+
+    await async_setup_entry(hass, mock_config_entry, mock_async_add_entities)
+
+    assert mock_async_add_entities.call_count == 2
+    groups = mock_async_add_entities.call_args[0][0]
+    assert [(group.group_id, [device["id"] for device in group.devices]) for group in groups] == [
+        ("10", ["0", "1"]),
+        ("11", ["0"]),
+    ]
+    assert groups[0].unique_id == f"mobilus_{mock_config_entry.entry_id}_group_10"
+
+def test_group_cover_properties(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.watchdog.stale = {"1": 0.0}
+    devices = [
+        {"id": "0", "name": "Device SENSO", "type": 1},
+        {"id": "1", "name": "Device SENSO_Z", "type": 9},
+    ]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+
+    assert cover.unique_id == "mobilus_test_entry_group_10"
+    assert cover.name == "Group 10"
+    assert cover.device_class == CoverDeviceClass.SHUTTER
+    assert cover.supported_features == (
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+        | CoverEntityFeature.SET_POSITION
+    )
+    assert cover.extra_state_attributes == {"device_ids": ["0", "1"], "stale": True}
+
+def test_group_cover_state(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    first_status = Mock()
+    first_status.cover_position = 0
+    first_status.tilt_position = None
+    first_status.is_moving = False
+    second_status = Mock()
+    second_status.cover_position = 50
+    second_status.tilt_position = 30
+    second_status.is_moving = False
+    mock_coordinator.data.devices = {"0": first_status, "1": second_status}
+    devices = [
+        {"id": "0", "name": "Device COSMO_CZR", "type": 7},
+        {"id": "1", "name": "Device COSMO_CZR", "type": 7},
+        {"id": "2", "name": "Device COSMO_CZR", "type": 7},
+    ]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+
+    assert cover.current_cover_position == 25
+    assert cover.current_tilt_position == 30
+    assert cover.is_closed is False
+
+    second_status.cover_position = 0
+
+    with patch.object(cover, "async_write_ha_state") as mock_async_write_ha_state:
+        cover._handle_coordinator_update() # noqa: SLF001
+
+    mock_async_write_ha_state.assert_called_once()
+    assert cover.current_cover_position == 0
+    assert cover.is_closed is True
+
+def test_group_cover_state_unknown(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.data.devices = {}
+    devices = [{"id": "0", "name": "Device SENSO", "type": 1}]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+
+    assert cover.current_cover_position is None
+    assert cover.current_tilt_position is None
+    assert cover.is_closed is None
+
+async def test_group_cover_async_open_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    devices = [
+        {"id": "0", "name": "Device SENSO", "type": 1},
+        {"id": "1", "name": "Device COSMO", "type": 2},
+    ]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+    cover.hass = hass
+
+    await cover.async_open_cover()
+
+    mock_gateway.async_call.assert_called_once_with(
+        [
+            ("call_events", {"device_id": "0", "value": "UP"}),
+            ("call_events", {"device_id": "1", "value": "UP"}),
+        ],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=(),
+    )
+    assert mock_coordinator.verifier.async_track.call_count == 2
+    mock_coordinator.watchdog.async_track.assert_called_with("1", "UP", tilt=False)
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["0", "1"])
+
+async def test_group_cover_async_stop_cover(hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    devices = [
+        {"id": "0", "name": "Device SENSO", "type": 1},
+        {"id": "1", "name": "Device CGR", "type": 4},
+    ]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+    cover.hass = hass
+
+    await cover.async_stop_cover()
+
+    mock_gateway.async_call.assert_called_once_with(
+        [
+            ("call_events", {"device_id": "0", "value": "STOP"}),
+            ("call_events", {"device_id": "1", "value": "UP"}),
+        ],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.STOP,
+        tilt_devices=(),
+    )
+    mock_coordinator.async_schedule_refresh.assert_called_once_with(mock_coordinator.options.settle_delay)
+
+async def test_group_cover_async_set_cover_position(
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    devices = [
+        {"id": "0", "name": "Device SENSO", "type": 1},
+        {"id": "1", "name": "Device COSMO", "type": 2},
+    ]
+    cover = MobilusGroupCover("test_entry", "10", devices, mock_gateway, mock_coordinator)
+    cover.hass = hass
+
+    await cover.async_set_cover_position(position=40)
+
+    mock_gateway.async_call.assert_called_once_with(
+        [
+            ("call_events", {"device_id": "0", "value": "40%"}),
+            ("call_events", {"device_id": "1", "value": "40%"}),
+        ],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
+        tilt_devices=(),
+    )
+
+def test_cover_handle_coordinator_update_moving(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.options.motion_write_interval = 5.0
+    device_status = Mock()
+    device_status.cover_position = 40
+    device_status.tilt_position = None
+    device_status.is_moving = True
+    mock_coordinator.data.devices = {
+        "3": device_status,
+    }
+    device = {
+        "id": "3",
+        "name": "Device SENSO",
+        "type": 1,
+    }
+    cover = MobilusCover(device, mock_gateway, mock_coordinator)
+
+    with (
+        patch.object(cover, "async_write_ha_state") as mock_async_write_ha_state,
+        patch("custom_components.mobilus.throttle.async_call_later") as mock_async_call_later,
+    ):
+        cover._handle_coordinator_update() # noqa: SLF001
+        cover._handle_coordinator_update() # noqa: SLF001
+
+        # Intermediate position is deferred
+        assert mock_async_write_ha_state.call_count == 1
+        mock_async_call_later.assert_called_once()
+
+        device_status.cover_position = 100
+        device_status.is_moving = False
+        cover._handle_coordinator_update() # noqa: SLF001
+
+        # Settled state is written at once
+        assert mock_async_write_ha_state.call_count == 2
+        mock_async_call_later.return_value.assert_called_once()
+
+    assert cover.current_cover_position == 100
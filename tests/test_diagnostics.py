@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mobilus.history import MobilusDeviceHistory, MobilusStateHistory
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+
+async def test_async_get_config_entry_diagnostics(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry) -> None:
+    gateway.metrics.record_call("poll", 1.0)
+    mock_coordinator.history = MobilusStateHistory(4)
+    mock_coordinator.history.devices["0"] = MobilusDeviceHistory(4)
+    mock_coordinator.history.devices["0"].append(1.0, 8, 100, None)
+
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": gateway,
+            "coordinator": mock_coordinator,
+        },
+    }
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert diagnostics["entry"]["data"] == {
+        "host": "test_host",
+        "username": "**REDACTED**",
+        "password": "**REDACTED**",
+    }
+    assert diagnostics["metrics"]["calls"]["poll"]["calls"] == 1
+    assert diagnostics["history"] == {"0": [(1.0, 8, 100, None)]}
+    assert diagnostics["pacing"]["burst"] == 4
+    assert diagnostics["scheduler"] == {"slots": 2, "active": 0, "waiting": 0}
+    assert diagnostics["poll_schedule"] == {"max_concurrent": 2, "running": 0, "entries": {}}
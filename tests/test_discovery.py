@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mobilus.discovery import async_discover_gateways, async_probe, async_scan
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture
+async def gateway_port() -> AsyncGenerator[int, None]:
+    # Stand-in gateway only accepts connections, which is all the discovery probes for
+    async def handle(_reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+
+    async with server:
+        yield server.sockets[0].getsockname()[1]
+
+@pytest.fixture
+async def closed_port() -> int:
+    server = await asyncio.start_server(lambda _reader, _writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    return port
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_async_probe(gateway_port: int) -> None:
+    gateway = await async_probe("127.0.0.1", gateway_port)
+
+    assert gateway is not None
+    assert gateway.host == "127.0.0.1"
+    assert gateway.latency >= 0
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_async_probe_closed_port(closed_port: int) -> None:
+    assert await async_probe("127.0.0.1", closed_port) is None
+
+async def test_async_probe_timeout() -> None:
+    async def never_connect(*_args: object) -> None:
+        await asyncio.Event().wait()
+
+    with patch("asyncio.open_connection", never_connect):
+        assert await async_probe("192.168.1.10", probe_timeout=0.01) is None
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_async_scan(gateway_port: int) -> None:
+    gateways = await async_scan(["127.0.0.1", "127.0.0.1"], gateway_port, concurrency=1)
+
+    assert [gateway.host for gateway in gateways] == ["127.0.0.1", "127.0.0.1"]
+
+async def test_async_scan_bounded_concurrency() -> None:
+    active = 0
+    max_active = 0
+
+    async def probe(_host: str, _port: int, _probe_timeout: float) -> None:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0)
+        active -= 1
+
+    with patch("custom_components.mobilus.discovery.async_probe", probe):
+        assert await async_scan([f"192.168.1.{host}" for host in range(1, 20)], concurrency=4) == []
+
+    assert max_active == 4
+
+async def test_async_discover_gateways(hass: HomeAssistant) -> None:
+    adapters = [
+        {"enabled": True, "ipv4": [{"address": "10.0.0.5", "network_prefix": 16}]},
+        {"enabled": True, "ipv4": [{"address": "127.0.0.1", "network_prefix": 8}]},
+        {"enabled": False, "ipv4": [{"address": "192.168.1.5", "network_prefix": 24}]},
+    ]
+
+    with (
+        patch("homeassistant.components.network.async_get_adapters", return_value=adapters),
+        patch("custom_components.mobilus.discovery.async_scan", return_value=[]) as mock_scan,
+    ):
+        assert await async_discover_gateways(hass) == []
+
+    hosts = mock_scan.call_args.args[0]
+
+    # Network is narrowed down to a /24 around the local address, which is not probed
+    assert len(hosts) == 253
+    assert hosts[0] == "10.0.0.1"
+    assert "10.0.0.5" not in hosts
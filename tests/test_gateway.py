@@ -0,0 +1,678 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, PropertyMock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.mobilus.const import KEEPALIVE_INTERVAL, PACING_INITIAL_BURST
+from custom_components.mobilus.gateway import (
+    MobilusCallKind,
+    MobilusGateway,
+    MobilusGatewayConnectionError,
+    MobilusGatewayNoResponseError,
+    MobilusGatewayTimeoutError,
+)
+from custom_components.mobilus.options import MobilusOptions
+from custom_components.mobilus.scheduler import MobilusCallPriority
+from custom_components.mobilus.session import MobilusSession
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from homeassistant.core import HomeAssistant
+
+@pytest.fixture
+def mock_pacing_ack_delay() -> Generator[None, None, None]:
+    with patch("custom_components.mobilus.gateway.PACING_ACK_DELAY", 0):
+        yield
+
+def _acknowledging_call(commands: list[tuple[str, dict[str, str]]], moving: tuple[str, ...] = ("1", "2")) -> str:
+    # Echoes call events and reports listed devices as moving
+    if commands == [("current_state", {})]:
+        return json.dumps([{
+            "events": [{"deviceId": device_id, "value": "50%", "eventNumber": 7} for device_id in moving],
+        }])
+
+    return json.dumps([
+        {"deviceId": params["device_id"], "value": params["value"], "eventNumber": 6}
+        for _command, params in commands
+    ])
+
+async def test_gateway_async_call(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([{"events": []}])
+
+    response = await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert response == [{"events": []}]
+    mock_client.call.assert_called_once_with([("current_state", {})])
+    assert gateway.metrics.calls["poll"].calls == 1
+    assert gateway.metrics.calls["poll"].timeouts == 0
+
+async def test_gateway_async_call_client_config(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_timeout=10, poll_timeout=20),
+    )
+
+    with patch("mobilus_client.config.Config") as mock_client_config:
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        await gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND)
+
+    assert mock_client_config.call_count == 2
+    mock_client_config.assert_any_call(
+        gateway_host="test_host",
+        user_login="test_user",
+        user_password="test_pass", # noqa: S106
+        auth_timeout_period=10,
+        timeout_period=10,
+    )
+    mock_client_config.assert_any_call(
+        gateway_host="test_host",
+        user_login="test_user",
+        user_password="test_pass", # noqa: S106
+        auth_timeout_period=5,
+        timeout_period=5,
+    )
+
+async def test_gateway_async_call_incomplete_response(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([])
+
+    response = await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert response == []
+    assert gateway.metrics.calls["poll"].timeouts == 0
+
+async def test_gateway_async_call_library_timeout(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([])
+
+    with (
+        patch("custom_components.mobilus.gateway.time", new=Mock(**{"monotonic.side_effect": [0, 15]})),
+        pytest.raises(MobilusGatewayNoResponseError, match="poll call timed out after 30 seconds"),
+    ):
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert gateway.metrics.calls["poll"].timeouts == 1
+    assert gateway.metrics.calls["poll"].calls == 0
+
+async def test_gateway_async_call_library_timeout_partial(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([{"devices": []}])
+
+    with (
+        patch("custom_components.mobilus.gateway.time", new=Mock(**{"monotonic.side_effect": [0, 30]})),
+        pytest.raises(MobilusGatewayTimeoutError) as exception,
+    ):
+        await gateway.async_call([("devices_list", {}), ("current_state", {})], MobilusCallKind.DEVICES_LIST)
+
+    # Some responses arrived, so the login succeeded
+    assert not isinstance(exception.value, MobilusGatewayNoResponseError)
+
+async def test_gateway_async_call_executor_timeout(hass: HomeAssistant, mock_client: Mock) -> None:
+    released = threading.Event()
+    mock_client.call.side_effect = lambda _commands: released.wait(5) and "[]"
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_timeout=0.01),
+    )
+
+    with (
+        patch("custom_components.mobilus.gateway.TIMEOUT_GRACE_PERIOD", 0),
+        pytest.raises(MobilusGatewayTimeoutError, match="command call timed out"),
+    ):
+        await gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND)
+
+    released.set()
+
+    assert gateway.metrics.calls["command"].timeouts == 1
+
+async def test_gateway_set_credentials(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+
+    with patch("mobilus_client.config.Config") as mock_client_config:
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        gateway.set_credentials("new_host", "new_user", "new_pass")
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert mock_client_config.call_count == 2
+    assert mock_client_config.call_args.kwargs["gateway_host"] == "new_host"
+    assert mock_client_config.call_args.kwargs["user_login"] == "new_user"
+    assert mock_client_config.call_args.kwargs["user_password"] == "new_pass" # noqa: S105
+
+async def test_gateway_apply_options(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+
+    with patch("mobilus_client.config.Config") as mock_client_config:
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        gateway.apply_options(MobilusOptions(batch_window=1))
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+        gateway.apply_options(MobilusOptions(batch_window=1, poll_timeout=10))
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert mock_client_config.call_count == 2
+    assert gateway.batch_window == 1
+    assert gateway.timeouts[MobilusCallKind.POLL] == 10
+
+@pytest.mark.usefixtures("mock_pacing_ack_delay")
+async def test_gateway_async_call_batched(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = _acknowledging_call
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(batch_window=0.01),
+    )
+
+    responses = await asyncio.gather(
+        gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND),
+        gateway.async_call([("call_events", {"device_id": "2", "value": "DOWN"})], MobilusCallKind.COMMAND),
+    )
+
+    assert mock_client.call.call_args_list[0].args == ([
+        ("call_events", {"device_id": "1", "value": "UP"}),
+        ("call_events", {"device_id": "2", "value": "DOWN"}),
+    ],)
+    assert mock_client.call.call_args_list[1].args == ([("current_state", {})],)
+    assert responses[0] == responses[1] == [
+        {"deviceId": "1", "value": "UP", "eventNumber": 6},
+        {"deviceId": "2", "value": "DOWN", "eventNumber": 6},
+    ]
+
+@pytest.mark.usefixtures("mock_pacing_ack_delay")
+async def test_gateway_async_call_scene_default_options(mock_client: Mock, gateway: MobilusGateway) -> None:
+    device_ids = [str(device_id) for device_id in range(2 * PACING_INITIAL_BURST)]
+    mock_client.call.side_effect = lambda commands: _acknowledging_call(commands, moving=tuple(device_ids))
+
+    # Scene commands every cover on its own, at about the same time
+    await asyncio.gather(*(
+        gateway.async_call([("call_events", {"device_id": device_id, "value": "DOWN"})], MobilusCallKind.COMMAND)
+        for device_id in device_ids
+    ))
+
+    # Default batch window collects them, so they are paced instead of sent in as many sessions at once
+    assert [len(call.args[0]) for call in mock_client.call.call_args_list] == [
+        PACING_INITIAL_BURST, PACING_INITIAL_BURST, 1,
+    ]
+    assert gateway.pacing.acknowledged == len(device_ids)
+
+async def test_gateway_async_call_batched_error(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = RuntimeError("failed")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(batch_window=0.01),
+    )
+
+    responses = await asyncio.gather(
+        gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND),
+        gateway.async_call([("call_events", {"device_id": "2", "value": "DOWN"})], MobilusCallKind.COMMAND),
+        return_exceptions=True,
+    )
+
+    assert mock_client.call.call_count == 1
+    assert all(isinstance(response, RuntimeError) for response in responses)
+
+async def test_gateway_async_call_batched_cancelled(hass: HomeAssistant, mock_client: Mock) -> None:
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(batch_window=10),
+    )
+
+    leader = hass.async_create_task(
+        gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND),
+    )
+    await asyncio.sleep(0)
+    follower = hass.async_create_task(
+        gateway.async_call([("call_events", {"device_id": "2", "value": "DOWN"})], MobilusCallKind.COMMAND),
+    )
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    assert mock_client.call.call_count == 0
+
+async def test_gateway_async_call_stop_not_batched(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(batch_window=10),
+    )
+
+    await gateway.async_call(
+        [("call_events", {"device_id": "1", "value": "STOP"})], MobilusCallKind.COMMAND, MobilusCallPriority.STOP,
+    )
+
+    mock_client.call.assert_called_once_with([("call_events", {"device_id": "1", "value": "STOP"})])
+
+async def test_gateway_async_call_priority(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(max_concurrent_requests=1),
+    )
+
+    # Poll queued first is started after the stop queued behind it
+    await gateway.scheduler.async_acquire(MobilusCallPriority.POLL)
+    poll = hass.async_create_task(gateway.async_call([("current_state", {})], MobilusCallKind.POLL))
+    await asyncio.sleep(0)
+    stop = hass.async_create_task(
+        gateway.async_call(
+            [("call_events", {"device_id": "1", "value": "STOP"})], MobilusCallKind.COMMAND, MobilusCallPriority.STOP,
+        ),
+    )
+    await asyncio.sleep(0)
+    gateway.scheduler.release()
+    await asyncio.gather(poll, stop)
+
+    assert mock_client.call.call_args_list[0].args == ([("call_events", {"device_id": "1", "value": "STOP"})],)
+    assert mock_client.call.call_args_list[1].args == ([("current_state", {})],)
+
+@pytest.mark.usefixtures("mock_pacing_ack_delay")
+async def test_gateway_async_call_paced_retry(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = lambda commands: _acknowledging_call(commands, moving=("1",))
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(),
+    )
+
+    response = await gateway.async_call(
+        [
+            ("call_events", {"device_id": "1", "value": "UP"}),
+            ("call_events", {"device_id": "2", "value": "DOWN"}),
+        ],
+        MobilusCallKind.COMMAND,
+    )
+
+    # Initial send and two retries of the unacknowledged command, each verified with current state
+    assert mock_client.call.call_count == 6
+    assert mock_client.call.call_args_list[2].args == ([("call_events", {"device_id": "2", "value": "DOWN"})],)
+    assert len(response) == 4
+    assert gateway.pacing.acknowledged == 1
+    assert gateway.pacing.lost == 3
+    assert gateway.pacing.retried == 2
+    assert gateway.pacing.failed == 1
+    assert gateway.pacing.burst == 1
+
+@pytest.mark.usefixtures("mock_pacing_ack_delay")
+async def test_gateway_async_call_paced_tilt(hass: HomeAssistant, mock_client: Mock) -> None:
+    # Tilt reached by both devices is reported in the additional position
+    mock_client.call.side_effect = lambda commands: json.dumps(
+        [{"events": [{"deviceId": device_id, "value": "UP:30$", "eventNumber": 8} for device_id in ("1", "2")]}]
+        if commands == [("current_state", {})] else [{} for _command in commands],
+    )
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(),
+    )
+
+    await gateway.async_call(
+        [
+            ("call_events", {"device_id": "1", "value": "30%"}),
+            ("call_events", {"device_id": "2", "value": "30%"}),
+        ],
+        MobilusCallKind.COMMAND,
+        tilt_devices=["1", "2"],
+    )
+
+    assert gateway.pacing.acknowledged == 2
+    assert gateway.pacing.retried == 0
+
+async def test_gateway_async_call_connection_error(mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    with pytest.raises(MobilusGatewayConnectionError, match="refused"):
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    with pytest.raises(MobilusGatewayConnectionError):
+        await gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND)
+
+    assert not gateway.journal
+
+async def test_gateway_async_call_journal(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_journal_ttl=60),
+    )
+
+    response = await gateway.async_call(
+        [("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND,
+    )
+
+    assert response == []
+    assert "1" in gateway.journal
+
+    # Stop is not kept for replay
+    with pytest.raises(MobilusGatewayConnectionError):
+        await gateway.async_call(
+            [("call_events", {"device_id": "2", "value": "STOP"})], MobilusCallKind.COMMAND, MobilusCallPriority.STOP,
+        )
+
+    assert "2" not in gateway.journal
+
+    mock_client.call.side_effect = None
+    mock_client.call.return_value = json.dumps([{}])
+
+    await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+    await hass.async_block_till_done()
+
+    mock_client.call.assert_called_with([("call_events", {"device_id": "1", "value": "UP"})])
+    assert not gateway.journal
+
+async def test_gateway_async_call_journal_superseded(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_journal_ttl=60),
+    )
+
+    await gateway.async_call(
+        [
+            ("call_events", {"device_id": "1", "value": "DOWN"}),
+            ("call_events", {"device_id": "2", "value": "DOWN"}),
+        ],
+        MobilusCallKind.COMMAND,
+    )
+
+    # Failed stop still supersedes the kept command
+    with pytest.raises(MobilusGatewayConnectionError):
+        await gateway.async_call(
+            [("call_events", {"device_id": "2", "value": "STOP"})], MobilusCallKind.COMMAND, MobilusCallPriority.STOP,
+        )
+
+    assert "2" not in gateway.journal
+
+    mock_client.call.side_effect = None
+    mock_client.call.return_value = json.dumps([{"deviceId": "1", "value": "UP", "eventNumber": 6}])
+
+    await gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND)
+    await hass.async_block_till_done()
+
+    # Stale command is not sent after the newer one
+    mock_client.call.assert_called_once_with([("call_events", {"device_id": "1", "value": "UP"})])
+    assert not gateway.journal
+
+async def test_gateway_journal_replay_failed(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_journal_ttl=60),
+    )
+
+    await gateway.async_call([("call_events", {"device_id": "1", "value": "DOWN"})], MobilusCallKind.COMMAND)
+    expires = gateway.journal.entries["1"].expires
+
+    await gateway._async_replay() # noqa: SLF001
+
+    # Replay failing again does not extend the time the command is kept for
+    assert mock_client.call.call_count == 2
+    assert gateway.journal.entries["1"].expires == expires
+
+async def test_gateway_journal_replay_on_reconnect(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(command_journal_ttl=60),
+    )
+    gateway.session = Mock(spec=MobilusSession)
+    gateway.session.connect.return_value = True
+    gateway.session.call.return_value = json.dumps([{"deviceId": "1", "value": "UP", "eventNumber": 6}])
+
+    await gateway.async_call([("call_events", {"device_id": "1", "value": "UP"})], MobilusCallKind.COMMAND)
+
+    assert "1" in gateway.journal
+
+    # Session opened again by the keepalive sends kept commands without waiting for another call
+    gateway.async_start_keepalive()
+    await hass.async_block_till_done()
+
+    gateway.session.call.assert_called_once()
+    assert gateway.session.call.call_args.args[0] == [("call_events", {"device_id": "1", "value": "UP"})]
+    assert not gateway.journal
+
+    await gateway.async_stop_keepalive()
+
+async def test_gateway_max_concurrent_requests(hass: HomeAssistant, mock_client: Mock) -> None:
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    def call(_commands: list[tuple[str, dict[str, str]]]) -> str:
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+
+        time.sleep(0.01)
+
+        with lock:
+            running.pop()
+
+        return json.dumps([{"events": []}])
+
+    mock_client.call.side_effect = call
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(max_concurrent_requests=1),
+    )
+
+    responses = await asyncio.gather(
+        *(gateway.async_call([("current_state", {})], MobilusCallKind.POLL) for _ in range(3)),
+    )
+
+    # Second and third request wait for the slot together and share a single state query
+    assert mock_client.call.call_count == 2
+    assert mock_client.call.call_args_list[1].args == ([("current_state", {})],)
+    assert responses == [[{"events": []}]] * 3
+    assert max(max_running) == 1
+
+async def test_gateway_multiplexed_requests(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = lambda commands: json.dumps([
+        {"devices": []} if command == "devices_list" else {"events": []} for command, _params in reversed(commands)
+    ])
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(max_concurrent_requests=1),
+    )
+
+    await gateway.scheduler.async_acquire(MobilusCallPriority.BULK)
+    requests = [
+        hass.async_create_task(gateway.async_call([("devices_list", {})], MobilusCallKind.DEVICES_LIST)),
+        hass.async_create_task(
+            gateway.async_call([("current_state", {})], MobilusCallKind.DEVICES_LIST, MobilusCallPriority.BULK),
+        ),
+    ]
+    await asyncio.sleep(0)
+    gateway.scheduler.release()
+    responses = await asyncio.gather(*requests)
+
+    # Both requests share a session, each gets the response to its own query
+    mock_client.call.assert_called_once_with([("devices_list", {}), ("current_state", {})])
+    assert responses == [[{"devices": []}], [{"events": []}]]
+
+async def test_gateway_commands_not_multiplexed(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = lambda commands: json.dumps([
+        {"deviceId": params["device_id"], "value": params["value"], "eventNumber": 6}
+        for _command, params in commands
+    ])
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(batch_window=0, max_concurrent_requests=1),
+    )
+
+    responses = await asyncio.gather(*(
+        gateway.async_call([("call_events", {"device_id": str(device_id), "value": "UP"})], MobilusCallKind.COMMAND)
+        for device_id in range(5)
+    ))
+
+    # Commands waiting for the slot are sent one per session, never back to back
+    assert mock_client.call.call_count == 5
+    assert all(len(call.args[0]) == 1 for call in mock_client.call.call_args_list)
+    assert [response[0]["deviceId"] for response in responses] == ["0", "1", "2", "3", "4"]
+    assert not gateway._groups # noqa: SLF001
+
+async def test_gateway_multiplexed_requests_error(hass: HomeAssistant, mock_client: Mock) -> None:
+    mock_client.call.side_effect = ConnectionRefusedError("refused")
+
+    gateway = MobilusGateway(
+        hass,
+        host="test_host",
+        username="test_user",
+        password="test_pass", # noqa: S106
+        options=MobilusOptions(max_concurrent_requests=1),
+    )
+
+    results = await asyncio.gather(
+        *(gateway.async_call([("current_state", {})], MobilusCallKind.POLL) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, MobilusGatewayConnectionError) for result in results)
+    assert mock_client.call.call_count == 2
+    assert not gateway._groups # noqa: SLF001
+
+async def test_gateway_keepalive(hass: HomeAssistant, mock_client: Mock, gateway: MobilusGateway) -> None:
+    mock_client.call.return_value = json.dumps([{}])
+    gateway.session = Mock(spec=MobilusSession)
+    gateway.session.connect.return_value = True
+    gateway.session.call.return_value = json.dumps([{"events": []}])
+
+    gateway.async_start_keepalive()
+    await hass.async_block_till_done()
+
+    gateway.session.connect.assert_called_once()
+
+    response = await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    assert response == [{"events": []}]
+    mock_client.call.assert_not_called()
+    assert gateway.metrics.sessions["poll_warm"].calls == 1
+
+    # Busy or dropped session falls back to a session of its own
+    gateway.session.call.return_value = None
+
+    await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    mock_client.call.assert_called_once_with([("current_state", {})])
+    assert gateway.metrics.sessions["poll_cold"].calls == 1
+
+    await gateway.async_stop_keepalive()
+
+    gateway.session.close.assert_called_once()
+
+async def test_gateway_keepalive_reconnect(hass: HomeAssistant, gateway: MobilusGateway) -> None:
+    gateway.session = Mock(spec=MobilusSession)
+    gateway.session.connect.return_value = False
+
+    gateway.async_start_keepalive()
+    await hass.async_block_till_done()
+
+    type(gateway.session).is_ready = PropertyMock(return_value=False)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=KEEPALIVE_INTERVAL))
+    await hass.async_block_till_done()
+
+    assert gateway.session.connect.call_count == 2
+
+    await gateway.async_stop_keepalive()
+
+async def test_gateway_async_close(hass: HomeAssistant, mock_client: Mock, gateway: MobilusGateway) -> None:
+    gateway.session = Mock(spec=MobilusSession)
+    gateway.session.connect.return_value = True
+
+    gateway.async_start_keepalive()
+    await hass.async_block_till_done()
+
+    await gateway.async_close()
+
+    gateway.session.close.assert_called_once()
+    assert not gateway._clients # noqa: SLF001
+
+    with pytest.raises(MobilusGatewayConnectionError, match="closed"):
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    mock_client.call.assert_not_called()
+    assert gateway.scheduler.active == 0
+
+async def test_gateway_async_reconnect(hass: HomeAssistant, gateway: MobilusGateway) -> None:
+    gateway.session = Mock(spec=MobilusSession)
+    gateway.session.connect.return_value = True
+
+    gateway.async_start_keepalive()
+    await hass.async_block_till_done()
+
+    # New session is already open when the reconnect returns
+    await gateway.async_reconnect()
+
+    gateway.session.close.assert_called_once()
+    assert gateway.session.connect.call_count == 2
+
+    await gateway.async_stop_keepalive()
@@ -0,0 +1,85 @@
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.history import MobilusDeviceHistory, MobilusStateHistory
+
+
+def test_device_history_append() -> None:
+    history = MobilusDeviceHistory(4)
+
+    assert history.append(1.0, 7, 50, None) is True
+    assert history.append(2.0, 7, 50, None) is False
+    assert history.append(3.0, 8, 100, 20) is True
+
+    assert len(history) == 2
+    assert history.samples() == [(1.0, 7, 50, None), (3.0, 8, 100, 20)]
+
+def test_device_history_bounded() -> None:
+    history = MobilusDeviceHistory(3)
+
+    for timestamp in range(10):
+        history.append(float(timestamp), 8, timestamp, None)
+
+    assert len(history) == 3
+    assert history.samples() == [(7.0, 8, 7, None), (8.0, 8, 8, None), (9.0, 8, 9, None)]
+
+def test_device_history_last_changed() -> None:
+    history = MobilusDeviceHistory(4)
+
+    assert history.last_changed() is None
+
+    history.append(1.0, 7, 50, None)
+    history.append(2.0, 7, 50, None)
+
+    assert history.last_changed() == 1.0
+
+def test_device_history_last_travel_duration() -> None:
+    history = MobilusDeviceHistory(8)
+    history.append(0.0, 8, 0, None)
+    history.append(10.0, 7, 20, None)
+    history.append(15.0, 7, 60, None)
+    history.append(32.0, 8, 100, None)
+    history.append(40.0, 7, 50, None)
+
+    # Move in progress is not finished yet, last finished one is reported
+    assert history.last_travel_duration() == 22.0
+
+def test_device_history_last_travel_duration_no_moves() -> None:
+    history = MobilusDeviceHistory(4)
+    history.append(0.0, 8, 0, None)
+    history.append(10.0, 8, 100, None)
+
+    assert history.last_travel_duration() is None
+
+def test_device_history_moves_since() -> None:
+    history = MobilusDeviceHistory(8)
+    history.append(0.0, 7, 20, None)
+    history.append(5.0, 8, 100, None)
+    history.append(10.0, 7, 50, None)
+    history.append(12.0, 7, 30, None)
+    history.append(15.0, 8, 0, None)
+    history.append(20.0, 7, 40, None)
+
+    assert history.moves_since(0.0) == 3
+    assert history.moves_since(8.0) == 2
+    assert history.moves_since(30.0) == 0
+
+def test_state_history_record() -> None:
+    state_history = MobilusStateHistory(4)
+    state_history.record(
+        MobilusDeviceStateList({
+            "0": MobilusDeviceState(device_id="0", event_number=7, value="50%"),
+            "1": MobilusDeviceState(device_id="1", event_number=8, value="ON"),
+        }),
+        1.0,
+    )
+    state_history.record(
+        MobilusDeviceStateList({
+            "0": MobilusDeviceState(device_id="0", event_number=8, value="UP"),
+            "1": MobilusDeviceState(device_id="1", event_number=8, value="ON"),
+        }),
+        2.0,
+    )
+
+    assert state_history.as_dict() == {
+        "0": [(1.0, 7, 50, None), (2.0, 8, 100, None)],
+        "1": [(1.0, 8, None, None)],
+    }
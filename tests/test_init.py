@@ -5,10 +5,22 @@ from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from homeassistant.const import Platform
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.mobilus import async_migrate_entry, async_setup_entry, async_unload_entry
-from custom_components.mobilus.const import DOMAIN, PLATFORMS
+from custom_components.mobilus import (
+    async_migrate_entry,
+    async_refresh_devices,
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+    async_update_listener,
+)
+from custom_components.mobilus.const import DOMAIN, SERVICE_PROFILE, SIGNAL_NEW_DEVICES
+from custom_components.mobilus.gateway import MobilusCallKind, MobilusGateway, MobilusGatewayTimeoutError
+from custom_components.mobilus.options import MobilusOptions
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -25,6 +37,11 @@ def mock_unload_platforms(hass: HomeAssistant) -> Generator[AsyncMock, None, Non
     with patch.object(hass.config_entries, "async_unload_platforms", new=AsyncMock()) as mock_unload_platforms:
         yield mock_unload_platforms
 
+@pytest.fixture(autouse=True)
+def mock_start_keepalive() -> Generator[Mock, None, None]:
+    with patch.object(MobilusGateway, "async_start_keepalive") as mock_start_keepalive:
+        yield mock_start_keepalive
+
 @pytest.fixture
 def mock_logger() -> Generator[Mock, None, None]:
     with patch("custom_components.mobilus._LOGGER", autospec=True) as mock_logger:
@@ -41,9 +58,13 @@ def mock_config_entry_v1() -> MockConfigEntry:
         },
     )
 
+async def test_async_setup(hass: HomeAssistant) -> None:
+    assert await async_setup(hass, {}) is True
+    assert hass.services.has_service(DOMAIN, SERVICE_PROFILE)
+
 async def test_async_setup_entry(
         hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
-        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None:
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock, mock_start_keepalive: Mock) -> None:
 
     mock_client.call.return_value = json.dumps(
         [
@@ -102,9 +123,11 @@ async def test_async_setup_entry(
 
     assert result
     assert mock_coordinator.async_config_entry_first_refresh.call_count == 1
-    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+    mock_start_keepalive.assert_called_once()
+    mock_coordinator.supervisor.async_register.assert_called_once_with(mock_config_entry.entry_id, mock_coordinator)
+    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, [Platform.COVER, Platform.SWITCH])
+    assert isinstance(hass.data[DOMAIN][mock_config_entry.entry_id].pop("gateway"), MobilusGateway)
     assert(hass.data[DOMAIN][mock_config_entry.entry_id]) == {
-        "client": mock_client,
         "coordinator": mock_coordinator,
         "devices": [
             {
@@ -152,8 +175,133 @@ async def test_async_setup_entry(
                 "type": 9,
             },
         ],
+        "platforms": {Platform.COVER, Platform.SWITCH},
     }
 
+async def test_async_setup_entry_single_platform(
+        hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None:
+
+    mock_client.call.return_value = json.dumps(
+        [
+          {
+            "devices": [
+              {
+                "id": "0",
+                "name": "Device SWITCH",
+                "type": 5,
+              },
+          ]},
+        ],
+    )
+
+    result = await async_setup_entry(hass, mock_config_entry)
+
+    assert result
+    assert mock_coordinator.async_config_entry_first_refresh.call_count == 1
+    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, [Platform.SWITCH])
+    assert hass.data[DOMAIN][mock_config_entry.entry_id]["platforms"] == {Platform.SWITCH}
+
+async def test_async_setup_entry_with_current_state(
+        hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None:
+
+    mock_client.call.return_value = json.dumps(
+        [
+          {
+            "devices": [
+              {
+                "id": "0",
+                "name": "Device SWITCH",
+                "type": 5,
+              },
+          ]},
+          {
+            "events": [
+              {
+                "deviceId": "0",
+                "eventNumber": 8,
+                "value": "ON",
+              },
+          ]},
+        ],
+    )
+
+    result = await async_setup_entry(hass, mock_config_entry)
+
+    assert result
+    mock_client.call.assert_called_once_with([("devices_list", {}), ("current_state", {})])
+    mock_coordinator.async_seed.assert_called_once_with([{"deviceId": "0", "eventNumber": 8, "value": "ON"}])
+    assert mock_coordinator.async_config_entry_first_refresh.call_count == 0
+    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, [Platform.SWITCH])
+
+async def test_async_setup_entry_with_current_state_first(
+        hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None:
+
+    mock_client.call.return_value = json.dumps(
+        [
+          {
+            "events": [
+              {
+                "deviceId": "0",
+                "eventNumber": 8,
+                "value": "ON",
+              },
+          ]},
+          {
+            "devices": [
+              {
+                "id": "0",
+                "name": "Device SWITCH",
+                "type": 5,
+              },
+          ]},
+        ],
+    )
+
+    result = await async_setup_entry(hass, mock_config_entry)
+
+    assert result
+    mock_coordinator.async_seed.assert_called_once_with([{"deviceId": "0", "eventNumber": 8, "value": "ON"}])
+    assert mock_coordinator.async_config_entry_first_refresh.call_count == 0
+    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, [Platform.SWITCH])
+
+async def test_async_setup_entry_unknown_device_state(
+        hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None: # noqa: ARG001
+
+    mock_client.call.return_value = json.dumps(
+        [
+          {
+            "devices": [
+              {
+                "id": "0",
+                "name": "Device SWITCH",
+                "type": 5,
+              },
+          ]},
+        ],
+    )
+
+    await async_setup_entry(hass, mock_config_entry)
+
+    check_devices = mock_coordinator.async_add_listener.call_args[0][0]
+
+    with patch("custom_components.mobilus.async_refresh_devices", new=AsyncMock()) as mock_refresh_devices:
+        mock_coordinator.data.devices = {"0": Mock()}
+        check_devices()
+        await hass.async_block_till_done()
+
+        assert mock_refresh_devices.call_count == 0
+
+        mock_coordinator.data.devices = {"0": Mock(), "1": Mock()}
+        check_devices()
+        check_devices()
+        await hass.async_block_till_done()
+
+        mock_refresh_devices.assert_called_once_with(hass, mock_config_entry)
+
 async def test_async_setup_entry_no_devices(
         hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
         mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock, mock_logger: Mock) -> None:
@@ -188,14 +336,73 @@ async def test_async_setup_entry_no_device_in_response(
     assert mock_coordinator.async_config_entry_first_refresh.call_count == 0
     assert mock_forward_entry_setups.call_count == 0
 
+async def test_async_setup_entry_timeout(
+        hass: HomeAssistant, mock_client: Mock, mock_config_entry: MockConfigEntry,
+        mock_coordinator: Mock, mock_forward_entry_setups: AsyncMock) -> None:
+
+    with (
+        patch.object(MobilusGateway, "async_call", side_effect=MobilusGatewayTimeoutError),
+        pytest.raises(ConfigEntryNotReady),
+    ):
+        await async_setup_entry(hass, mock_config_entry)
+
+    assert mock_client.call.call_count == 0
+    assert(hass.data[DOMAIN]) == {}
+    assert mock_coordinator.async_config_entry_first_refresh.call_count == 0
+    assert mock_forward_entry_setups.call_count == 0
+
+async def test_async_update_listener_options(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry) -> None:
+    mock_config_entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": gateway,
+            "coordinator": mock_coordinator,
+        },
+    }
+    hass.config_entries.async_update_entry(mock_config_entry, options={"refresh_interval": 60, "command_timeout": 5})
+
+    with patch("custom_components.mobilus.async_refresh_devices", new=AsyncMock()) as mock_refresh_devices:
+        await async_update_listener(hass, mock_config_entry)
+
+    mock_coordinator.async_set_options.assert_called_once_with(MobilusOptions(refresh_interval=60, command_timeout=5))
+    assert gateway.timeouts[MobilusCallKind.COMMAND] == 5
+    assert mock_refresh_devices.call_count == 0
+    assert mock_coordinator.async_request_refresh.call_count == 0
+
+async def test_async_update_listener_credentials(
+        hass: HomeAssistant, gateway: MobilusGateway, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry) -> None:
+    mock_config_entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": gateway,
+            "coordinator": mock_coordinator,
+        },
+    }
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, "host": "new_host", "password": "new_pass"},
+    )
+
+    with patch("custom_components.mobilus.async_refresh_devices", new=AsyncMock()) as mock_refresh_devices:
+        await async_update_listener(hass, mock_config_entry)
+
+    assert gateway.host == "new_host"
+    assert gateway.password == "new_pass" # noqa: S105
+    mock_refresh_devices.assert_called_once_with(hass, mock_config_entry)
+    mock_coordinator.async_request_refresh.assert_called_once()
+
 async def test_async_setup_unload_entry(
         hass: HomeAssistant, mock_config_entry: MockConfigEntry, mock_unload_platforms: AsyncMock) -> None:
 
     mock_unload_platforms.return_value = True
     hass_domain = {
-        "client": Mock(),
+        "gateway": Mock(),
         "coordinator": Mock(),
         "devices": [],
+        "platforms": {Platform.COVER},
     }
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN][mock_config_entry.entry_id] = hass_domain
@@ -203,7 +410,7 @@ async def test_async_setup_unload_entry(
     result = await async_unload_entry(hass, mock_config_entry)
 
     assert result
-    assert mock_unload_platforms.call_count == 1
+    mock_unload_platforms.assert_called_once_with(mock_config_entry, [Platform.COVER])
     assert not hass.data[DOMAIN]
 
 async def test_async_setup_unload_entry_false(
@@ -211,9 +418,10 @@ async def test_async_setup_unload_entry_false(
 
     mock_unload_platforms.return_value = False
     hass_domain = {
-        "client": Mock(),
+        "gateway": Mock(),
         "coordinator": Mock(),
         "devices": [],
+        "platforms": {Platform.COVER},
     }
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN][mock_config_entry.entry_id] = hass_domain
@@ -224,6 +432,107 @@ async def test_async_setup_unload_entry_false(
     assert mock_unload_platforms.call_count == 1
     assert hass.data[DOMAIN][mock_config_entry.entry_id] == hass_domain
 
+async def test_async_refresh_devices_new_devices(
+        hass: HomeAssistant, mock_gateway: Mock, mock_config_entry: MockConfigEntry,
+        mock_forward_entry_setups: AsyncMock) -> None:
+    device_cosmo = {"id": "0", "name": "Device COSMO", "type": 2}
+    device_senso = {"id": "1", "name": "Device SENSO", "type": 1}
+    device_switch = {"id": "2", "name": "Device SWITCH", "type": 5}
+
+    mock_gateway.async_call.return_value = [{"devices": [device_cosmo, device_senso, device_switch]}]
+    mock_coordinator = Mock()
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": mock_gateway,
+            "coordinator": mock_coordinator,
+            "devices": [device_cosmo],
+            "platforms": {Platform.COVER},
+        },
+    }
+    mock_dispatcher = Mock()
+    async_dispatcher_connect(hass, SIGNAL_NEW_DEVICES.format(mock_config_entry.entry_id), mock_dispatcher)
+
+    await async_refresh_devices(hass, mock_config_entry)
+
+    mock_dispatcher.assert_called_once_with([device_senso, device_switch])
+    mock_forward_entry_setups.assert_called_once_with(mock_config_entry, [Platform.SWITCH])
+    assert hass.data[DOMAIN][mock_config_entry.entry_id]["devices"] == [device_cosmo, device_senso, device_switch]
+    assert hass.data[DOMAIN][mock_config_entry.entry_id]["platforms"] == {Platform.COVER, Platform.SWITCH}
+    assert mock_coordinator.device_types == {"0": 2, "1": 1, "2": 5}
+
+async def test_async_refresh_devices_unchanged(
+        hass: HomeAssistant, mock_gateway: Mock, mock_config_entry: MockConfigEntry,
+        mock_forward_entry_setups: AsyncMock) -> None:
+    device_cosmo = {"id": "0", "name": "Device COSMO", "type": 2}
+
+    mock_gateway.async_call.return_value = [{"devices": [device_cosmo]}]
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": mock_gateway,
+            "devices": [device_cosmo],
+            "platforms": {Platform.COVER},
+        },
+    }
+
+    await async_refresh_devices(hass, mock_config_entry)
+
+    assert mock_forward_entry_setups.call_count == 0
+
+async def test_async_refresh_devices_empty(
+        hass: HomeAssistant, mock_gateway: Mock, mock_config_entry: MockConfigEntry,
+        mock_forward_entry_setups: AsyncMock) -> None:
+    device_cosmo = {"id": "0", "name": "Device COSMO", "type": 2}
+
+    mock_gateway.async_call.return_value = []
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": mock_gateway,
+            "devices": [device_cosmo],
+            "platforms": {Platform.COVER},
+        },
+    }
+
+    await async_refresh_devices(hass, mock_config_entry)
+
+    assert mock_forward_entry_setups.call_count == 0
+    assert hass.data[DOMAIN][mock_config_entry.entry_id]["devices"] == [device_cosmo]
+
+async def test_async_refresh_devices_removed_devices(
+        hass: HomeAssistant, mock_gateway: Mock, mock_config_entry: MockConfigEntry) -> None:
+    device_cosmo = {"id": "0", "name": "Device COSMO", "type": 2}
+    device_senso = {"id": "1", "name": "Device SENSO", "type": 1}
+
+    mock_gateway.async_call.return_value = [{"devices": [device_senso]}]
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": mock_gateway,
+            "devices": [device_cosmo, device_senso],
+            "platforms": {Platform.COVER},
+        },
+    }
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as mock_schedule_reload:
+        await async_refresh_devices(hass, mock_config_entry)
+
+    mock_schedule_reload.assert_called_once_with(mock_config_entry.entry_id)
+
+async def test_async_refresh_devices_error(
+        hass: HomeAssistant, mock_gateway: Mock, mock_config_entry: MockConfigEntry, mock_logger: Mock) -> None:
+    mock_gateway.async_call.side_effect = MobilusGatewayTimeoutError("timed out")
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: {
+            "gateway": mock_gateway,
+            "devices": [],
+            "platforms": {Platform.COVER},
+        },
+    }
+
+    await async_refresh_devices(hass, mock_config_entry)
+
+    mock_logger.warning.assert_called_once_with(
+        "Failed to refresh devices list: %s", mock_gateway.async_call.side_effect,
+    )
+
 async def test_async_migrate_entry(
         hass: HomeAssistant, mock_config_entry_v1: MockConfigEntry) -> None:
 
@@ -232,9 +541,38 @@ async def test_async_migrate_entry(
     result = await async_migrate_entry(hass, mock_config_entry_v1)
 
     assert result
+    assert mock_config_entry_v1.version == 3
     assert mock_config_entry_v1.data == {
         "host": "test_host",
         "username": "test_user",
         "password": "test_pass",
+    }
+    assert mock_config_entry_v1.options == {
         "refresh_interval": 600,
     }
+
+async def test_async_migrate_entry_v2(hass: HomeAssistant) -> None:
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data = {
+            "host": "test_host",
+            "username": "test_user",
+            "password": "test_pass",
+            "refresh_interval": 300,
+        },
+    )
+    config_entry.add_to_hass(hass)
+
+    result = await async_migrate_entry(hass, config_entry)
+
+    assert result
+    assert config_entry.version == 3
+    assert config_entry.data == {
+        "host": "test_host",
+        "username": "test_user",
+        "password": "test_pass",
+    }
+    assert config_entry.options == {
+        "refresh_interval": 300,
+    }
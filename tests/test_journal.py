@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.mobilus.journal import MobilusCommandJournal, MobilusJournalEntry
+
+
+def test_journal_add_keeps_latest_per_device() -> None:
+    journal = MobilusCommandJournal()
+
+    journal.add(
+        [
+            ("call_events", {"device_id": "1", "value": "UP"}),
+            ("call_events", {"device_id": "2", "value": "ON"}),
+            ("current_state", {}),
+        ],
+        60,
+    )
+    journal.add([("call_events", {"device_id": "1", "value": "DOWN"})], 60)
+
+    assert len(journal) == 2
+    assert "1" in journal
+    assert {device_id: entry.value for device_id, entry in journal.pop().items()} == {"1": "DOWN", "2": "ON"}
+    assert not journal
+
+def test_journal_discard() -> None:
+    journal = MobilusCommandJournal()
+    journal.add(
+        [
+            ("call_events", {"device_id": "1", "value": "DOWN"}),
+            ("call_events", {"device_id": "2", "value": "DOWN"}),
+        ],
+        60,
+    )
+
+    journal.discard([("call_events", {"device_id": "1", "value": "STOP"}), ("current_state", {})])
+
+    assert "1" not in journal
+    assert "2" in journal
+
+def test_journal_tilt() -> None:
+    journal = MobilusCommandJournal()
+    journal.add([("call_events", {"device_id": "1", "value": "30%"})], 60, ["1"])
+    journal.add([("call_events", {"device_id": "2", "value": "30%"})], 60)
+
+    assert journal.entries["1"].tilt
+    assert not journal.entries["2"].tilt
+
+    # Position command replaces the tilt kept for the device
+    journal.add([("call_events", {"device_id": "1", "value": "DOWN"})], 60)
+
+    assert not journal.entries["1"].tilt
+
+def test_journal_restore_keeps_expiry() -> None:
+    journal = MobilusCommandJournal()
+
+    with patch("time.monotonic", return_value=0):
+        journal.add(
+            [
+                ("call_events", {"device_id": "1", "value": "DOWN"}),
+                ("call_events", {"device_id": "2", "value": "DOWN"}),
+            ],
+            60,
+        )
+        entries = journal.pop()
+
+    # Device commanded again while the replay was in flight keeps its newer command
+    with patch("time.monotonic", return_value=30):
+        journal.add([("call_events", {"device_id": "2", "value": "UP"})], 60)
+        journal.restore(entries)
+
+    assert journal.entries == {
+        "1": MobilusJournalEntry("DOWN", 60),
+        "2": MobilusJournalEntry("UP", 90),
+    }
+
+def test_journal_pop_drops_expired() -> None:
+    journal = MobilusCommandJournal()
+
+    with patch("time.monotonic", return_value=0):
+        journal.add([("call_events", {"device_id": "1", "value": "UP"})], 10)
+        journal.add([("call_events", {"device_id": "2", "value": "UP"})], 60)
+
+    with patch("time.monotonic", return_value=30):
+        assert journal.as_dict() == {
+            "1": {"value": "UP", "expires_in": -20},
+            "2": {"value": "UP", "expires_in": 30},
+        }
+        assert journal.pop() == {"2": MobilusJournalEntry("UP", 60)}
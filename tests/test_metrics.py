@@ -0,0 +1,50 @@
+from custom_components.mobilus.metrics import MobilusGatewayMetrics
+
+
+def test_metrics_record_call() -> None:
+    metrics = MobilusGatewayMetrics()
+
+    metrics.record_call("poll", 1.0)
+    metrics.record_call("poll", 3.0)
+
+    assert metrics.calls["poll"].calls == 2
+    assert metrics.calls["poll"].max_duration == 3.0
+    assert metrics.calls["poll"].average_duration == 2.0
+
+def test_metrics_record_timeout() -> None:
+    metrics = MobilusGatewayMetrics()
+
+    metrics.record_timeout("command")
+
+    assert metrics.calls["command"].timeouts == 1
+    assert metrics.calls["command"].average_duration is None
+
+def test_metrics_as_dict() -> None:
+    metrics = MobilusGatewayMetrics()
+
+    metrics.record_call("poll", 2.0)
+    metrics.record_timeout("poll")
+
+    assert metrics.as_dict() == {
+        "calls": {
+            "poll": {
+                "calls": 1,
+                "timeouts": 1,
+                "total_duration": 2.0,
+                "max_duration": 2.0,
+                "average_duration": 2.0,
+            },
+        },
+        "sessions": {},
+    }
+
+def test_metrics_record_session() -> None:
+    metrics = MobilusGatewayMetrics()
+
+    metrics.record_session("command", warm=False, duration=3.0)
+    metrics.record_session("command", warm=True, duration=0.5)
+    metrics.record_session("command", warm=True, duration=1.5)
+
+    assert metrics.sessions["command_cold"].average_duration == 3.0
+    assert metrics.sessions["command_warm"].calls == 2
+    assert metrics.sessions["command_warm"].average_duration == 1.0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from custom_components.mobilus.multiplexer import MobilusGroupResponse, route_responses, unique_commands
+
+
+def test_unique_commands() -> None:
+    commands = [
+        ("current_state", {}),
+        ("call_events", {"device_id": "1", "value": "UP"}),
+        ("current_state", {}),
+        ("call_events", {"device_id": "1", "value": "UP"}),
+        ("call_events", {"device_id": "1", "value": "DOWN"}),
+    ]
+
+    assert unique_commands(commands) == [
+        ("current_state", {}),
+        ("call_events", {"device_id": "1", "value": "UP"}),
+        ("call_events", {"device_id": "1", "value": "DOWN"}),
+    ]
+
+def test_route_responses() -> None:
+    commands = [
+        ("call_events", {"device_id": "1", "value": "UP"}),
+        ("current_state", {}),
+        ("devices_list", {}),
+        ("call_events", {"device_id": "2", "value": "DOWN"}),
+    ]
+    state = {"events": [{"deviceId": "1", "value": "UP", "eventNumber": 8}, {"deviceId": "2", "value": "0%"}]}
+    devices = {"devices": [{"id": "1"}, {"id": "2"}]}
+    echo_1 = {"events": [{"deviceId": "1", "value": "UP", "eventNumber": 6}]}
+    echo_2 = {"events": [{"deviceId": "2", "value": "DOWN", "eventNumber": 6}]}
+
+    # Responses arrive in any order
+    group_response = MobilusGroupResponse(
+        [echo_2, state, echo_1, devices], route_responses(commands, [echo_2, state, echo_1, devices]),
+    )
+
+    assert group_response.for_commands([("call_events", {"device_id": "1", "value": "UP"})]) == [echo_1]
+    assert group_response.for_commands([("call_events", {"device_id": "2", "value": "DOWN"})]) == [echo_2]
+    assert group_response.for_commands([("current_state", {}), ("current_state", {})]) == [state]
+    assert group_response.for_commands([("devices_list", {}), ("current_state", {})]) == [devices, state]
+
+def test_route_responses_missing() -> None:
+    commands = [("call_events", {"device_id": "1", "value": "UP"}), ("call_events", {"device_id": "2", "value": "UP"})]
+    echo = {"events": [{"deviceId": "1", "value": "UP", "eventNumber": 6}]}
+    group_response = MobilusGroupResponse([echo], route_responses(commands, [echo]))
+
+    assert group_response.for_commands([commands[1]]) == []
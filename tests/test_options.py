@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.device import MobilusDevice
+from custom_components.mobilus.gateway import MobilusCallKind
+from custom_components.mobilus.options import MobilusOptions
+
+
+def test_options_from_entry_defaults(mock_config_entry: MockConfigEntry) -> None:
+    options = MobilusOptions.from_entry(mock_config_entry)
+
+    assert options == MobilusOptions()
+    assert options.refresh_interval == 600
+    assert options.settle_delay == 15
+    assert MobilusDevice.CGR in options.priority_device_types
+    assert MobilusDevice.SWITCH not in options.priority_device_types
+
+def test_options_from_entry() -> None:
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        options={
+            "refresh_interval": 300,
+            "active_refresh_interval": 5,
+            "settle_delay": 3.5,
+            "batch_window": 0.5,
+            "max_concurrent_requests": 4,
+            "command_timeout": 10,
+            "poll_timeout": 20,
+            "devices_list_timeout": 40,
+            "priority_device_types": ["SENSO", "SWITCH"],
+            "command_journal_ttl": 300,
+            "motion_write_interval": 2,
+        },
+    )
+
+    options = MobilusOptions.from_entry(config_entry)
+
+    assert options == MobilusOptions(
+        refresh_interval=300,
+        active_refresh_interval=5,
+        settle_delay=3.5,
+        batch_window=0.5,
+        max_concurrent_requests=4,
+        command_timeout=10,
+        poll_timeout=20,
+        devices_list_timeout=40,
+        priority_device_types=frozenset({MobilusDevice.SENSO, MobilusDevice.SWITCH}),
+        command_journal_ttl=300,
+        motion_write_interval=2,
+    )
+
+def test_options_timeouts() -> None:
+    options = MobilusOptions(command_timeout=10, poll_timeout=20, devices_list_timeout=40)
+
+    assert options.timeouts == {
+        MobilusCallKind.COMMAND: 10,
+        MobilusCallKind.DEVICES_LIST: 40,
+        MobilusCallKind.POLL: 20,
+    }
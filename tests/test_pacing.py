@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.mobilus.const import PACING_MAX_BURST, PACING_MAX_GAP, PACING_MIN_GAP
+from custom_components.mobilus.device_state import MobilusDeviceState
+from custom_components.mobilus.pacing import MobilusPacing, is_acknowledged
+
+
+def test_pacing_adapt() -> None:
+    pacing = MobilusPacing(burst=4, gap=0.5)
+
+    pacing.adapt(8, 0)
+
+    assert pacing.burst == 5
+    assert pacing.gap == 0.25
+
+    pacing.adapt(8, 3)
+
+    assert pacing.burst == 2
+    assert pacing.gap == 0.5
+    assert pacing.acknowledged == 13
+    assert pacing.lost == 3
+
+def test_pacing_adapt_limits() -> None:
+    pacing = MobilusPacing(burst=PACING_MAX_BURST, gap=PACING_MIN_GAP)
+
+    pacing.adapt(1, 0)
+
+    assert pacing.burst == PACING_MAX_BURST
+    assert pacing.gap == PACING_MIN_GAP
+
+    pacing = MobilusPacing(burst=1, gap=PACING_MAX_GAP)
+
+    pacing.adapt(1, 1)
+
+    assert pacing.burst == 1
+    assert pacing.gap == PACING_MAX_GAP
+
+@pytest.mark.parametrize(
+    ("value", "event", "acknowledged"),
+    [
+        ("UP", None, False),
+        ("UP", {"value": "20%", "event_number": 7}, True),
+        ("UP", {"value": "UP", "event_number": 8}, True),
+        ("UP", {"value": "100%", "event_number": 8}, True),
+        ("UP", {"value": "DOWN", "event_number": 8}, False),
+        ("DOWN", {"value": "0%:20$", "event_number": 8}, True),
+        ("50%", {"value": "50%", "event_number": 8}, True),
+        ("50%", {"value": "20%", "event_number": 8}, False),
+        ("ON", {"value": "ON", "event_number": 8}, True),
+        ("STOP", {"value": "20%", "event_number": 7}, False),
+        ("STOP", {"value": "20%", "event_number": 8}, True),
+    ],
+)
+def test_is_acknowledged(value: str, event: dict[str, Any] | None, acknowledged: bool) -> None: # noqa: FBT001
+    device_state = None if event is None else MobilusDeviceState(device_id="0", **event)
+
+    assert is_acknowledged(value, device_state) is acknowledged
+
+@pytest.mark.parametrize(
+    ("value", "event", "acknowledged"),
+    [
+        ("30%", {"value": "UP:30$", "event_number": 8}, True),
+        ("30%", {"value": "30%:0$", "event_number": 8}, False),
+        ("0%", {"value": "DOWN:0$", "event_number": 8}, True),
+        ("30%", {"value": "20%", "event_number": 7}, True),
+    ],
+)
+def test_is_acknowledged_tilt(value: str, event: dict[str, Any], acknowledged: bool) -> None: # noqa: FBT001
+    device_state = MobilusDeviceState(device_id="0", **event)
+
+    assert is_acknowledged(value, device_state, tilt=True) is acknowledged
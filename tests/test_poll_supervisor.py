@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.mobilus.const import DATA_POLL_SUPERVISOR
+from custom_components.mobilus.coordinator import MobilusCoordinator
+from custom_components.mobilus.options import MobilusOptions
+from custom_components.mobilus.poll_supervisor import MobilusPollSupervisor, async_get_poll_supervisor
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+
+@pytest.fixture(autouse=True)
+def mock_jitter() -> Generator[None, None, None]:
+    with patch("random.uniform", return_value=1.0):
+        yield
+
+def test_async_get_poll_supervisor(hass: HomeAssistant) -> None:
+    supervisor = async_get_poll_supervisor(hass)
+
+    assert async_get_poll_supervisor(hass) is supervisor
+    assert hass.data[DATA_POLL_SUPERVISOR] is supervisor
+
+async def test_poll_supervisor_register(hass: HomeAssistant, gateway: MobilusGateway) -> None:
+    supervisor = MobilusPollSupervisor(2)
+    coordinators = [
+        MobilusCoordinator(hass, gateway, MobilusOptions(refresh_interval=600), {}) for _ in range(3)
+    ]
+
+    with patch.object(MobilusCoordinator, "async_schedule_phase_refresh") as mock_phase_refresh:
+        unregister = supervisor.async_register("entry0", coordinators[0])
+        supervisor.async_register("entry1", coordinators[1])
+
+    # Phase only shifts the first refresh, the refresh interval is left as it is
+    assert coordinators[0].update_interval == datetime.timedelta(seconds=600)
+    assert supervisor.slots["entry1"].phase == pytest.approx(600 * 0.618033988749895 + 1)
+
+    # State fetched at setup already serves the first slot, only the second one refreshes at its phase
+    mock_phase_refresh.assert_called_once_with(supervisor.slots["entry1"].phase)
+
+    # Index of a removed entry is taken by the next one
+    unregister()
+    supervisor.async_register("entry2", coordinators[2])
+
+    assert supervisor.slots["entry2"].index == 0
+    assert supervisor.as_dict()["entries"]["entry2"] == {"index": 0, "phase": 1.0, "update_interval": 600.0}
+
+async def test_poll_supervisor_async_poll() -> None:
+    supervisor = MobilusPollSupervisor(2)
+    running = []
+
+    async def poll() -> None:
+        async with supervisor.async_poll():
+            running.append(supervisor.running)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(poll() for _ in range(5)))
+
+    assert max(running) == 2
+    assert supervisor.running == 0
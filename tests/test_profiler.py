@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.coordinator import MobilusCoordinator
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.options import MobilusOptions
+from custom_components.mobilus.profiler import async_profile
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+
+async def test_async_profile_polls(hass: HomeAssistant, gateway: MobilusGateway, tmp_path: Path) -> None:
+    hass.config.config_dir = str(tmp_path)
+    coordinator = MobilusCoordinator(hass, gateway, MobilusOptions(), {})
+    gateway.metrics.record_call("poll", 1.0)
+
+    hass.data[DOMAIN] = {
+        "entry_id": {
+            "gateway": gateway,
+            "coordinator": coordinator,
+        },
+    }
+
+    task = hass.async_create_task(async_profile(hass, 60, 2))
+    await asyncio.sleep(0)
+
+    for value in ("UP", "DOWN"):
+        gateway.metrics.record_call("poll", 0.5)
+        coordinator.async_set_updated_data(
+            MobilusDeviceStateList({"0": MobilusDeviceState(device_id="0", event_number=8, value=value)}),
+        )
+
+    response = await task
+    profile_exists, summary = _read_report(response)
+
+    assert profile_exists
+    assert "2 coordinator updates" in summary
+    assert "Gateway calls: 2, time waiting on client call: 1.000 seconds" in summary
+    assert not coordinator._listeners # noqa: SLF001
+
+async def test_async_profile_seconds(hass: HomeAssistant, gateway: MobilusGateway, tmp_path: Path) -> None:
+    hass.config.config_dir = str(tmp_path)
+
+    hass.data[DOMAIN] = {
+        "entry_id": {
+            "gateway": gateway,
+            "coordinator": MobilusCoordinator(hass, gateway, MobilusOptions(), {}),
+        },
+    }
+
+    response = await async_profile(hass, 0.01, None)
+    _profile_exists, summary = _read_report(response)
+
+    assert "0 coordinator updates" in summary
+
+async def test_async_profile_no_entries(hass: HomeAssistant) -> None:
+    with pytest.raises(HomeAssistantError):
+        await async_profile(hass, 1, None)
+
+def _read_report(response: dict[str, str]) -> tuple[bool, str]:
+    return Path(response["profile"]).is_file(), Path(response["summary"]).read_text(encoding="utf-8")
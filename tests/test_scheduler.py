@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import Context
+
+from custom_components.mobilus.scheduler import MobilusCallPriority, MobilusScheduler, command_priority
+
+
+async def test_scheduler_priority_order() -> None:
+    scheduler = MobilusScheduler(1)
+    started: list[MobilusCallPriority] = []
+
+    async def async_run(priority: MobilusCallPriority) -> None:
+        await scheduler.async_acquire(priority)
+        started.append(priority)
+        scheduler.release()
+
+    await scheduler.async_acquire(MobilusCallPriority.POLL)
+
+    tasks = [
+        asyncio.create_task(async_run(priority))
+        for priority in (
+            MobilusCallPriority.POLL,
+            MobilusCallPriority.BULK,
+            MobilusCallPriority.INTERACTIVE,
+            MobilusCallPriority.STOP,
+            MobilusCallPriority.INTERACTIVE,
+        )
+    ]
+    await asyncio.sleep(0)
+
+    assert scheduler.waiting == 5
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert started == [
+        MobilusCallPriority.STOP,
+        MobilusCallPriority.INTERACTIVE,
+        MobilusCallPriority.INTERACTIVE,
+        MobilusCallPriority.BULK,
+        MobilusCallPriority.POLL,
+    ]
+    assert scheduler.active == 0
+
+async def test_scheduler_cancelled_waiter() -> None:
+    scheduler = MobilusScheduler(1)
+    await scheduler.async_acquire(MobilusCallPriority.POLL)
+
+    cancelled = asyncio.create_task(scheduler.async_acquire(MobilusCallPriority.STOP))
+    waiting = asyncio.create_task(scheduler.async_acquire(MobilusCallPriority.BULK))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    scheduler.release()
+    await waiting
+
+    assert scheduler.active == 1
+    assert scheduler.waiting == 0
+
+async def test_scheduler_set_slots() -> None:
+    scheduler = MobilusScheduler(1)
+    await scheduler.async_acquire(MobilusCallPriority.POLL)
+
+    waiting = asyncio.create_task(scheduler.async_acquire(MobilusCallPriority.POLL))
+    await asyncio.sleep(0)
+    scheduler.set_slots(2)
+    await waiting
+
+    assert scheduler.active == 2
+
+def test_command_priority() -> None:
+    assert command_priority(None) is MobilusCallPriority.BULK
+    assert command_priority(Context()) is MobilusCallPriority.BULK
+    assert command_priority(Context(user_id="user")) is MobilusCallPriority.INTERACTIVE
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+from custom_components.mobilus.session import MobilusSession
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+import pytest
+
+
+@pytest.fixture
+def mock_ready_client(mock_session_client: Mock) -> Mock:
+    mock_session_client.connect_and_authenticate.return_value = True
+    # Attributes assigned in the client constructor are not part of the autospec
+    mock_session_client.authenticated_event = Mock()
+    mock_session_client.completed_event = Mock()
+    mock_session_client.message_registry = Mock()
+    mock_session_client.mqtt_client = Mock()
+    mock_session_client.authenticated_event.is_set.return_value = True
+    mock_session_client.mqtt_client.is_connected.return_value = True
+    return mock_session_client
+
+@pytest.fixture
+def mock_serializer() -> Generator[Mock, None, None]:
+    with patch("mobilus_client.messages.serializer.MessageSerializer.serialize_list_to_json") as mock_serialize:
+        mock_serialize.side_effect = json.dumps
+        yield mock_serialize
+
+def test_session_connect_failed(mock_session_client: Mock) -> None:
+    session = MobilusSession()
+
+    assert session.connect(Mock()) is False
+    assert session.is_ready is False
+    mock_session_client.terminate.assert_called_once()
+    assert session.call([("current_state", {})], 1) is None
+
+def test_session_connect_error(mock_session_client: Mock) -> None:
+    mock_session_client.connect_and_authenticate.side_effect = ConnectionRefusedError("refused")
+    session = MobilusSession()
+
+    assert session.connect(Mock()) is False
+    mock_session_client.terminate.assert_called_once()
+
+@pytest.mark.usefixtures("mock_serializer")
+def test_session_call(mock_ready_client: Mock) -> None:
+    session = MobilusSession()
+
+    assert session.connect(Mock()) is True
+    assert session.is_ready is True
+
+    mock_ready_client.completed_event.is_set.return_value = True
+    mock_ready_client.message_registry.get_responses.return_value = [{"events": []}]
+
+    with patch("mobilus_client.registries.message.MessageRegistry", return_value=mock_ready_client.message_registry):
+        response = session.call([("current_state", {})], 1)
+
+    assert response == json.dumps([{"events": []}])
+    mock_ready_client.send_request.assert_called_once_with("current_state")
+    mock_ready_client.completed_event.wait.assert_called_once_with(timeout=1)
+    mock_ready_client.terminate.assert_not_called()
+
+@pytest.mark.usefixtures("mock_serializer")
+def test_session_call_not_completed(mock_ready_client: Mock) -> None:
+    session = MobilusSession()
+    session.connect(Mock())
+
+    mock_ready_client.completed_event.is_set.return_value = False
+
+    with patch("mobilus_client.registries.message.MessageRegistry", return_value=mock_ready_client.message_registry):
+        mock_ready_client.message_registry.get_responses.return_value = []
+        assert session.call([("current_state", {})], 1) == "[]"
+
+    # Session that stopped responding is closed
+    mock_ready_client.terminate.assert_called_once()
+    assert session.is_ready is False
+
+def test_session_call_busy(mock_ready_client: Mock) -> None: # noqa: ARG001
+    session = MobilusSession()
+    session.connect(Mock())
+
+    with session._lock: # noqa: SLF001
+        assert session.call([("current_state", {})], 1) is None
+
+def test_session_close(mock_ready_client: Mock) -> None:
+    session = MobilusSession()
+    session.connect(Mock())
+    session.close()
+
+    mock_ready_client.terminate.assert_called_once()
+    assert session.is_ready is False
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.mobilus.gateway import MobilusCallKind
+from custom_components.mobilus.spans import correlate, correlation_id, span
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+SPANS_LOGGER = "custom_components.mobilus.spans"
+
+
+def test_span_disabled(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO, logger=SPANS_LOGGER)
+
+    with correlate("command"), span("command", device_id="1"):
+        assert correlation_id.get() is None
+
+    assert not caplog.records
+
+def test_span(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.DEBUG, logger=SPANS_LOGGER)
+
+    with correlate("command"):
+        command_id = correlation_id.get()
+
+        # Nested operations keep the outer correlation id
+        with correlate("poll"), span("command", device_id="1"):
+            assert correlation_id.get() == command_id
+
+    assert correlation_id.get() is None
+    assert command_id is not None
+    assert command_id.startswith("command-")
+
+    record = caplog.records[0]
+
+    assert record.mobilus_span == "command"
+    assert record.mobilus_correlation_id == command_id
+    assert record.mobilus_attributes == {"device_id": "1"}
+    assert record.mobilus_error is None
+    assert record.mobilus_duration >= 0
+
+def test_span_error(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.DEBUG, logger=SPANS_LOGGER)
+
+    with pytest.raises(ValueError, match="failed"), span("snapshot_build"):
+        raise ValueError("failed") # noqa: EM101
+
+    assert caplog.records[0].mobilus_error == "ValueError"
+
+async def test_span_gateway_call(
+        caplog: pytest.LogCaptureFixture, mock_client: Mock, gateway: MobilusGateway) -> None:
+    caplog.set_level(logging.DEBUG, logger=SPANS_LOGGER)
+    mock_client.call.return_value = json.dumps([{"events": []}])
+
+    with correlate("poll"):
+        command_id = correlation_id.get()
+        await gateway.async_call([("current_state", {})], MobilusCallKind.POLL)
+
+    spans = {record.mobilus_span: record.mobilus_correlation_id for record in caplog.records}
+
+    assert spans == {"queue_wait": command_id, "round_trip": command_id, "json_decode": command_id}
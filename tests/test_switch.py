@@ -4,8 +4,11 @@ from typing import TYPE_CHECKING
 from unittest.mock import Mock, patch
 
 import pytest
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.const import DOMAIN, SIGNAL_NEW_DEVICES
+from custom_components.mobilus.gateway import MobilusCallKind
+from custom_components.mobilus.scheduler import MobilusCallPriority
 from custom_components.mobilus.switch import MobilusSwitch, async_setup_entry
 
 if TYPE_CHECKING:
@@ -18,7 +21,7 @@ def mock_async_add_entities() -> Mock:
 
 async def test_async_setup_entry(
     hass: HomeAssistant,
-    mock_client: Mock,
+    mock_gateway: Mock,
     mock_coordinator: Mock,
     mock_config_entry: MockConfigEntry,
     mock_async_add_entities: Mock,
@@ -41,7 +44,7 @@ async def test_async_setup_entry(
 
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN][mock_config_entry.entry_id] = {
-        "client": mock_client,
+        "gateway": mock_gateway,
         "coordinator": mock_coordinator,
         "devices": [
             device_cosmo,
@@ -54,48 +57,72 @@ async def test_async_setup_entry(
 
     assert mock_async_add_entities.call_with(
         [
-            MobilusSwitch(device_switch, mock_client, mock_coordinator),
-            MobilusSwitch(device_switch_np, mock_client, mock_coordinator),
+            MobilusSwitch(device_switch, mock_gateway, mock_coordinator),
+            MobilusSwitch(device_switch_np, mock_gateway, mock_coordinator),
         ],
     )
 
 
-def test_switch_init(mock_client: Mock, mock_coordinator: Mock) -> None:
+async def test_async_setup_entry_new_devices(
+        hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
+        mock_config_entry: MockConfigEntry, mock_async_add_entities: Mock) -> None:
+    hass.data[DOMAIN] = {}
+    hass.data[DOMAIN][mock_config_entry.entry_id] = {
+        "gateway": mock_gateway,
+        "coordinator": mock_coordinator,
+        "devices": [],
+    }
+
+    await async_setup_entry(hass, mock_config_entry, mock_async_add_entities)
+
+    async_dispatcher_send(
+        hass,
+        SIGNAL_NEW_DEVICES.format(mock_config_entry.entry_id),
+        [{"id": "5", "name": "Device SWITCH", "type": 5}, {"id": "6", "name": "Device UNKNOWN", "type": 11}],
+    )
+
+    assert mock_async_add_entities.call_count == 2
+    entities = mock_async_add_entities.call_args[0][0]
+    assert len(entities) == 1
+    assert isinstance(entities[0], MobilusSwitch)
+    assert entities[0].device["id"] == "5"
+
+def test_switch_init(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert switch.coordinator == mock_coordinator
     assert switch.device == device
-    assert switch.client == mock_client
+    assert switch.gateway == mock_gateway
 
 
-def test_switch_unique_id(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_unique_id(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert switch.unique_id == "mobilus_3"
 
 
-def test_switch_name(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_name(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert switch.name == "Test Switch"
 
 
-def test_switch_is_on_true(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_is_on_true(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.is_on = True
     mock_coordinator.data.devices = {
@@ -107,12 +134,12 @@ def test_switch_is_on_true(mock_client: Mock, mock_coordinator: Mock) -> None:
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert switch.is_on
 
 
-def test_switch_is_on_false(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_is_on_false(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     device_status = Mock()
     device_status.is_on = False
     mock_coordinator.data.devices = {
@@ -124,12 +151,12 @@ def test_switch_is_on_false(mock_client: Mock, mock_coordinator: Mock) -> None:
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert not switch.is_on
 
 
-def test_switch_is_on_no_device_status(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_is_on_no_device_status(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     mock_coordinator.data.devices = {}
 
     device = {
@@ -137,12 +164,12 @@ def test_switch_is_on_no_device_status(mock_client: Mock, mock_coordinator: Mock
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert not switch.is_on
 
 
-def test_switch_is_on_none_device_status(mock_client: Mock, mock_coordinator: Mock) -> None:
+def test_switch_is_on_none_device_status(mock_gateway: Mock, mock_coordinator: Mock) -> None:
     mock_coordinator.data.devices = {
         "3": None,
     }
@@ -152,67 +179,110 @@ def test_switch_is_on_none_device_status(mock_client: Mock, mock_coordinator: Mo
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
 
     assert not switch.is_on
 
 
+def test_switch_extra_state_attributes(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.watchdog.stale = {"3": 0.0}
+
+    device = {
+        "id": "3",
+        "name": "Test Switch",
+        "type": 5,
+    }
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
+
+    assert switch.extra_state_attributes == {"stale": True}
+
+
 async def test_switch_async_turn_on(
-    hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock,
+    hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
 ) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
     switch.hass = hass
 
     await switch.async_turn_on()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "ON"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.verifier.async_track.assert_called_once_with(device, "ON", MobilusCallPriority.BULK)
+    mock_coordinator.watchdog.async_track.assert_called_once_with("3", "ON")
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
 
 
 async def test_switch_async_turn_off(
-    hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock,
+    hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
 ) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
     switch.hass = hass
 
     await switch.async_turn_off()
 
-    mock_client.call.assert_called_once_with(
+    mock_gateway.async_call.assert_called_once_with(
         [("call_events", {"device_id": "3", "value": "OFF"})],
+        MobilusCallKind.COMMAND,
+        MobilusCallPriority.BULK,
     )
-    mock_coordinator.async_request_refresh.assert_called_once()
+    mock_coordinator.async_request_device_refresh.assert_called_once_with(["3"])
 
 
 async def test_switch_async_added_to_hass(
-    hass: HomeAssistant, mock_client: Mock, mock_coordinator: Mock,
+    hass: HomeAssistant, mock_gateway: Mock, mock_coordinator: Mock,
 ) -> None:
     device = {
         "id": "3",
         "name": "Test Switch",
         "type": 5,
     }
-    switch = MobilusSwitch(device, mock_client, mock_coordinator)
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
     switch.hass = hass
 
     with patch.object(switch, "async_on_remove", new=Mock()) as mock_async_on_remove:
         await switch.async_added_to_hass()
 
-        mock_coordinator.async_add_listener.assert_called_once_with(
-            switch.async_write_ha_state,
+        mock_coordinator.async_add_device_listener.assert_called_once_with(
+            switch._handle_coordinator_update, ["3"], # noqa: SLF001
         )
         mock_async_on_remove.assert_called_once_with(
-            mock_coordinator.async_add_listener.return_value,
+            mock_coordinator.async_add_device_listener.return_value,
         )
 
+
+def test_switch_handle_coordinator_update(mock_gateway: Mock, mock_coordinator: Mock) -> None:
+    mock_coordinator.data.devices = {}
+
+    device = {
+        "id": "3",
+        "name": "Test Switch",
+        "type": 5,
+    }
+    switch = MobilusSwitch(device, mock_gateway, mock_coordinator)
+
+    assert not switch.is_on
+
+    device_status = Mock()
+    device_status.is_on = True
+    mock_coordinator.data.devices = {
+        "3": device_status,
+    }
+
+    with patch.object(switch, "async_write_ha_state") as mock_async_write_ha_state:
+        switch._handle_coordinator_update() # noqa: SLF001
+
+    mock_async_write_ha_state.assert_called_once()
+    assert switch.is_on
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.mobilus.throttle import MobilusWriteThrottle
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+async def test_write_throttle_settled(hass: HomeAssistant) -> None:
+    write = Mock()
+    throttle = MobilusWriteThrottle(hass)
+
+    throttle.async_write(write, moving=False, interval=5.0)
+    throttle.async_write(write, moving=False, interval=5.0)
+
+    assert write.call_count == 2
+
+async def test_write_throttle_disabled(hass: HomeAssistant) -> None:
+    write = Mock()
+    throttle = MobilusWriteThrottle(hass)
+
+    throttle.async_write(write, moving=True, interval=0.0)
+    throttle.async_write(write, moving=True, interval=0.0)
+
+    assert write.call_count == 2
+
+async def test_write_throttle_moving(hass: HomeAssistant) -> None:
+    write = Mock()
+    throttle = MobilusWriteThrottle(hass)
+
+    with patch("custom_components.mobilus.throttle.time.monotonic", return_value=100.0):
+        throttle.async_write(write, moving=True, interval=5.0)
+        throttle.async_write(write, moving=True, interval=5.0)
+        throttle.async_write(write, moving=True, interval=5.0)
+
+    # First position is written, the following ones are coalesced into one deferred write
+    assert write.call_count == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    assert write.call_count == 2
+
+    with patch("custom_components.mobilus.throttle.time.monotonic", return_value=120.0):
+        throttle.async_write(write, moving=True, interval=5.0)
+
+    assert write.call_count == 3
+
+async def test_write_throttle_settled_cancels_deferred_write(hass: HomeAssistant) -> None:
+    write = Mock()
+    throttle = MobilusWriteThrottle(hass)
+
+    with patch("custom_components.mobilus.throttle.time.monotonic", return_value=100.0):
+        throttle.async_write(write, moving=True, interval=5.0)
+        throttle.async_write(write, moving=True, interval=5.0)
+        throttle.async_write(write, moving=False, interval=5.0)
+
+    assert write.call_count == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    assert write.call_count == 2
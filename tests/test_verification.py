@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from custom_components.mobilus.const import DOMAIN, EVENT_COMMAND_FAILED, VERIFICATION_TIMEOUT
+from custom_components.mobilus.coordinator import MobilusCoordinator
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.options import MobilusOptions
+from custom_components.mobilus.scheduler import MobilusCallPriority
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+DEVICE = {"id": "0", "name": "Device SENSO", "type": 1}
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, gateway: MobilusGateway) -> MobilusCoordinator:
+    return MobilusCoordinator(hass, gateway, MobilusOptions(), {"0": 1})
+
+async def test_verifier_confirm(coordinator: MobilusCoordinator) -> None:
+    verifier = coordinator.verifier
+    verifier.async_track(DEVICE, "UP", MobilusCallPriority.INTERACTIVE)
+
+    coordinator.async_set_updated_data(
+        MobilusDeviceStateList({"0": MobilusDeviceState(device_id="0", event_number=8, value="DOWN")}),
+    )
+
+    assert "0" in verifier.pending
+
+    coordinator.async_set_updated_data(
+        MobilusDeviceStateList({"0": MobilusDeviceState(device_id="0", event_number=7, value="50%")}),
+    )
+
+    assert not verifier.pending
+    assert verifier.stats["0"].sent == 1
+    assert verifier.stats["0"].confirmed == 1
+    assert verifier.as_dict()["0"]["success_rate"] == 1.0
+
+async def test_verifier_superseded(coordinator: MobilusCoordinator) -> None:
+    verifier = coordinator.verifier
+    verifier.async_track(DEVICE, "UP", MobilusCallPriority.INTERACTIVE)
+    verifier.async_track(DEVICE, "DOWN", MobilusCallPriority.INTERACTIVE)
+
+    assert verifier.pending["0"].value == "DOWN"
+    assert verifier.stats["0"].sent == 2
+
+    verifier.async_cancel()
+
+    assert not verifier.pending
+
+async def test_verifier_resend_and_fail(
+        hass: HomeAssistant, mock_client: Mock, coordinator: MobilusCoordinator) -> None:
+    mock_client.call.return_value = json.dumps([{"events": [{"deviceId": "0", "value": "DOWN", "eventNumber": 8}]}])
+    events = async_capture_events(hass, EVENT_COMMAND_FAILED)
+    verifier = coordinator.verifier
+    verifier.async_track(DEVICE, "UP", MobilusCallPriority.INTERACTIVE)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=VERIFICATION_TIMEOUT + 1))
+    await hass.async_block_till_done()
+
+    assert verifier.stats["0"].resent == 1
+    mock_client.call.assert_any_call([("call_events", {"device_id": "0", "value": "UP"})])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2 * VERIFICATION_TIMEOUT + 2))
+    await hass.async_block_till_done()
+
+    assert not verifier.pending
+    assert verifier.stats["0"].failed == 1
+    assert verifier.as_dict()["0"]["success_rate"] == 0.0
+    assert events[0].data == {"device_id": "0", "name": "Device SENSO", "value": "UP"}
+    assert ir.async_get(hass).async_get_issue(DOMAIN, "command_failed_0") is not None
+
+    # Confirmed command removes the issue
+    verifier.async_track(DEVICE, "DOWN", MobilusCallPriority.INTERACTIVE)
+    verifier.async_check(
+        MobilusDeviceStateList({"0": MobilusDeviceState(device_id="0", event_number=8, value="DOWN")}),
+    )
+
+    assert ir.async_get(hass).async_get_issue(DOMAIN, "command_failed_0") is None
+
+async def test_verifier_timeout_shared_refresh(hass: HomeAssistant, coordinator: MobilusCoordinator) -> None:
+    verifier = coordinator.verifier
+
+    for device_id in ("0", "1", "2"):
+        verifier.async_track(
+            {"id": device_id, "name": f"Device {device_id}", "type": 1}, "UP", MobilusCallPriority.INTERACTIVE,
+        )
+
+    with patch.object(coordinator, "async_refresh") as mock_refresh, patch.object(coordinator.gateway, "async_call"):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=VERIFICATION_TIMEOUT + 1))
+        await hass.async_block_till_done()
+
+    # Commands timing out together are checked with a single refresh
+    mock_refresh.assert_called_once()
+    assert all(verifier.stats[device_id].resent == 1 for device_id in ("0", "1", "2"))
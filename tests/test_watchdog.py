@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.mobilus.const import WATCHDOG_STALE_POLLS
+from custom_components.mobilus.coordinator import MobilusCoordinator
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.options import MobilusOptions
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, gateway: MobilusGateway) -> MobilusCoordinator:
+    coordinator = MobilusCoordinator(hass, gateway, MobilusOptions(), {"0": 1})
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_set_updated_data(_snapshot(8, "DOWN"))
+    return coordinator
+
+def _snapshot(event_number: int, value: str) -> MobilusDeviceStateList:
+    return MobilusDeviceStateList({"0": MobilusDeviceState(device_id="0", event_number=event_number, value=value)})
+
+async def test_watchdog_state_changed(coordinator: MobilusCoordinator) -> None:
+    watchdog = coordinator.watchdog
+    watchdog.async_track("0", "UP")
+
+    assert "0" in watchdog.watched
+
+    coordinator.async_set_updated_data(_snapshot(7, "50%"))
+
+    assert not watchdog.watched
+    assert not watchdog.stale
+
+async def test_watchdog_already_in_state(coordinator: MobilusCoordinator) -> None:
+    watchdog = coordinator.watchdog
+    watchdog.async_track("0", "DOWN")
+
+    assert not watchdog.watched
+
+async def test_watchdog_recovery(hass: HomeAssistant, coordinator: MobilusCoordinator) -> None:
+    watchdog = coordinator.watchdog
+    watchdog.resync_devices = AsyncMock()
+    watchdog.async_track("0", "UP")
+
+    with patch.object(coordinator.gateway, "async_reconnect") as mock_reconnect:
+        for _poll in range(WATCHDOG_STALE_POLLS):
+            coordinator.async_set_updated_data(_snapshot(8, "DOWN"))
+            await hass.async_block_till_done()
+
+        assert "0" in watchdog.stale
+        mock_reconnect.assert_called_once_with()
+
+        for _poll in range(WATCHDOG_STALE_POLLS):
+            coordinator.async_set_updated_data(_snapshot(8, "DOWN"))
+            await hass.async_block_till_done()
+
+        watchdog.resync_devices.assert_called_once()
+        assert coordinator.async_request_refresh.call_count == 2
+
+        # No more steps once all were taken
+        for _poll in range(WATCHDOG_STALE_POLLS):
+            coordinator.async_set_updated_data(_snapshot(8, "DOWN"))
+            await hass.async_block_till_done()
+
+        assert mock_reconnect.call_count == 1
+        assert watchdog.as_dict()["recovery_step"] == 2
+
+    coordinator.async_set_updated_data(_snapshot(8, "UP"))
+
+    assert not watchdog.stale
+    assert watchdog.recovery_step == 0
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.mobilus.const import DOMAIN
+from custom_components.mobilus.coordinator import MobilusCoordinator
+from custom_components.mobilus.device import MobilusDevice
+from custom_components.mobilus.device_state import MobilusDeviceState, MobilusDeviceStateList
+from custom_components.mobilus.options import MobilusOptions
+from custom_components.mobilus.websocket_api import async_setup_websocket_api
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+    from custom_components.mobilus.gateway import MobilusGateway
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, gateway: MobilusGateway) -> MobilusCoordinator:
+    coordinator = MobilusCoordinator(
+        hass, gateway, MobilusOptions(), {"0": MobilusDevice.SENSO, "1": MobilusDevice.SWITCH},
+    )
+    coordinator.async_set_updated_data(MobilusDeviceStateList({
+        "0": MobilusDeviceState(device_id="0", event_number=8, value="50%:20$"),
+        "1": MobilusDeviceState(device_id="1", event_number=8, value="ON"),
+    }))
+
+    hass.data[DOMAIN] = {"test_entry": {"coordinator": coordinator}}
+    async_setup_websocket_api(hass)
+
+    return coordinator
+
+async def test_websocket_snapshot(
+        hass_ws_client: WebSocketGenerator, hass: HomeAssistant, coordinator: MobilusCoordinator) -> None:
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "mobilus/snapshot", "entry_id": "test_entry"})
+    msg = await client.receive_json()
+
+    assert msg["success"] is True
+    assert msg["result"] == {
+        "devices": [
+            {
+                "id": "0",
+                "type": MobilusDevice.SENSO,
+                "position": 50,
+                "tilt": 20,
+                "moving": False,
+                "last_changed": coordinator.history.devices["0"].last_changed(),
+            },
+            {
+                "id": "1",
+                "type": MobilusDevice.SWITCH,
+                "position": None,
+                "tilt": None,
+                "moving": False,
+                "last_changed": coordinator.history.devices["1"].last_changed(),
+            },
+        ],
+    }
+
+async def test_websocket_snapshot_not_loaded(
+        hass_ws_client: WebSocketGenerator, hass: HomeAssistant, coordinator: MobilusCoordinator) -> None: # noqa: ARG001
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "mobilus/snapshot", "entry_id": "missing_entry"})
+    msg = await client.receive_json()
+
+    assert msg["success"] is False
+    assert msg["error"]["code"] == "not_found"
+
+async def test_websocket_subscribe(
+        hass_ws_client: WebSocketGenerator, hass: HomeAssistant, coordinator: MobilusCoordinator) -> None:
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": "mobilus/subscribe", "entry_id": "test_entry"})
+    msg = await client.receive_json()
+
+    assert msg["success"] is True
+
+    msg = await client.receive_json()
+
+    assert [device["id"] for device in msg["event"]["devices"]] == ["0", "1"]
+
+    # Unchanged device is left out of the update
+    coordinator.async_set_updated_data(MobilusDeviceStateList({
+        "0": MobilusDeviceState(device_id="0", event_number=7, value="70%:20$"),
+        "1": MobilusDeviceState(device_id="1", event_number=8, value="ON"),
+    }))
+    msg = await client.receive_json()
+
+    assert msg["event"]["devices"] == [
+        {
+            "id": "0",
+            "type": MobilusDevice.SENSO,
+            "position": 20,
+            "tilt": 70,
+            "moving": True,
+            "last_changed": coordinator.history.devices["0"].last_changed(),
+        },
+    ]
+
+    await client.send_json_auto_id({"type": "unsubscribe_events", "subscription": msg["id"]})
+    msg = await client.receive_json()
+
+    assert msg["success"] is True
+    assert not coordinator._listeners # noqa: SLF001